@@ -0,0 +1,48 @@
+import gspc
+import os
+
+directory = "./tests/inputs/SiO2/1008/sio2-1008at-11frames"
+
+with open(os.path.join(directory, "inputs")) as f:
+    trajectories = [line.strip() for line in f if line.strip()]
+
+with open(os.path.join(directory, "outputs")) as f:
+    outputs = [line.strip() for line in f if line.strip()]
+
+with open(os.path.join(directory, "pressure")) as f:
+    pressures = [float(line.strip()) for line in f if line.strip()]
+
+# Initialize the settings shared by all the trajectories
+settings = gspc.settings.Settings(extension="SiO2")
+
+settings.export_directory.set_value("tests/results/SiO2/1008/sio2-1008at-11frames")
+settings.header.set_value(2)
+settings.number_of_atoms.set_value(1008)
+settings.structure.set_value(
+    [{"element": "Si", "number": 336}, {"element": "O", "number": 672}]
+)
+
+settings.properties.set_value(
+    [
+        "pair_distribution_function",
+        "bond_angular_distribution",
+        "structural_units",
+        "neutron_structure_factor",
+    ]
+)
+
+settings.temperature.set_value(300)
+
+settings.pdf_settings.set_rmax(8.0)
+settings.msd_settings.set_dt(0.0016)
+settings.msd_settings.set_printlevel(625)
+
+# One job per trajectory, with its own project name and pressure
+jobs = [
+    (trajectory, {"project_name": outputs[i], "pressure": pressures[i]})
+    for i, trajectory in enumerate(trajectories)
+]
+
+output_directories, errors = gspc.run_batch(jobs, settings, n_workers=2)
+
+print("END!")
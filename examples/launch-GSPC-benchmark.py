@@ -0,0 +1,26 @@
+import gspc
+from gspc.benchmarks import run_benchmark
+
+# Settings of the analysis, the trajectories and the structures are generated by the benchmark
+settings = gspc.settings.Settings(extension="SiO2")
+settings.pdf_settings.set_rmax(8.0)
+
+# Time each stage of the analysis on synthetic glasses of 10^3 to 10^5 atoms
+report = run_benchmark(
+    sizes=[1000, 10000, 100000],
+    extension="SiO2",
+    number_of_frames=5,
+    report="benchmark-SiO2.json",
+    settings=settings,
+    thread_scaling=10000,
+)
+
+for run in report["runs"]:
+    print(f"{run['number_of_atoms']} atoms ➜ {run['total']:.2f} s")
+    for stage, seconds in run["stages_per_frame"].items():
+        print(f"\t{stage.ljust(28)} {seconds:.4f} s/frame")
+
+# Time of the structure factor kernel with 1 to N numba threads
+scaling = report["thread_scaling"]
+for n, seconds, speedup in zip(scaling["threads"], scaling["times"], scaling["speedup"]):
+    print(f"{n} threads ➜ {seconds:.3f} s (x{speedup:.2f})")
@@ -4,6 +4,7 @@
 from . import settings
 from . import utils
 from .main import main
+from .batch import run_batch, estimate_memory
 
 __version__ = "0.0.22"
 
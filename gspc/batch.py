@@ -0,0 +1,269 @@
+# internal imports
+from . import core
+from .main import main
+from .settings.parameter import Parameter
+from .utils.generate_recaps import make
+
+# external imports
+import numpy as np
+from tqdm import tqdm
+import os
+import copy
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+
+def run_batch(jobs, settings, n_workers=1, max_memory=None, recaps=True) -> list:
+    r"""
+    Run gspc.main on a list of trajectories (eg a pressure or temperature sweep) in a pool of processes.
+
+    The jobs are scheduled from the largest to the smallest memory estimate, and a job is only started if the
+    sum of the estimates of the running jobs stays below 'max_memory'. The numba kernels are compiled once per
+    worker process, and the recap files are updated as soon as a job is done. A job that fails (eg a missing or
+    broken trajectory) does not stop the other jobs, its error is printed and returned.
+
+    Parameters:
+    -----------
+        - jobs (list) : List of (path_to_xyz_file, overrides) tuples. 'overrides' is a dictionary
+                        {name of the Settings attribute: value} applied to a copy of 'settings' (eg {"pressure": 5.0}).
+                        The project name defaults to the name of the trajectory file, prefixed by the name of its
+                        directory if several trajectories have the same name (eg P5/pos.xyz -> 'P5-pos').
+                        Two jobs writing in the same output directory raise a ValueError.
+        - settings (Settings) : Settings shared by all the jobs.
+        - n_workers (int) : Number of jobs running at the same time.
+        - max_memory (float) : Memory available for the running jobs in bytes. Default is the available memory.
+        - recaps (bool) : Generate the recap files (see utils.generate_recaps.make) while the jobs are done.
+
+    Returns:
+    --------
+        - list : Output directory of each job, in the order of the jobs (None for the jobs that failed).
+        - dict : Error of each job that failed {index of the job: exception}.
+    """
+    if n_workers < 1:
+        raise ValueError(f"Invalid value for 'n_workers': {n_workers}")
+
+    if max_memory is None:
+        max_memory = _get_available_memory()
+
+    # Build the settings of each job
+    list_of_settings = []
+    names = _default_project_names([path_to_xyz_file for path_to_xyz_file, _ in jobs])
+    for (path_to_xyz_file, overrides), project_name in zip(jobs, names):
+        job_settings = copy.deepcopy(settings)
+        job_settings.path_to_xyz_file.set_value(path_to_xyz_file)
+        job_settings.project_name.set_value(project_name)
+        for name, value in overrides.items():
+            attribute = getattr(job_settings, name)
+            if isinstance(attribute, Parameter):
+                attribute.set_value(value)
+            else:
+                setattr(job_settings, name, value)
+        job_settings.quiet.set_value(True)
+        job_settings.progress_callback.set_value(None)
+        list_of_settings.append(job_settings)
+
+    # The jobs run at the same time, each one needs its own output directory
+    output_paths = {}
+    for j, job_settings in enumerate(list_of_settings):
+        path = os.path.abspath(
+            os.path.join(job_settings.export_directory.get_value(), job_settings.project_name.get_value())
+        )
+        if path in output_paths:
+            raise ValueError(
+                f"\tERROR: Jobs {output_paths[path]} and {j} write in the same directory {path}, set a different 'project_name'."
+            )
+        output_paths[path] = j
+
+    output_directories = [None] * len(jobs)
+    errors = {}
+
+    estimates = [0.0] * len(jobs)
+    for j, job_settings in enumerate(list_of_settings):
+        try:
+            estimates[j] = estimate_memory(job_settings)
+        except Exception as error:
+            _report_error(j, job_settings, error, errors)
+
+    # Largest jobs first
+    pending = sorted(
+        (j for j in range(len(jobs)) if j not in errors), key=lambda j: estimates[j], reverse=True
+    )
+    running = {}
+
+    if not settings.quiet.get_value():
+        progress_bar = tqdm(
+            total=len(pending), desc="Running jobs ...", unit="job", leave=False, colour="#144e4c"
+        )
+
+    n_threads = max(1, _get_numba_threads() // n_workers)
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(n_threads,)
+    ) as executor:
+        while pending or running:
+            # Start the jobs that fit in the available memory
+            used_memory = sum(estimates[j] for j in running.values())
+            for j in list(pending):
+                if len(running) >= n_workers:
+                    break
+                if used_memory + estimates[j] <= max_memory or len(running) == 0:
+                    future = executor.submit(_run_job, list_of_settings[j])
+                    running[future] = j
+                    used_memory += estimates[j]
+                    pending.remove(j)
+
+            # Wait for a job to be done
+            done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                j = running.pop(future)
+                try:
+                    output_directories[j] = future.result()
+                except (Exception, SystemExit) as error:
+                    _report_error(j, list_of_settings[j], error, errors)
+                else:
+                    if recaps:
+                        make(list_of_settings[j].export_directory.get_value())
+                if not settings.quiet.get_value():
+                    progress_bar.update(1)
+
+    if not settings.quiet.get_value():
+        progress_bar.close()
+
+    return output_directories, errors
+
+
+def estimate_memory(settings) -> float:
+    r"""
+    Return a rough estimate of the peak memory used by gspc.main with these settings.
+
+    Parameters:
+    -----------
+        - settings (Settings) : Settings of the job.
+
+    Returns:
+    --------
+        - float : Memory estimate in bytes.
+    """
+    n_atoms = settings.number_of_atoms.get_value()
+    properties = settings.properties.get_value()
+    n_species = len(settings.structure.get_value())
+    lbox = _read_first_lattice(settings.path_to_xyz_file.get_value())
+    density = n_atoms / np.prod(lbox)
+
+    # Atom objects and their first neighbours
+    memory = n_atoms * 2048.0
+    max_cutoff = max(c["value"] for c in settings.cutoffs.get_value())
+    memory += n_atoms * density * 4.0 / 3.0 * np.pi * max_cutoff**3 * 64.0
+
+    if "pair_distribution_function" in properties:
+        # Long range neighbours and distances of each atom
+        rmax = min(settings.pdf_settings.get_rmax(), np.min(lbox) / 2)
+        memory += n_atoms * density * 4.0 / 3.0 * np.pi * rmax**3 * 96.0
+
+    if "neutron_structure_factor" in properties:
+        # Cosine and sine sums of each species plus the partial structure factors over the half q sphere
+        qmax = min(settings.nsf_settings.get_qmax(), 6.0 * np.sqrt(3))
+        n_q = 2.0 / 3.0 * np.pi * qmax**3 / np.prod(2 * np.pi / lbox)
+        n_pairs = n_species * (n_species + 1) // 2 + 1
+        memory += n_q * 8.0 * (2 * n_species + n_pairs + 4)
+
+    if "structural_units" in properties:
+        # Histograms of the lifetimes of the polyhedra
+        if settings.range_of_frames.get_value() is not None:
+            n_frames = settings.range_of_frames.get_value()[1] - settings.range_of_frames.get_value()[0]
+        else:
+            n_frames = _count_frames(settings)
+        memory += n_frames * 25 * 8.0 * 2
+
+    return memory
+
+
+def _run_job(settings) -> str:
+    r"""
+    Run gspc.main in a worker process.
+
+    Returns:
+    --------
+        - str : Output directory of the job.
+    """
+    main(settings)
+    return settings._output_directory
+
+
+def _report_error(j, settings, error, errors) -> None:
+    r"""
+    Record and print the error of a job that failed.
+    """
+    errors[j] = error
+    print(
+        f"\tERROR: Job {j} ({settings.path_to_xyz_file.get_value()}) failed: {type(error).__name__}: {error}"
+    )
+
+
+def _init_worker(n_threads) -> None:
+    r"""
+    Set the number of numba threads of the worker and compile the numba kernels once for all its jobs.
+    """
+    import numba
+
+    numba.set_num_threads(n_threads)
+
+    positions = np.zeros((2, 3))
+    core.Box.minimum_image_distance(np.ones(3), positions[0], positions[1])
+    core.System._calculate_neutron_structure_factor(np.zeros((2, 3)), positions)
+    q_indices = np.zeros((2, 3), dtype=np.int64)
+    powers = np.empty((3, 2, 3), dtype=np.complex128)
+    core.System._calculate_neutron_structure_factor_recurrence(
+        q_indices, np.array([0, 2]), np.ones(3), positions, powers
+    )
+
+
+def _default_project_names(paths) -> list:
+    r"""
+    Return the default project name of each trajectory: the name of the file without extension, prefixed by the
+    name of its directory if several files have the same name.
+    """
+    names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    return [
+        f"{os.path.basename(os.path.dirname(os.path.abspath(path)))}-{name}" if names.count(name) > 1 else name
+        for path, name in zip(paths, names)
+    ]
+
+
+def _get_numba_threads() -> int:
+    r"""
+    Return the number of threads available to numba.
+    """
+    import numba
+
+    return numba.config.NUMBA_NUM_THREADS
+
+
+def _get_available_memory() -> float:
+    r"""
+    Return the memory available on the machine in bytes.
+    """
+    try:
+        return float(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES"))
+    except (ValueError, OSError, AttributeError):
+        return np.inf
+
+
+def _read_first_lattice(file_path, keyword="Lattice") -> np.ndarray:
+    r"""
+    Return the box dimensions of the first frame of the trajectory.
+    """
+    with open(file_path, "r") as f:
+        for line in f:
+            if keyword in line:
+                lattice = line.split('"')[1].split()
+                return np.array([float(lattice[0]), float(lattice[4]), float(lattice[8])])
+    raise ValueError(f"\tERROR: No lattice found in {file_path}.")
+
+
+def _count_frames(settings) -> int:
+    r"""
+    Return an estimate of the number of frames of the trajectory from the size of the file and of the first frame.
+    """
+    frame_size = settings.number_of_atoms.get_value() + settings.header.get_value()
+    with open(settings.path_to_xyz_file.get_value(), "rb") as f:
+        frame_bytes = sum(len(f.readline()) for _ in range(frame_size))
+    return max(1, round(os.path.getsize(settings.path_to_xyz_file.get_value()) / max(frame_bytes, 1)))
@@ -0,0 +1,4 @@
+from .generate_glass import generate_glass
+from .time_stages    import time_stages
+from .time_threads   import time_threads
+from .run_benchmark  import run_benchmark
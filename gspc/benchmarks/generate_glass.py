@@ -0,0 +1,127 @@
+# external imports
+import numpy as np
+
+# Fractional coordinates of the silicons in the cubic cell of the beta-cristobalite (diamond lattice)
+SILICON_SITES = np.array(
+    [
+        [0.00, 0.00, 0.00],
+        [0.00, 0.50, 0.50],
+        [0.50, 0.00, 0.50],
+        [0.50, 0.50, 0.00],
+        [0.25, 0.25, 0.25],
+        [0.25, 0.75, 0.75],
+        [0.75, 0.25, 0.75],
+        [0.75, 0.75, 0.25],
+    ]
+)
+
+# Directions of the 4 Si-O bonds of the silicons of the first sublattice (the other sublattice is bonded back)
+BOND_DIRECTIONS = np.array(
+    [
+        [0.25, 0.25, 0.25],
+        [-0.25, -0.25, 0.25],
+        [-0.25, 0.25, -0.25],
+        [0.25, -0.25, -0.25],
+    ]
+)
+
+# Fractional coordinates of the empty sites of the cell, filled with the sodiums
+SODIUM_SITES = np.array(
+    [
+        [0.50, 0.50, 0.50],
+        [0.50, 0.00, 0.00],
+        [0.00, 0.50, 0.00],
+        [0.00, 0.00, 0.50],
+    ]
+)
+
+
+def generate_glass(
+    file_path,
+    extension="SiO2",
+    number_of_atoms=1000,
+    number_of_frames=1,
+    lattice_constant=7.16,
+    disorder=0.1,
+    step=0.02,
+    sodium_fraction=1.0,
+    seed=0,
+) -> list:
+    r"""
+    Write a synthetic SiO2 or NSx-like trajectory in the extended xyz format read by gspc.
+
+    The configuration is a beta-cristobalite network (SiO4 tetrahedra sharing their corners, 24 atoms per cubic
+    cell) replicated to reach the requested number of atoms, disordered by a random displacement of each atom. For
+    the NSx extension, the sodiums fill a fraction of the empty sites of the network (4 per cell). The atoms then
+    perform a random walk from one frame to the next, the positions are not wrapped in the box so that the mean
+    square displacement can be calculated.
+    - NOTE: the number of atoms is rounded to a whole number of cells in each direction.
+
+    Parameters:
+    -----------
+        - file_path (str) : Path to the trajectory file to write.
+        - extension (str) : 'SiO2' or 'NSx'.
+        - number_of_atoms (int) : Approximate number of atoms of the configuration.
+        - number_of_frames (int) : Number of frames of the trajectory.
+        - lattice_constant (float) : Length of the cubic cell in Angstrom.
+        - disorder (float) : Standard deviation of the displacement of the atoms from their sites in Angstrom.
+        - step (float) : Standard deviation of the displacement of the atoms between two frames in Angstrom.
+        - sodium_fraction (float) : Fraction of the empty sites filled with sodiums (NSx only).
+        - seed (int) : Seed of the random number generator.
+
+    Returns:
+    --------
+        - list : Structure of the configuration, [{"element": ..., "number": ...}] as in Settings.structure.
+    """
+    if extension not in ["SiO2", "NSx"]:
+        raise ValueError(f"\tERROR: Unsupported extension for the synthetic glasses: {extension}.")
+    if number_of_frames < 1:
+        raise ValueError(f"\tERROR: Invalid number of frames: {number_of_frames}.")
+
+    # Build the cubic cell
+    silicons = SILICON_SITES
+    oxygens = (SILICON_SITES[:4, None, :] + BOND_DIRECTIONS[None, :, :] / 2).reshape(-1, 3)
+    sodiums = SODIUM_SITES if extension == "NSx" else np.zeros((0, 3))
+    atoms_per_cell = len(silicons) + len(oxygens) + len(sodiums)
+
+    # Replicate the cell
+    n_cells = max(1, int(round((number_of_atoms / atoms_per_cell) ** (1 / 3))))
+    shifts = np.stack(
+        np.meshgrid(np.arange(n_cells), np.arange(n_cells), np.arange(n_cells), indexing="ij"), axis=-1
+    ).reshape(-1, 1, 3)
+    length = n_cells * lattice_constant
+
+    rng = np.random.default_rng(seed)
+
+    sites = {}
+    for element, cell_sites in zip(["Si", "O", "Na"], [silicons, oxygens, sodiums]):
+        if len(cell_sites) == 0:
+            continue
+        positions = ((shifts + cell_sites[None, :, :]).reshape(-1, 3) % n_cells) * lattice_constant
+        if element == "Na":
+            keep = rng.random(len(positions)) < sodium_fraction
+            positions = positions[keep]
+        sites[element] = positions
+
+    elements = np.concatenate([np.full(len(p), e) for e, p in sites.items()])
+    positions = np.concatenate(list(sites.values()))
+    positions += rng.normal(0.0, disorder, positions.shape)
+
+    # Shuffle the atoms as in a trajectory of a simulation
+    order = rng.permutation(len(elements))
+    elements = elements[order]
+    positions = positions[order]
+
+    rows = np.empty(len(elements), dtype=[("element", "U2"), ("x", "f8"), ("y", "f8"), ("z", "f8")])
+    rows["element"] = elements
+    lattice = f'Lattice="{length} 0.0 0.0 0.0 {length} 0.0 0.0 0.0 {length}"'
+
+    with open(file_path, "w") as f:
+        for frame in range(number_of_frames):
+            if frame > 0:
+                positions += rng.normal(0.0, step, positions.shape)
+            rows["x"], rows["y"], rows["z"] = positions.T
+            f.write(f"{len(elements)}\n{lattice}\n")
+            np.savetxt(f, rows, fmt="%s %.6f %.6f %.6f")
+
+    return [{"element": e, "number": len(p)} for e, p in sites.items()]
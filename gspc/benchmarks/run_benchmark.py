@@ -0,0 +1,175 @@
+# internal imports
+from ..settings.settings import Settings
+from .generate_glass import generate_glass
+from .time_stages import time_stages
+from .time_threads import time_threads
+
+# external imports
+import numpy as np
+import os
+import sys
+import copy
+import json
+import time
+import shutil
+import platform
+import tempfile
+from datetime import datetime
+
+
+def run_benchmark(
+    sizes,
+    extension="SiO2",
+    number_of_frames=10,
+    properties=None,
+    report="benchmark.json",
+    working_directory=None,
+    warmup=True,
+    seed=0,
+    settings=None,
+    thread_scaling=None,
+) -> dict:
+    r"""
+    Time the stages of the analysis (see benchmarks.time_stages) on synthetic glasses of increasing sizes and
+    write the timings in a JSON report.
+
+    The trajectories are generated with benchmarks.generate_glass, no input file is needed. A small glass is
+    analysed first so that the compilation of the numba kernels is not timed.
+
+    Parameters:
+    -----------
+        - sizes (list) : Approximate numbers of atoms of the glasses (eg [1000, 10000, 100000]).
+        - extension (str) : 'SiO2' or 'NSx'.
+        - number_of_frames (int) : Number of frames of each trajectory.
+        - properties (list) : Properties to calculate. Default is all the properties of Settings.
+        - report (str) : Path to the JSON report. If None, the report is only returned.
+        - working_directory (str) : Directory of the trajectories and of the results. Default is a temporary
+                                    directory, removed at the end.
+        - warmup (bool) : Analyse a small glass before the timed runs.
+        - seed (int) : Seed of the generation of the glasses.
+        - settings (Settings) : Settings of the analysis (eg pdf_settings, precision). The trajectory, the
+                                structure and the output settings are set by the benchmark.
+        - thread_scaling (int) : Number of atoms of the thread scaling run of the structure factor kernel (see
+                                 benchmarks.time_threads). Default is None (no thread scaling run).
+
+    Returns:
+    --------
+        - dict : Report of the benchmark, with the description of the machine and one entry per size.
+    """
+    if len(sizes) == 0:
+        raise ValueError("\tERROR: No size given for the benchmark.")
+
+    if settings is None:
+        settings = Settings(extension=extension)
+    elif settings.extension.get_value() != extension:
+        raise ValueError(
+            f"\tERROR: The settings are for the extension {settings.extension.get_value()}, not {extension}."
+        )
+    else:
+        settings = copy.deepcopy(settings)
+    if properties is not None:
+        settings.properties.set_value(properties)
+
+    remove_directory = working_directory is None
+    if working_directory is None:
+        working_directory = tempfile.mkdtemp(prefix="gspc-benchmark-")
+    os.makedirs(working_directory, exist_ok=True)
+
+    try:
+        if warmup:
+            _run_size(settings, extension, 200, 2, working_directory, seed)
+
+        runs = []
+        for number_of_atoms in sizes:
+            runs.append(
+                _run_size(settings, extension, number_of_atoms, number_of_frames, working_directory, seed)
+            )
+    finally:
+        if remove_directory:
+            shutil.rmtree(working_directory, ignore_errors=True)
+
+    output = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "version": settings.version.get_value(),
+        "machine": _describe_machine(),
+        "extension": extension,
+        "number_of_frames": number_of_frames,
+        "properties": list(settings.properties.get_value()),
+        "runs": runs,
+    }
+    if thread_scaling is not None:
+        output["thread_scaling"] = time_threads(
+            thread_scaling,
+            qmax=settings.nsf_settings.get_qmax(),
+            engine=settings.nsf_settings.get_engine(),
+        )
+
+    if report is not None:
+        with open(report, "w") as f:
+            json.dump(output, f, indent=2)
+
+    return output
+
+
+def _run_size(settings, extension, number_of_atoms, number_of_frames, working_directory, seed) -> dict:
+    r"""
+    Generate a glass and time the analysis of its trajectory.
+
+    Returns:
+    --------
+        - dict : Size of the glass and of its trajectory file, time of the generation and time of each stage (total and per frame).
+    """
+    file_path = os.path.join(working_directory, f"glass-{extension}-{number_of_atoms}at.xyz")
+
+    t = time.perf_counter()
+    structure = generate_glass(file_path, extension, number_of_atoms, number_of_frames, seed=seed)
+    generation = time.perf_counter() - t
+
+    n_atoms = sum(s["number"] for s in structure)
+    settings = _settings_of_run(settings, file_path, structure, working_directory)
+
+    file_size = os.path.getsize(file_path)
+    stages = time_stages(settings)
+    os.remove(file_path)
+
+    return {
+        "number_of_atoms": n_atoms,
+        "structure": structure,
+        "file_size": file_size,
+        "generation": generation,
+        "stages": stages,
+        "stages_per_frame": {k: v / number_of_frames for k, v in stages.items()},
+        "total": sum(stages.values()),
+    }
+
+
+def _settings_of_run(settings, file_path, structure, working_directory) -> Settings:
+    r"""
+    Return a copy of the settings pointing at a generated trajectory.
+    """
+    settings = copy.deepcopy(settings)
+    settings.path_to_xyz_file.set_value(file_path)
+    settings.project_name.set_value(os.path.splitext(os.path.basename(file_path))[0])
+    settings.export_directory.set_value(os.path.join(working_directory, "results"))
+    settings.number_of_atoms.set_value(sum(s["number"] for s in structure))
+    settings.header.set_value(2)
+    settings.structure.set_value(structure)
+    settings.range_of_frames.set_value(None)
+    return settings
+
+
+def _describe_machine() -> dict:
+    r"""
+    Return the description of the machine and of the versions of the dependencies.
+    """
+    import numba
+
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numba_threads": numba.config.NUMBA_NUM_THREADS,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+    }
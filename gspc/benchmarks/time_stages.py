@@ -0,0 +1,127 @@
+# internal imports
+from .. import io
+from .. import core
+from ..main import _create_results, _analyse_frames, _write_results
+
+# external imports
+import os
+import copy
+import time
+import importlib
+
+# Name of the stage timed for each phase reported by gspc.main (see main._report_progress)
+PHASES = {
+    "reading": "parsing",
+    "neighbours": "neighbours",
+    "pair_distribution_function": "pair_distribution_function",
+    "bond_angular_distribution": "bond_angular_distribution",
+    "structural_units": "structural_units",
+    "neutron_structure_factor": "neutron_structure_factor",
+    "mean_square_displacement": "mean_square_displacement",
+}
+
+
+def time_stages(settings) -> dict:
+    r"""
+    Run the analysis of gspc.main and return the time spent in each of its stages.
+
+    The stages are the indexing of the frames (counting the frames, reading the lattices and the offsets of the
+    frames), the parsing of the frames, the neighbour search, each property, the lifetimes and transitions of the
+    structural units, and the output (averages and files). The frames are analysed in this process and read in the
+    main loop (n_workers and prefetch_frames are ignored) so that the parsing is timed on its own.
+
+    Parameters:
+    -----------
+        - settings (Settings) : Settings of the run, not modified.
+
+    Returns:
+    --------
+        - dict : Time spent in each stage in seconds.
+    """
+    settings = copy.deepcopy(settings)
+    settings.quiet.set_value(True)
+    settings.n_workers.set_value(1)
+    settings.prefetch_frames.set_value(0)
+
+    timings = {"indexing": 0.0}
+    for stage in PHASES.values():
+        if stage in timings:
+            continue
+        timings[stage] = 0.0
+    timings["lifetime"] = 0.0
+    timings["output"] = 0.0
+
+    # Time between two phases reported by the main loop
+    current = {"phase": None, "time": 0.0}
+
+    def callback(frame, phase):
+        now = time.perf_counter()
+        if current["phase"] in PHASES:
+            timings[PHASES[current["phase"]]] += now - current["time"]
+        current["phase"] = phase
+        current["time"] = now
+
+    settings.progress_callback.set_value(callback)
+
+    settings._output_directory = os.path.join(
+        settings.export_directory.get_value(), settings.project_name.get_value()
+    )
+    os.makedirs(settings._output_directory, exist_ok=True)
+
+    module = importlib.import_module(f"gspc.extensions.{settings.extension.get_value()}")
+    input_file = settings.path_to_xyz_file.get_value()
+    n_atoms = settings.number_of_atoms.get_value()
+
+    # Index the frames
+    t = time.perf_counter()
+    n_config = io.count_configurations(input_file)
+    settings.number_of_frames.set_value(n_config)
+    box = core.Box()
+    io.read_lattice_properties(box, input_file)
+    offsets = io.index_frames(input_file, n_atoms + settings.header.get_value())
+    timings["indexing"] = time.perf_counter() - t
+
+    if settings.range_of_frames.get_value() is not None:
+        start, end = settings.range_of_frames.get_value()
+    else:
+        start, end = 0, n_config
+    settings.frames_to_analyse.set_value(end - start)
+
+    # Analyse the frames
+    t = time.perf_counter()
+    results = _create_results(settings, module, start, end, write_headers=True)
+    timings["output"] += time.perf_counter() - t
+
+    forms, msd, mass = _analyse_frames(settings, box, offsets, start, end, start, results=results)
+    settings.lbox.set_value(box.get_box_dimensions(end - 1))
+
+    # Write the results, the lifetimes are calculated while the structural units are written
+    t = time.perf_counter()
+    _write_results(settings, _TimedExtension(module, timings), results, forms, msd, mass, end)
+    settings.write_readme_file()
+    timings["output"] += time.perf_counter() - t - timings["lifetime"]
+
+    return timings
+
+
+class _TimedExtension:
+    r"""
+    Extension module whose lifetime and transition functions add their time to the 'lifetime' stage.
+    """
+
+    def __init__(self, module, timings) -> None:
+        self.module = module
+        self.timings = timings
+
+    def __getattr__(self, name):
+        attribute = getattr(self.module, name)
+        if name not in ["calculate_lifetime", "calculate_transition_matrix"]:
+            return attribute
+
+        def timed(*args, **kwargs):
+            t = time.perf_counter()
+            output = attribute(*args, **kwargs)
+            self.timings["lifetime"] += time.perf_counter() - t
+            return output
+
+        return timed
@@ -0,0 +1,76 @@
+# internal imports
+from ..core.box import Box
+from ..core.system import System
+from ..settings.settings import Settings
+
+# external imports
+import numpy as np
+import time
+
+
+def time_threads(number_of_atoms=10000, qmax=10.0, engine="recurrence", threads=None, repeat=3, seed=0) -> dict:
+    r"""
+    Time the structure factor kernel (sums of cos(q.r) and sin(q.r), see System._calculate_rho) with an increasing
+    number of numba threads.
+
+    The atoms are placed at random in a cubic box at the density of the silica glass (0.066 atoms per Angstrom^3).
+
+    Parameters:
+    -----------
+        - number_of_atoms (int) : Number of atoms.
+        - qmax (float) : Largest |q| of the q vectors.
+        - engine (str) : 'recurrence' or 'direct'.
+        - threads (list) : Numbers of threads to time. Default is 1 to the number of threads available to numba.
+        - repeat (int) : Number of runs for each number of threads, the fastest one is kept.
+        - seed (int) : Seed of the positions.
+
+    Returns:
+    --------
+        - dict : Number of atoms and of q vectors, time of each number of threads in seconds and speedup over 1 thread.
+    """
+    import numba
+
+    if threads is None:
+        threads = list(range(1, numba.config.NUMBA_NUM_THREADS + 1))
+    if max(threads) > numba.config.NUMBA_NUM_THREADS:
+        raise ValueError(
+            f"\tERROR: {max(threads)} threads requested, only {numba.config.NUMBA_NUM_THREADS} available to numba."
+        )
+
+    settings = Settings(extension="SiO2")
+    settings.nsf_settings.set_engine(engine)
+
+    length = (number_of_atoms / 0.066) ** (1 / 3)
+    rng = np.random.default_rng(seed)
+    elements = rng.choice(["Si", "O"], number_of_atoms, p=[1 / 3, 2 / 3])
+    system = System.from_arrays(settings, elements, rng.random((number_of_atoms, 3)) * length)
+    system.box = Box()
+    system.box.add_box(length, length, length)
+    q_vectors, q_indices = system.box.get_q_shells(0, qmax)[:2]
+
+    # Compile the kernel before timing it
+    system._calculate_rho(q_vectors[:2], q_indices[:2], system.positions)
+
+    default_threads = numba.get_num_threads()
+    times = []
+    try:
+        for n in threads:
+            numba.set_num_threads(n)
+            best = np.inf
+            for _ in range(repeat):
+                t = time.perf_counter()
+                system._calculate_rho(q_vectors, q_indices, system.positions)
+                best = min(best, time.perf_counter() - t)
+            times.append(best)
+    finally:
+        numba.set_num_threads(default_threads)
+
+    reference = times[threads.index(1)] if 1 in threads else None
+    return {
+        "engine": engine,
+        "number_of_atoms": number_of_atoms,
+        "number_of_q": len(q_vectors),
+        "threads": list(threads),
+        "times": times,
+        "speedup": [reference / t if reference is not None else None for t in times],
+    }
@@ -1,4 +1,5 @@
 from .atom      import Atom, ReferencePosition, CurrentPosition
 from .system    import System
 from .box       import Box
-from .cutoff    import Cutoff
\ No newline at end of file
+from .cutoff    import Cutoff
+from .neighbour_list import NeighbourList
@@ -1,16 +1,18 @@
 # internal imports
-from ..data import chemical_symbols, atomic_masses, correlation_lengths
+from ..data import species_registry
 from .cutoff import Cutoff
 from .box import Box
 
 # external imports
 import numpy as np
 import sys
-from dataclasses import dataclass
 from numba import njit
 
+# Atomic mass and scattering length of each element code of the species registry
+SPECIES_MASSES = [mass for code, mass, b in species_registry.values()]
+SPECIES_CORRELATION_LENGTHS = [b for code, mass, b in species_registry.values()]
+
 
-@dataclass
 class ReferencePosition:
     r"""
     Represents a reference position of an atom in the system at the first frame.
@@ -22,6 +24,8 @@ class ReferencePosition:
         - id (int): Id of the atom.
     """
 
+    __slots__ = ("position", "element", "id")
+
     def __init__(self, position, element, id) -> None:
         r"""
         Initializes a ReferencePosition object.
@@ -67,7 +71,6 @@ class ReferencePosition:
         return self.id
 
 
-@dataclass
 class CurrentPosition:
     r"""
     Represents the non-wrapped current position of an atom in the system at a given frame.
@@ -80,6 +83,8 @@ class CurrentPosition:
         - frame (int): Frame number.
     """
 
+    __slots__ = ("position", "element", "id", "frame")
+
     def __init__(self, position, element, id, frame) -> None:
         r"""
         Initializes a CurrentPosition object.
@@ -146,12 +151,17 @@ class Atom:
         - element (str) : Atomic element.
         - id (int) : Identifier of the atom in the system.
         - position (np.array) : XYZ coordinates.
-        - frame (int) : Frame index in the trajectory.
-        - cutoffs (dict) : Cutoff distances dictionary (Cutoff object).
-        - extension (str) : Extension used for method determination.
+        - system (System) : System of the atom.
+        - frame (int) : Frame index in the trajectory (from the System).
+        - cutoffs (Cutoff) : Cutoff distances (from the System).
+        - extension (str) : Extension used for method determination (from the System).
+        - code (int) : Code of the element in the species registry (gspc.data.species_registry).
         - atomic_mass (float) : Atomic mass of the atom.
-        - neighbours (list) : List of first neighbours (PBC applied).
-        - coordination (int) : Number of neighbours around the atom (PBC applied).
+        - correlation_length (float) : Coherent neutron scattering length of the atom.
+        - index (int) : Index of the atom in the atoms of its System.
+        - neighbours (list) : List of first neighbours (PBC applied), built from the NeighbourList of the System on first use.
+        - coordination (int) : Number of neighbours around the atom (PBC applied), counted by System.calculate_neighbours.
+        - coordinating_element (str) : Element of the neighbours counted in the coordination (class attribute, None for all).
 
     Methods:
     --------
@@ -163,50 +173,76 @@ class Atom:
         - get_neighbours : Returns the list of neighbours of the Atom.
         - get_atomic_mass : Returns the atomic mass of the Atom.
         - get_coordination : Returns the coordination number of the Atom.
+        - calculate_coordination : Counts the neighbours of the coordinating element of the Atom.
         - add_neighbour : Adds a neighbour to the list of neighbours of the Atom.
         - add_direct_neighbour : Adds a neighbour to the list of direct neighbours of the Atom.
         - filter_neighbours : Removes neighbours not within cutoff distances (depending on pair of atoms).
     """
 
-    def __init__(self, element, id, position, frame, cutoffs, extension="SiOz") -> None:
+    # Element of the neighbours counted in the coordination number, None to count all the neighbours
+    coordinating_element = None
+
+    __slots__ = (
+        "element",
+        "id",
+        "position",
+        "system",
+        "code",
+        "index",
+        "_neighbours",
+        "_coordination",
+        "_neighbour_list",
+        "long_range_neighbours",
+        "long_range_distances",
+        "reference_position",
+        "current_position",
+    )
+
+    def __init__(self, element, id, position, system=None, cutoffs=None, extension=None, frame=None) -> None:
         r"""
         Initializes an Atom object with the provided information.
 
+        The former signature Atom(element, id, position, frame, cutoffs, extension) is still accepted: the atom then
+        holds its own frame, cutoffs and extension instead of a System.
+
         Parameters:
         -----------
             - element (str): Atomic element.
             - id (int): Identifier of the atom in the system.
-            - position (np.array): XYZ coordinates.
-            - frame (int): Frame index in the trajectory.
-            - cutoffs (dict): Cutoff distances dictionary (Cutoff object).
-            - extension (str): Extension used for method determination.
+            - position (np.array): XYZ coordinates. A float64 array is kept as is (not copied), eg a row of System.positions.
+            - system (System): System of the atom, holds the frame, the cutoffs and the extension shared by its atoms.
+            - cutoffs (Cutoff): Cutoff distances (former signature only).
+            - extension (str): Extension used for method determination (former signature only). Default is 'SiOz'.
+            - frame (int): Frame index in the trajectory (former signature only, can also be passed in place of the System).
         """
+        # Former signature: the frame is passed in place of the System
+        if system is None or isinstance(system, (int, np.integer)):
+            if frame is None:
+                frame = 0 if system is None else system
+            system = _AtomContext(frame, cutoffs, "SiOz" if extension is None else extension)
+
         # Initialize an Atom object with the provided information
         self.element: str = element  # atomic element
         self.id: int = id  # id of the atom in the system
-        self.position: np.array = np.array(position)  # xyz coordinates
-        self.frame: int = frame  # frame that this atom belong to in the trajectory
-        self.cutoffs: Cutoff = cutoffs  # cutoffs dictionary (Cutoff object)
-
-        # Initialize the extension so that correct methods are used.
-        self.extension: str = extension
+        self.position: np.array = np.asarray(position, dtype=np.float64)  # xyz coordinates
+        self.system: object = system  # System object the atom belongs to
 
-        # Initialize atomic data from the periodic table and other informations
-        if self.element in chemical_symbols:
-            index = np.where(self.element == chemical_symbols)[0].astype(int)
-            self.atomic_mass: float = atomic_masses[index][0]
-            self.correlation_length: float = correlation_lengths[index][0]
+        # Code of the element in the species registry (atomic mass, scattering length)
+        if self.element in species_registry:
+            self.code: int = species_registry[self.element][0]
         else:
             print(f"\tERROR: Element {self.element} not found in the periodic table.")
             print(
-                "\tFailed to initialize the Atom object {self.id} in the frame {self.frame}."
+                f"\tFailed to initialize the Atom object {self.id}."
             )
             print("Exiting.")
             sys.exit(1)
 
         # Initialize neighbours attributes
-        self.neighbours: list = []  # first neighbours (pbc applied)
-        self.coordination: int = 0  # number of neighbours around the atom (pbc applied)
+        self.index: int = None  # index of the atom in System.atoms (set by the System)
+        self._neighbour_list: object = None  # NeighbourList the neighbours and coordination are read from
+        self._neighbours: list = []  # first neighbours (pbc applied)
+        self._coordination: int = 0  # number of neighbours around the atom (pbc applied)
         self.long_range_neighbours: list = []  # long range neighbours (pbc applied)
         self.long_range_distances: list = []  # long range distances with long range neighbours (pbc applied)
 
@@ -266,6 +302,82 @@ class Atom:
         """
         return self.neighbours
 
+    @property
+    def neighbours(self) -> list:
+        r"""
+        First neighbours of the Atom (PBC applied), read from the NeighbourList of the System on first use.
+        """
+        self._update_neighbour_list()
+        if self._neighbours is None:
+            atoms = self.system.atoms
+            self._neighbours = [atoms[j] for j in self._neighbour_list.get_neighbours(self.index)]
+        return self._neighbours
+
+    @neighbours.setter
+    def neighbours(self, neighbours) -> None:
+        self._update_neighbour_list()
+        self._neighbours = neighbours
+
+    @property
+    def coordination(self) -> int:
+        r"""
+        Coordination number of the Atom (PBC applied), read from the System on first use.
+        """
+        self._update_neighbour_list()
+        if self._coordination is None:
+            self._coordination = int(self.system.coordinations[self.index])
+        return self._coordination
+
+    @coordination.setter
+    def coordination(self, coordination) -> None:
+        self._update_neighbour_list()
+        self._coordination = coordination
+
+    def _update_neighbour_list(self) -> None:
+        r"""
+        Forget the neighbours and the coordination of the Atom when the System has a new NeighbourList.
+        """
+        neighbour_list = getattr(self.system, "neighbour_list", None)
+        if neighbour_list is not self._neighbour_list:
+            self._neighbour_list = neighbour_list
+            self._neighbours = None
+            self._coordination = None
+
+    @property
+    def frame(self) -> int:
+        r"""
+        Frame index in the trajectory (shared by the atoms of the System).
+        """
+        return self.system.frame
+
+    @property
+    def cutoffs(self) -> Cutoff:
+        r"""
+        Cutoff distances (Cutoff object shared by the atoms of the System).
+        """
+        return self.system.cutoffs
+
+    @property
+    def extension(self) -> str:
+        r"""
+        Extension used for method determination (shared by the atoms of the System).
+        """
+        return self.system.extension
+
+    @property
+    def atomic_mass(self) -> float:
+        r"""
+        Atomic mass of the Atom (from the species registry).
+        """
+        return SPECIES_MASSES[self.code]
+
+    @property
+    def correlation_length(self) -> float:
+        r"""
+        Coherent neutron scattering length of the Atom (from the species registry).
+        """
+        return SPECIES_CORRELATION_LENGTHS[self.code]
+
     def get_atomic_mass(self) -> float:
         r"""
         Return the atomic mass of the Atom.
@@ -308,6 +420,23 @@ class Atom:
 
     # ____________NEIGHBOURS METHODS____________
 
+    def calculate_coordination(self) -> None:
+        r"""
+        Calculate the coordination number of the atom (ie the number of first neighbours of its coordinating element).
+
+        Returns:
+        --------
+            - None.
+        """
+        self.coordination = len(
+            [
+                neighbour
+                for neighbour in self.neighbours
+                if self.coordinating_element is None
+                or neighbour.get_element() == self.coordinating_element
+            ]
+        )
+
     def add_neighbour(self, neighbour) -> None:
         r"""
         Add a neighbour to the list of neighbours of the Atom.
@@ -460,3 +589,16 @@ class Atom:
         dist = np.linalg.norm(cp.position - rp.position)
 
         return dist
+
+
+class _AtomContext:
+    r"""
+    Frame, cutoffs and extension of an Atom created with the former signature of Atom, ie without a System.
+    """
+
+    __slots__ = ("frame", "cutoffs", "extension")
+
+    def __init__(self, frame, cutoffs, extension) -> None:
+        self.frame: int = frame
+        self.cutoffs: Cutoff = cutoffs
+        self.extension: str = extension
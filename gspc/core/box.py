@@ -19,6 +19,7 @@ class Box:
         - add_box: Adds a box to the list of boxes.
         - get_volume: Calculates and returns the volume of the box.
         - get_box_dimensions: Returns the dimensions of the box.
+        - get_q_shells: Returns the q vectors of the box and their shell index (cached).
     """
 
     def __init__(self) -> None:
@@ -29,6 +30,7 @@ class Box:
         self.length_y : list = []       # list of component y of the simulation box size
         self.length_z : list = []       # list of component z of the simulation box size
         self.volume : list = []         # list of volume of the simulation box size
+        self.q_shells : dict = {}       # q vectors and shell index of the last box size, see get_q_shells
         
     def add_box(self, length_x, length_y, length_z) -> None:
         r"""
@@ -77,6 +79,70 @@ class Box:
         """
         return np.array([self.length_x[configuration], self.length_y[configuration], self.length_z[configuration]])
 
+    def get_q_shells(self, configuration, qmax=10.0) -> tuple:
+        r"""
+        Returns the q vectors of the reciprocal lattice of the box and the |q| shell of each q vector.
+
+        The q vectors are the points of the reciprocal lattice of the (orthorhombic) box, multiples of
+        (2*pi/length_x, 2*pi/length_y, 2*pi/length_z) with components in ]-6, 6[ and |q| <= qmax. S(q) = S(-q), so
+        only one q vector of each (q, -q) pair is kept (half space qx > 0, or qx = 0 and qy > 0, or qx = qy = 0 and
+        qz > 0, plus q = 0) with a weight of 2. The result only depends on the box dimensions and is computed once
+        for all the consecutive frames with the same box. Only the last box size is kept, so the memory does not
+        grow along the trajectory when the box changes (NPT, deformation).
+
+        Parameters:
+        -----------
+            - configuration (int): Index of the configuration.
+            - qmax (float): Largest |q| kept in the shells.
+
+        Returns:
+        --------
+            - np.ndarray: q vectors, shape (number of q vectors, 3).
+            - np.ndarray: Integer coordinates of the q vectors in units of 2*pi/length of each axis, shape (number of q vectors, 3).
+                          Sorted by (nx, ny, nz), the nz of a given (nx, ny) are consecutive.
+            - np.ndarray: Weight of each q vector (number of q vectors of the full grid it stands for).
+            - np.ndarray: |q| of each shell, shape (number of shells,).
+            - np.ndarray: Shell index of each q vector.
+        """
+        lengths = self.get_box_dimensions(configuration)
+        key = (*lengths, qmax)
+        if key in self.q_shells:
+            return self.q_shells[key]
+
+        # generate the q vectors of each axis
+        q_axes, n_axes = [], []
+        for length in lengths:
+            tpol = (2 * np.pi) / length
+            x_ = np.arange(tpol, 6, tpol)
+            n_axes.append(np.arange(-len(x_), len(x_) + 1))
+            q_axes.append(np.concatenate((np.append(np.flip(-x_), 0), x_)))
+        qx, qy, qz = np.meshgrid(*q_axes, indexing="ij")
+        qx, qy, qz = qx.ravel(), qy.ravel(), qz.ravel()
+        nx, ny, nz = np.meshgrid(*n_axes, indexing="ij")
+        q_norm = np.sqrt(qx**2 + qy**2 + qz**2)
+
+        # keep the half space and |q| <= qmax
+        half_space = (qx > 0) | ((qx == 0) & (qy > 0)) | ((qx == 0) & (qy == 0) & (qz >= 0))
+        mask = half_space & (q_norm <= qmax)
+        q_vectors = np.column_stack((qx[mask], qy[mask], qz[mask]))
+        q_indices = np.column_stack((nx.ravel()[mask], ny.ravel()[mask], nz.ravel()[mask]))
+        weights = np.where(q_norm[mask] == 0.0, 1.0, 2.0)
+
+        # shell index of each q vector
+        q_norm_1D, labels = np.unique(q_norm[mask], return_inverse=True)
+
+        self.q_shells = {key: (q_vectors, q_indices, weights, q_norm_1D, labels.ravel())}
+        return self.q_shells[key]
+
+    def __getstate__(self) -> dict:
+        r"""
+        Return the state of the Box to pickle (eg to send it to the worker processes), without the q vectors that
+        are rebuilt on demand.
+        """
+        state = self.__dict__.copy()
+        state["q_shells"] = {}
+        return state
+
     @staticmethod
     @njit(fastmath=True, cache=True)
     def minimum_image_distance(box_dimensions: np.array, position_1: np.array, position_2: np.array) -> np.ndarray:
@@ -0,0 +1,98 @@
+# external imports
+import numpy as np
+
+
+class NeighbourList:
+    r"""
+    Represents the first neighbours of all the atoms of a frame in a compressed sparse row (CSR) layout.
+
+    The neighbours of the atom i are indices[indptr[i]:indptr[i+1]], sorted by increasing distance.
+
+    Attributes:
+    -----------
+        - indptr (np.ndarray): Offsets of the neighbours of each atom in 'indices', shape (number of atoms + 1,).
+        - indices (np.ndarray): Indices of the neighbours.
+        - distances (np.ndarray): Distances to the neighbours (PBC applied).
+        - elements (np.ndarray): Element of each atom.
+        - rows (np.ndarray): Index of the central atom of each entry of 'indices'.
+
+    Methods:
+    --------
+        - __init__: Initializes a NeighbourList object.
+        - get_number_of_atoms: Returns the number of atoms.
+        - get_neighbours: Returns the indices of the neighbours of an atom.
+        - get_distances: Returns the distances to the neighbours of an atom.
+        - count_neighbours: Returns the number of neighbours of a given element of each atom.
+    """
+
+    def __init__(self, indptr, indices, distances, elements) -> None:
+        r"""
+        Initializes a NeighbourList object.
+
+        Parameters:
+        -----------
+            - indptr (np.ndarray): Offsets of the neighbours of each atom in 'indices'.
+            - indices (np.ndarray): Indices of the neighbours.
+            - distances (np.ndarray): Distances to the neighbours (PBC applied).
+            - elements (np.ndarray): Element of each atom.
+        """
+        self.indptr: np.ndarray = indptr
+        self.indices: np.ndarray = indices
+        self.distances: np.ndarray = distances
+        self.elements: np.ndarray = elements
+        self.rows: np.ndarray = np.repeat(
+            np.arange(len(indptr) - 1), np.diff(indptr)
+        )
+
+    def get_number_of_atoms(self) -> int:
+        r"""
+        Return the number of atoms.
+
+        Returns:
+        --------
+            - int : Number of atoms.
+        """
+        return len(self.indptr) - 1
+
+    def get_neighbours(self, i) -> np.ndarray:
+        r"""
+        Return the indices of the neighbours of the atom i.
+
+        Parameters:
+        -----------
+            - i (int) : Index of the atom.
+
+        Returns:
+        --------
+            - np.ndarray : Indices of the neighbours.
+        """
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def get_distances(self, i) -> np.ndarray:
+        r"""
+        Return the distances to the neighbours of the atom i.
+
+        Parameters:
+        -----------
+            - i (int) : Index of the atom.
+
+        Returns:
+        --------
+            - np.ndarray : Distances to the neighbours.
+        """
+        return self.distances[self.indptr[i] : self.indptr[i + 1]]
+
+    def count_neighbours(self, element) -> np.ndarray:
+        r"""
+        Return the number of neighbours of a given element of each atom.
+
+        Parameters:
+        -----------
+            - element (str) : Element of the neighbours to count.
+
+        Returns:
+        --------
+            - np.ndarray : Number of neighbours of each atom, shape (number of atoms,).
+        """
+        mask = self.elements[self.indices] == element
+        return np.bincount(self.rows[mask], minlength=self.get_number_of_atoms())
@@ -1,9 +1,7 @@
 # external imports
 import numpy as np
-from tqdm import tqdm
 from scipy.spatial import cKDTree
 from numba import njit, prange
-from numba_progress import ProgressBar  # NOTE: uncomment while debugging
 import importlib
 import os
 import re
@@ -11,7 +9,8 @@ import inspect
 
 # internal imports
 from .cutoff import Cutoff
-from ..utils.generate_color_gradient import generate_color_gradient
+from .neighbour_list import NeighbourList
+from ..data import species_registry
 
 
 class System:
@@ -25,16 +24,20 @@ class System:
         - box (Box): The Box object containing the lattice information at each frame.
         - frame (int): Frame of the system in the trajectory.
         - cutoffs (Cutoff): Cutoff object managing cutoff distances for pairs of elements.
+        - extension (str): Extension of the system (shared by its atoms).
+        - neighbour_list (NeighbourList): First neighbours of all the atoms (CSR layout).
 
     Methods:
     --------
         - __init__: Initializes a System object.
         - add_atom: Adds an Atom object to the list of atoms.
+        - from_arrays: Creates a System from the elements and positions of its atoms.
         - get_atoms: Returns the list of atoms.
         - get_positions: Returns the list of positions and elements of all Atom objects.
         - get_positions_by_element: Returns the list of positions of all Atom objects of the same element.
         - get_atoms_by_element: Returns the list of Atom objects belonging to the same species.
         - get_unique_element: Returns the unique elements present in the system along with their counts.
+        - get_species_table: Returns the elements, counts, scattering lengths and element codes of the atoms.
         - wrap_atomic_positions: Wraps atomic positions inside the simulation box using periodic boundary conditions.
         - compute_mass: Returns the mass of the system in atomic unit.
         - calculate_neighbours: Calculates the nearest neighbours of all atoms in the system.
@@ -57,16 +60,28 @@ class System:
             None  # The Box object containing the lattice information at each frame
         )
         self.frame: int = 0  # Frame of the system in the trajectory
+        self.positions: np.ndarray = None  # Positions of the atoms, shared with the atoms (see from_arrays)
+
+        # Extension of the system and its module, resolved once for all the atoms of the system
+        self.extension: str = settings.extension.get_value()
+        self.extension_module: object = importlib.import_module(
+            f"gspc.extensions.{settings.extension.get_value()}"
+        )
 
         # Set the cutoffs of the system.
         self.cutoffs: object = Cutoff(
             settings.cutoffs.get_value()
         )  # Cutoffs of the system
+        self.neighbour_list: object = None  # NeighbourList object of the first neighbours
+        self.coordinations: np.ndarray = None  # Coordination number of each atom (see calculate_neighbours)
+        self.detached_atoms: list = []  # Atoms added with their own frame, cutoffs and extension (see add_atom)
 
         # Set the structural attributes
         self.structural_units: dict = {}  # Structural units of the system
         self.angles: dict = {}  # Bond angular distribution of the system
         self.distances: dict = {}  # Pair distribution function of the system
+        self.pair_counts: dict = {}  # Number of pairs in each bin of the pair distribution function
+        self.species_table: dict = None  # Elements, counts and scattering lengths of the species (see get_species_table)
         self.mean_distances: dict = {} # Mean distances of the system
         self.mean_angles: dict = {} # Mean angles of the system
         self.msd: dict = {}  # Mean square displacement of the system
@@ -79,11 +94,59 @@ class System:
         --------
             - None.
         """
-        module = importlib.import_module(
-            f"gspc.extensions.{self.settings.extension.get_value()}"
-        )
-        transformed_atom = module.transform_into_subclass(atom)
+        transformed_atom = self.extension_module.transform_into_subclass(atom)
+        transformed_atom.index = len(self.atoms)
+        if transformed_atom.system is not self:
+            # created with the former signature of Atom, its neighbours are filled by calculate_neighbours
+            self.detached_atoms.append(transformed_atom)
         self.atoms.append(transformed_atom)
+        self.species_table = None
+        self.positions = None
+
+    @classmethod
+    def from_arrays(cls, settings, elements, positions, frame=0, cutoffs=None, ids=None) -> object:
+        r"""
+        Create a System from the elements and positions of its atoms.
+
+        The atoms are created directly as the subclass of their element in the extension (ATOM_SUBCLASSES), and their
+        positions are rows of a single array owned by the System (see get_positions). The frame, cutoffs and
+        extension of the atoms are read from the System.
+
+        Parameters:
+        -----------
+            - settings (Settings) : Settings object containing the list of all the parameters.
+            - elements (np.ndarray) : Element of each atom, all supported by the extension.
+            - positions (np.ndarray) : Positions of the atoms, shape (number of atoms, 3). The array is copied.
+            - frame (int) : Frame of the system in the trajectory.
+            - cutoffs (Cutoff) : Cutoffs shared by the atoms. Default is the Cutoff object built from the settings.
+            - ids (np.ndarray) : Identifier of each atom. Default is its index.
+
+        Returns:
+        --------
+            - System : System object with the atoms.
+        """
+        system = cls(settings)
+        system.frame = frame
+        system.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        if cutoffs is not None:
+            system.cutoffs = cutoffs
+        if ids is None:
+            ids = range(len(elements))
+
+        subclasses = system.extension_module.ATOM_SUBCLASSES
+        names = {}  # one str object per element shared by its atoms
+        for i, (element, id) in enumerate(zip(elements, ids)):
+            element = names.setdefault(element, str(element))
+            if element not in subclasses:
+                raise ValueError(
+                    f"\tERROR: Element {element} is not supported by the extension {settings.extension.get_value()}."
+                )
+            # the row is a view of system.positions, kept as is by the Atom
+            atom = subclasses[element](element, int(id), system.positions[i], system)
+            atom.index = i
+            system.atoms.append(atom)
+
+        return system
 
     def get_atoms(self) -> list:
         f"""
@@ -101,29 +164,18 @@ class System:
 
         Returns:
         --------
-            - tuple : the filtered position in a np.array and their associated elements in a np.array.
+            - tuple : the positions in a np.array (the array of the System, do not modify) and their associated
+                      elements in a np.array.
         """
-        filtered_positions = list(
-            map(
-                lambda atom: atom.position,
-                filter(
-                    lambda atom: hasattr(atom, "frame") and atom.frame == self.frame,
-                    self.atoms,
-                ),
-            )
-        )
-
-        filtered_elements = list(
-            map(
-                lambda atom: atom.element,
-                filter(
-                    lambda atom: hasattr(atom, "frame") and atom.frame == self.frame,
-                    self.atoms,
-                ),
-            )
-        )
-
-        return np.array(filtered_positions), np.array(filtered_elements)
+        table = self.get_species_table()
+        if self.positions is None:
+            # atoms added with add_atom: gather their positions once, the atoms then keep rows of the array
+            self.positions = np.array(
+                [atom.position for atom in self.atoms], dtype=np.float64
+            ).reshape(-1, 3)
+            for atom, position in zip(self.atoms, self.positions):
+                atom.position = position
+        return self.positions, table["elements_of_atoms"]
 
     def get_positions_by_element(self, element) -> np.array:
         r"""
@@ -133,19 +185,11 @@ class System:
         --------
             - np.array : Filtered positions.
         """
-        filtered_positions = list(
-            map(
-                lambda atom: atom.position,
-                filter(
-                    lambda atom: hasattr(atom, "frame")
-                    and atom.frame == self.frame
-                    and atom.element == element,
-                    self.atoms,
-                ),
-            )
-        )
-
-        return np.array(filtered_positions)
+        positions, _ = self.get_positions()
+        indices = self.get_species_table()["indices"].get(element)
+        if indices is None:
+            return np.empty((0, 3))
+        return positions[indices]
 
     def get_atoms_by_element(self, element) -> list:
         r"""
@@ -153,18 +197,9 @@ class System:
 
         Returns:
         --------
-            - list : list of Atom objects.
+            - list : list of Atom objects (cached, do not modify).
         """
-        filtered_atoms = list(
-            filter(
-                lambda atom: hasattr(atom, "frame")
-                and atom.frame == self.frame
-                and atom.element == element,
-                self.atoms,
-            )
-        )
-
-        return filtered_atoms
+        return self.get_species_table()["atoms"].get(element, [])
 
     def get_unique_element(self) -> np.array:
         r"""
@@ -174,19 +209,41 @@ class System:
         --------
             - np.array : array of the unique element in the system.
         """
-        filtered_elements = np.array(
-            list(
-                map(
-                    lambda atom: atom.element,
-                    filter(
-                        lambda atom: hasattr(atom, "frame")
-                        and atom.frame == self.frame,
-                        self.atoms,
-                    ),
-                )
+        table = self.get_species_table()
+        return table["elements"], table["counts"]
+
+    def get_species_table(self) -> dict:
+        r"""
+        Return the table of the species of the system, built once after the last atom was added.
+
+        Returns:
+        --------
+            - dict : 'elements' (sorted unique elements), 'counts' (number of atoms of each element),
+                     'correlation_lengths' (neutron scattering length of each element),
+                     'codes' (index of the element of each atom in 'elements'),
+                     'elements_of_atoms' (element of each atom),
+                     'indices' (indices of the atoms of each element) and 'atoms' (Atom objects of each element).
+        """
+        if self.species_table is None:
+            elements, codes, counts = np.unique(
+                [atom.element for atom in self.atoms], return_inverse=True, return_counts=True
             )
-        )
-        return np.unique(filtered_elements, return_counts=True)
+            self.species_table = {
+                "elements": elements,
+                "counts": counts,
+                "correlation_lengths": np.array(
+                    [species_registry[element][2] for element in elements]
+                ),
+                "codes": codes.ravel(),
+                "elements_of_atoms": elements[codes.ravel()],
+                "indices": {},
+                "atoms": {},
+            }
+            for code, element in enumerate(elements):
+                indices = np.flatnonzero(codes.ravel() == code)
+                self.species_table["indices"][element] = indices
+                self.species_table["atoms"][element] = [self.atoms[i] for i in indices]
+        return self.species_table
 
     def wrap_atomic_positions(self) -> None:
         r"""
@@ -196,35 +253,13 @@ class System:
         --------
             - None.
         """
-        if not self.settings.quiet.get_value():
-            color_gradient = generate_color_gradient(len(self.atoms))
-            progress_bar = tqdm(
-                prange(len(self.atoms)),
-                desc="Wrapping positions inside the box ...",
-                colour="#0dff00",
-                leave=False,
-                unit="atom",
-            )
-        else:
-            progress_bar = prange(len(self.atoms))
-        color = 0
-        for i in progress_bar:
-            atom = self.atoms[i]
-            # Updating progress bar
-            if not self.settings.quiet.get_value():
-                progress_bar.set_description(
-                    f"Wrapping positions inside the box {atom.id} ..."
-                )
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[color]
-                color += 1
-
-            # Getting box dimensions at the current frame
-            box_size = self.box.get_box_dimensions(self.frame)
+        # Getting box dimensions at the current frame
+        box_size = self.box.get_box_dimensions(self.frame)
 
-            # Loop over the dimension of the simulation box (ie 3D)
-            for i in range(len(box_size)):
-                # Apply periodic boundary conditions for each dimension
-                atom.position[i] = np.mod(atom.position[i] + box_size[i], box_size[i])
+        # Apply periodic boundary conditions for each dimension
+        # (the positions of the atoms are rows of this array, see get_positions)
+        positions, _ = self.get_positions()
+        np.mod(positions + box_size, box_size, out=positions)
 
     def calculate_neighbours(self) -> None:
         r"""
@@ -251,49 +286,51 @@ class System:
         # Calculate the tree with the pbc applied
         tree_with_pbc = cKDTree(positions, boxsize=box_size)
 
-        # Set the progress bar
-        if not self.settings.quiet.get_value():
-            color_gradient = generate_color_gradient(len(positions))
-            progress_bar = tqdm(
-                prange(len(positions)),
-                desc="Fetching nearest neighbours ...",
-                colour="#00ffff",
-                leave=False,
-                unit="atom",
-            )
-        else:
-            progress_bar = prange(len(positions))
-
-        # Loop over the atomic positions
-        for i in progress_bar:
-            # Update progress bar
-            if not self.settings.quiet.get_value():
-                progress_bar.set_description(f"Fetching nearest neighbours {i} ...")
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[i]
-
-            # Process with pbc applied
-            # Query the neighbouring atoms within the cutoff distance
-            index = tree_with_pbc.query_ball_point(positions[i], max_cutoff)
-
-            # Calculate the distance with k nearest neighbours
-            distances, indices = tree_with_pbc.query(positions[i], k=len(index))
-
-            # Check if result is a list or a int
-            if isinstance(indices, int):
-                # indices is an int, turn indices into a list of a single int
-                indices = [indices]
-
-            # Check if results is a list of a int
-            if isinstance(distances, int):
-                # distances is an int, turn distances into a list of a single int
-                distances = [distances]
-
-            # Add the nearest neighbours to central atom
-            for j in indices:
-                self.atoms[i].add_neighbour(self.atoms[j])
+        # Fetch all the pairs of atoms within the maximum cutoff at once
+        pairs = tree_with_pbc.query_pairs(max_cutoff, output_type="ndarray")
+        i, j = pairs[:, 0], pairs[:, 1]
+        vectors = positions[j] - positions[i]
+        vectors -= np.round(vectors / box_size) * box_size
+        distances = np.linalg.norm(vectors, axis=1)
+
+        # Keep the pairs within the cutoff of their pair of elements
+        unique_elements, codes = np.unique(mask, return_inverse=True)
+        cutoffs = np.array(
+            [
+                [self.cutoffs.get_cutoff(e1, e2) for e2 in unique_elements]
+                for e1 in unique_elements
+            ]
+        )
+        keep = (distances <= cutoffs[codes[i], codes[j]]) & (distances > 0)
+        i, j, distances = i[keep], j[keep], distances[keep]
+
+        # Build the neighbour list (both directions), neighbours sorted by distance
+        rows = np.concatenate((i, j))
+        indices = np.concatenate((j, i))
+        distances = np.concatenate((distances, distances))
+        order = np.lexsort((distances, rows))
+        indptr = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(positions)), out=indptr[1:])
+        self.neighbour_list = NeighbourList(
+            indptr, indices[order], distances[order], mask
+        )
 
-            self.atoms[i].filter_neighbours(distances)
-            self.atoms[i].calculate_coordination()
+        # Count the neighbours of the coordinating element of each atom (all the neighbours if None)
+        self.coordinations = np.diff(indptr)
+        for element, subclass in self.extension_module.ATOM_SUBCLASSES.items():
+            if subclass.coordinating_element is not None:
+                rows = mask == element
+                self.coordinations[rows] = self.neighbour_list.count_neighbours(
+                    subclass.coordinating_element
+                )[rows]
+
+        # The atoms read their neighbours and coordination from the neighbour list on first use (see Atom.neighbours),
+        # except the atoms created without this System
+        for atom in self.detached_atoms:
+            atom.neighbours = [
+                self.atoms[j] for j in self.neighbour_list.get_neighbours(atom.index)
+            ]
+            atom.calculate_coordination()
 
     # ---------------------- Structural properties calculation methods ---------------------- #
 
@@ -311,14 +348,18 @@ class System:
             - None.
         """
 
-        module = importlib.import_module(f"gspc.extensions.{extension}")
+        if extension == self.settings.extension.get_value():
+            module = self.extension_module
+        else:
+            module = importlib.import_module(f"gspc.extensions.{extension}")
 
         box = self.box.get_box_dimensions(self.frame)
 
-        self.structural_units = module.calculate_structural_units(self.get_atoms(), box)
+        self.structural_units = module.calculate_structural_units(
+            self.get_atoms(), box, self.neighbour_list
+        )
 
 
-    # @njit(parallel=True) # TODO : implement a fork of gspc without the progress bar and prange instead
     def calculate_bond_angular_distribution(self) -> None:
         r"""
         Determine the bond angular distribution of the system.
@@ -328,27 +369,7 @@ class System:
             - None.
         """
 
-        if self.settings.quiet.get_value() == False:
-            progress_bar = tqdm(
-                prange(len(self.atoms)),
-                desc="Calculating bond angular distribution ...",
-                colour="#00ffff",
-                leave=False,
-                unit="atom",
-            )
-            color_gradient = generate_color_gradient(len(self.atoms))
-        else:
-            progress_bar = prange(len(self.atoms))
-
-        for i in progress_bar: # NOTE : uncomment this when done testing
-        # for i in prange(len(self.atoms)):
-            # Update the progress bar
-            atom = self.atoms[i]
-            if self.settings.quiet.get_value() == False:
-                progress_bar.set_description(
-                    f"Calculating bond angular distribution {atom.id} ..."
-                )
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[atom.id]
+        for atom in self.atoms:
             dict_angles = atom.calculate_angles_with_neighbours(self.box)
             for key, value in dict_angles.items():
                 if key in self.angles:
@@ -413,26 +434,8 @@ class System:
         # Calculate the tree with the pbc applied
         tree_with_pbc = cKDTree(positions, boxsize=box_size)
 
-        # Set the progress bar
-        if self.settings.quiet.get_value() == False:
-            color_gradient = generate_color_gradient(len(positions))
-            progress_bar = tqdm(
-                range(len(positions)),
-                desc="Fetching long range neighbours ...",
-                colour="#00ffff",
-                leave=False,
-                unit="atom",
-            )
-        else:
-            progress_bar = range(len(positions))
-
         # Loop over the atomic positions
-        for i in progress_bar:
-            # Update progress bar
-            if self.settings.quiet.get_value() == False:
-                progress_bar.set_description(f"Fetching long range neighbours {i} ...")
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[i]
-
+        for i in range(len(positions)):
             # Process with pbc applied
             # Query the neighbouring atoms within the cutoff distance
             index = tree_with_pbc.query_ball_point(positions[i], max_cutoff)
@@ -472,27 +475,7 @@ class System:
 
         self.calculate_long_range_neighbours()
 
-        if self.settings.quiet.get_value() == False:
-            progress_bar = tqdm(
-                prange(len(self.atoms)),
-                desc="Calculating pair distribution function ...",
-                colour="#00ffff",
-                leave=False,
-                unit="atom",
-            )
-            color_gradient = generate_color_gradient(len(self.atoms))
-        else:
-            progress_bar = prange(len(self.atoms))
-
-        for i in progress_bar:
-            atom = self.atoms[i]
-            # Update the progress bar
-            if self.settings.quiet.get_value() == False:
-                progress_bar.set_description(
-                    f"Calculating pair distribution function {atom.id} ..."
-                )
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[atom.id]
-
+        for atom in self.atoms:
             dict_distances = atom.calculate_distances_with_neighbours()
             for key, value in dict_distances.items():
                 if key in self.distances:
@@ -521,6 +504,12 @@ class System:
                 continue
             self.distances[key], bins = np.histogram(value, bins=nbins, range=(0, rmax))
             self.distances["r"] = bins[:-1]
+            # Pairs of the same species are seen from both atoms, the others only from the first species of the key
+            if self.decrypt_key(key)[0]:
+                self.pair_counts[key] = self.distances[key] / 2
+            else:
+                self.pair_counts[key] = self.distances[key].astype(float)
+            self.pair_counts["r"] = bins
             self.distances[key] = (
                 self.distances[key] / 2
             )  # divide by 2 to avoid double counting
@@ -615,44 +604,30 @@ class System:
         --------
             - None.
         """
-        if self.settings.quiet.get_value() == False:
-            progress_bar = tqdm(
-                self.atoms,
-                desc="Calculating mean square displacement ...",
-                colour="#00ffff",
-                leave=False,
-                unit="atom",
-            )
-            color_gradient = generate_color_gradient(len(self.atoms))
-        else:
-            progress_bar = self.atoms
-
-        for atom in progress_bar:
-            # Update the progress bar
-            if self.settings.quiet.get_value() == False:
-                progress_bar.set_description(
-                    f"Calculating mean square displacement {atom.id} ..."
-                )
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[atom.id]
-
+        for atom in self.atoms:
             dist = atom.calculate_mean_square_displacement()
 
             # Add the mean square displacement to the corresponding species
             self.msd[atom.element] += dist**2
             self.msd["total"] += dist**2
 
-    def append_forms(self, stored_forms):
+    def append_forms(self, stored_forms, number_of_frames):
         r"""
-        TODO finish documentation
-        """
+        Add the forms of the polyhedra of the system (see calculate_structural_units) to the lifetime accumulator.
 
-        module = importlib.import_module(
-            f"gspc.extensions.{self.settings.extension.get_value()}"
-        )
+        Parameters:
+        -----------
+            - stored_forms (LifetimeAccumulator) : Lifetimes of the forms of the previous frames. None at the first frame.
+            - number_of_frames (int) : Maximum number of frames of the trajectory.
+
+        Returns:
+        --------
+            - LifetimeAccumulator : Lifetimes of the forms, this frame included.
+        """
 
-        self.forms = module.append_forms(
-            self.settings.number_of_frames.get_value(),
-            self.atoms,
+        self.forms = self.extension_module.append_forms(
+            number_of_frames,
+            self.structural_units,
             stored_forms,
         )
 
@@ -663,11 +638,7 @@ class System:
         TODO finish documentation
         """
 
-        module = importlib.import_module(
-            f"gspc.extensions.{self.settings.extension.get_value()}"
-        )
-
-        self.lifetime, prob = module.calculate_lifetime(self.settings, self.forms)
+        self.lifetime, prob = self.extension_module.calculate_lifetime(self.settings, self.forms)
 
         return self.lifetime, prob
 
@@ -685,212 +656,277 @@ class System:
         #   a-b, a-c, b-c, a-a, b-b, c-c, total
         #   etc.
 
-        # NOTE: not sure if three species are possible
+        if self.settings.nsf_settings.get_method() == "fourier":
+            self.calculate_neutron_structure_factor_from_pdf(pairs)
+            return
 
-        if self.settings.quiet.get_value() == False:
-            progress_bar = tqdm(
-                pairs,
-                desc="Calculating neutron structure factor ...",
-                colour="#00ffff",
-                leave=False,
-                unit="pair",
-            )
-            color_gradient = generate_color_gradient(len(pairs))
-        else:
-            progress_bar = pairs
-
-        tpol = (2 * np.pi) / (
-            self.box.get_box_dimensions(self.frame)[0]
-        )  # NOTE: assuming box is cubic
-
-        # generate the q vectors
-        x_ = np.arange(tpol, 6, tpol)
-        y_ = np.arange(tpol, 6, tpol)
-        z_ = np.arange(tpol, 6, tpol)
-        x__ = x_ * -1
-        y__ = y_ * -1
-        z__ = z_ * -1
-        x__ = np.flip(x__)
-        y__ = np.flip(y__)
-        z__ = np.flip(z__)
-        x__ = np.append(x__, 0)
-        y__ = np.append(y__, 0)
-        z__ = np.append(z__, 0)
-        x_ = np.concatenate((x__, x_))
-        y_ = np.concatenate((y__, y_))
-        z_ = np.concatenate((z__, z_))
-        qx, qy, qz = np.meshgrid(x_, y_, z_, indexing="ij")
-
-        assert np.all(qx[:, 0, 0] == x_)
-        assert np.all(qy[0, :, 0] == y_)
-        assert np.all(qz[0, 0, :] == z_)
-
-        q_norm = np.sqrt(qx**2 + qy**2 + qz**2)
-        q_norm_unique = np.unique(q_norm)
-        q_norm_1D = np.reshape(q_norm_unique, len(q_norm_unique))
-        are_greater_than_10 = q_norm_1D > 10.0
-        q_norm_1D = np.delete(q_norm_1D, np.where(are_greater_than_10)[0])
-
-        # Calculate the neutron structure factor
-        qsin = {}
+        # q vectors of the half space and |q| shells, computed once per box size
+        q_vectors, q_indices, weights, q_norm_1D, labels = self.box.get_q_shells(
+            self.frame, self.settings.nsf_settings.get_qmax()
+        )
+        number_of_shells = len(q_norm_1D)
+        counts = np.bincount(labels, weights=weights, minlength=number_of_shells)
+
+        # Sums of cos(q.r) and sin(q.r) of each species
+        table = self.get_species_table()
+        positions = self.get_positions()[0]
         qcos = {}
-        correlation_lentgh = {}
+        qsin = {}
+        for species in table["elements"]:
+            qcos[species], qsin[species] = self._calculate_rho(
+                q_vectors, q_indices, positions[table["indices"][species]]
+            )
 
-        number_of_atoms = np.sum(self.get_unique_element()[1])
+        # Partials of all the pairs of species and total
+        f = self._build_partials(qcos, qsin, table)
 
-        for species in self.get_unique_element()[0]:
-            qsin[species] = np.zeros_like(qx)
-            qcos[species] = np.zeros_like(qx)
+        # Average over the q vectors of each |q| shell, q = 0 is left to 0
+        structure_factor = {}
+        structure_factor["q"] = q_norm_1D
+        for pair in pairs:
+            sums = np.bincount(labels, weights=weights * f[pair], minlength=number_of_shells)
+            structure_factor[pair] = sums / counts
+            structure_factor[pair][q_norm_1D == 0.0] = 0.0
 
-            atoms = self.get_atoms_by_element(species)
+        self.q = structure_factor["q"]
+        self.nsf = structure_factor
 
-            correlation_lentgh[species] = atoms[0].correlation_length
+    @staticmethod
+    def _build_partials(qcos, qsin, table) -> dict:
+        r"""
+        Build the partial and total structure factors of any number of species from the sums of cos(q.r) and sin(q.r).
 
-            positions = np.array([atom.position for atom in atoms])
+            S_ab(q) = Re(rho_a(q) rho_b(q)*) / N
+            S(q) = sum_a sum_b b_a b_b S_ab(q) / sum_a c_a b_a^2
 
-            if self.settings.quiet.get_value() == False:
-                with ProgressBar(
-                    total=len(positions),
-                    leave=False,
-                    colour="#00ffff",
-                    unit="atom",
-                    desc=species,
-                ) as progress:
-                    cosd, sind = self._calculate_neutron_structure_factor(
-                        qx, qy, qz, positions, progress
-                    )
-            else:
-                cosd, sind = self._calculate_neutron_structure_factor(
-                    qx, qy, qz, positions, None
-                )
+        Parameters:
+        -----------
+            - qcos (dict) : Sum of cos(q.r) over the atoms of each species.
+            - qsin (dict) : Sum of sin(q.r) over the atoms of each species.
+            - table (dict) : Species table of the system (see get_species_table).
 
-            qcos[species] += cosd
-            qsin[species] += sind
+        Returns:
+        --------
+            - dict : Structure factors for the keys "a-b" (both orders) and "total".
+        """
+        elements = table["elements"]
+        b = table["correlation_lengths"]
+        number_of_atoms = np.sum(table["counts"])
 
-        structure_factor = {}
         f = {}
+        total = 0.0
+        for i, species1 in enumerate(elements):
+            for j in range(i, len(elements)):
+                species2 = elements[j]
+                partial = (
+                    qcos[species1] * qcos[species2] + qsin[species1] * qsin[species2]
+                ) / number_of_atoms
+                f[f"{species1}-{species2}"] = partial
+                f[f"{species2}-{species1}"] = partial
+                total = total + (1 if i == j else 2) * b[i] * b[j] * partial
 
-        structure_factor["q"] = q_norm_1D
+        normalization = np.sum(table["counts"] * b**2) / number_of_atoms
+        f["total"] = total / normalization
 
-        for i, pair in enumerate(progress_bar):
-            # Update the progress bar
-            if self.settings.quiet.get_value() == False:
-                progress_bar.set_description(
-                    f"Calculating neutron structure factor {pair} ..."
-                )
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[i]
+        return f
 
-            structure_factor[pair] = np.zeros_like(q_norm_1D)
+    def calculate_neutron_structure_factor_from_pdf(self, pairs) -> None:
+        r"""
+        Calculate the neutron structure factor of the system by sine transform of the pair distribution functions.
 
-            try:
-                species1, species2 = pair.split("-")
+        With c_a the concentration of the species a and n_ab(r) the number of (i in a, j in b) pairs at distance r:
+            S_ab(q) = c_a delta_ab + 1/N sum_r [n_ab(r) - N_a N_b 4 pi r^2 dr / V] sin(qr)/(qr) W(r)
+        which is the spherical average of the partials of calculate_neutron_structure_factor, truncated at the rmax
+        of the pair distribution function. W is the Lorch window sin(pi r/rmax)/(pi r/rmax) if enabled, 1 otherwise.
+        The total is weighted by the correlation lengths of the species. The pair distribution function is
+        calculated first if it is not already done for this frame.
 
-                if species1 == species2:
-                    f[pair] = (
-                        qcos[species1] ** 2 + qsin[species1] ** 2
-                    ) / number_of_atoms
-                else:
-                    A = (qcos[species1] + qcos[species2]) ** 2
-                    B = (qsin[species1] + qsin[species2]) ** 2
-                    C = qcos[species1] ** 2 + qsin[species1] ** 2
-                    D = qcos[species2] ** 2 + qsin[species2] ** 2
-                    f[pair] = (A + B - C - D) / (2 * number_of_atoms)
+        Parameters:
+        -----------
+            - pairs (list) : Keys of the structure factors to calculate (eg "Si-O", "total").
 
-            except ValueError:
-                # pair = "total"
+        Returns:
+        --------
+            - None.
+        """
+        if not self.pair_counts:
+            self.calculate_pair_distribution_function()
 
-                f[pair] = np.zeros_like(qx)
+        q_norm_1D = self.box.get_q_shells(self.frame, self.settings.nsf_settings.get_qmax())[3]
 
-                for species in self.get_unique_element()[0]:
-                    f[pair] += (
-                        correlation_lentgh[species] ** 2 * f[f"{species}-{species}"]
-                    )
+        bins = self.pair_counts["r"]
+        r = 0.5 * (bins[1:] + bins[:-1])
+        shell_volumes = 4.0 / 3.0 * np.pi * (bins[1:] ** 3 - bins[:-1] ** 3)
+        volume = self.box.get_volume(self.frame)
 
-                try:
-                    f[pair] += (
-                        2
-                        * correlation_lentgh[self.get_unique_element()[0][0]]
-                        * correlation_lentgh[self.get_unique_element()[0][1]]
-                        * f[
-                            f"{self.get_unique_element()[0][0]}-{self.get_unique_element()[0][1]}"
-                        ]
-                    )
-                except:
-                    f[pair] += (
-                        2
-                        * correlation_lentgh[self.get_unique_element()[0][0]]
-                        * correlation_lentgh[self.get_unique_element()[0][1]]
-                        * f[
-                            f"{self.get_unique_element()[0][1]}-{self.get_unique_element()[0][0]}"
-                        ]
+        # sin(qr)/(qr) for each q shell and bin (np.sinc(x) = sin(pi x)/(pi x))
+        kernel = np.sinc(np.outer(q_norm_1D, r) / np.pi)
+        if self.settings.nsf_settings.get_lorch():
+            kernel *= np.sinc(r / bins[-1])
+
+        table = self.get_species_table()
+        elements, numbers = table["elements"], table["counts"]
+        number_of_atoms = np.sum(numbers)
+
+        f = {}
+        for a, species1 in enumerate(elements):
+            for b, species2 in enumerate(elements[a:], start=a):
+                if f"{species1}{species2}" in self.pair_counts:
+                    counts = self.pair_counts[f"{species1}{species2}"]
+                elif f"{species2}{species1}" in self.pair_counts:
+                    counts = self.pair_counts[f"{species2}{species1}"]
+                else:
+                    raise ValueError(
+                        f"\tERROR: No pair distribution function {species1}{species2} for the structure factor."
                     )
+                if a == b:
+                    counts = 2 * counts
+                    background = numbers[a] * (numbers[a] - 1) / volume * shell_volumes
+                    self_term = numbers[a] / number_of_atoms
+                else:
+                    background = numbers[a] * numbers[b] / volume * shell_volumes
+                    self_term = 0.0
+                f[f"{species1}-{species2}"] = self_term + kernel @ (counts - background) / number_of_atoms
+                f[f"{species2}-{species1}"] = f[f"{species1}-{species2}"]
+
+        # Total weighted by the correlation lengths
+        lengths = table["correlation_lengths"]
+        f["total"] = np.zeros_like(q_norm_1D)
+        for a, species1 in enumerate(elements):
+            for b in range(a, len(elements)):
+                f["total"] += (1 if a == b else 2) * lengths[a] * lengths[b] * f[f"{species1}-{elements[b]}"]
+        f["total"] /= np.sum(numbers * lengths**2) / number_of_atoms
+
+        structure_factor = {"q": q_norm_1D}
+        for pair in pairs:
+            structure_factor[pair] = f[pair]
+            structure_factor[pair][q_norm_1D == 0.0] = 0.0
 
-                normalization = (
-                    self.get_unique_element()[1][0]
-                    * correlation_lentgh[self.get_unique_element()[0][0]] ** 2
-                    + self.get_unique_element()[1][1]
-                    * correlation_lentgh[self.get_unique_element()[0][1]] ** 2
-                ) / number_of_atoms
+        self.q = structure_factor["q"]
+        self.nsf = structure_factor
 
-                f[pair] /= normalization
+    def _calculate_rho(self, q_vectors, q_indices, positions) -> tuple:
+        r"""
+        Calculate the sums of cos(q.r) and sin(q.r) over the atoms with the engine of the settings.
 
-        # Build the structure factor histogram
-        if self.settings.quiet.get_value() == False:
-            progress_bar = tqdm(
-                range(len(q_norm_1D) - 1),
-                desc="Building the structure factor histogram ...",
-                colour="#00ffff",
-                leave=False,
-                unit="pair",
-            )
-            color_gradient = generate_color_gradient(len(q_norm_1D) - 1)
-        else:
-            progress_bar = range(len(q_norm_1D) - 1)
-        for i in progress_bar:
-            # Update progress bar
-            if self.settings.quiet.get_value() == False:
-                progress_bar.colour = "#%02x%02x%02x" % color_gradient[i]
+        Parameters:
+        -----------
+            - q_vectors (np.ndarray) : q vectors, shape (number of q vectors, 3).
+            - q_indices (np.ndarray) : Integer coordinates of the q vectors in units of 2*pi/length of each axis.
+            - positions (np.ndarray) : Positions of the atoms.
 
-            if q_norm_1D[i] == 0.0 or q_norm_1D[i] > 10.0:
-                continue
-            lower_bound = q_norm_1D[i]
-            upper_bound = q_norm_1D[i + 1]
+        Returns:
+        --------
+            - qcos (np.ndarray) : Sum of cos(q.r) for each q vector.
+            - qsin (np.ndarray) : Sum of sin(q.r) for each q vector.
+        """
+        # Trigonometry in the precision of the settings, accumulation in float64
+        precision = self.settings.precision.get_value()
+        positions = positions.astype(precision)
 
-            q_lower = lower_bound <= q_norm
-            q_upper = q_norm < upper_bound
-            q = q_lower & q_upper
-            elements_to_sum = np.where(q)
+        if self.settings.nsf_settings.get_engine() == "direct":
+            kernel = self._calculate_neutron_structure_factor
+            arguments = (q_vectors.astype(precision), positions)
+        else:
+            # q vectors are sorted by (nx, ny), each column of nz is processed by one thread
+            change = np.any(q_indices[1:, :2] != q_indices[:-1, :2], axis=1)
+            columns = np.concatenate(([0], np.flatnonzero(change) + 1, [len(q_indices)]))
+            dq = 2 * np.pi / self.box.get_box_dimensions(self.frame)
+            # buffer of the powers of exp(i dq r) of a block of atoms
+            nmax = np.max(np.abs(q_indices)) if len(q_indices) > 0 else 0
+            powers = np.empty(
+                (3, 1024, 2 * nmax + 1),
+                dtype=np.complex64 if precision == "float32" else np.complex128,
+            )
+            kernel = self._calculate_neutron_structure_factor_recurrence
+            arguments = (q_indices, columns, dq, positions, powers)
 
-            for pair in structure_factor.keys():
-                if pair == "q":
-                    continue
+        return kernel(*arguments)
 
-                temp = f[pair][elements_to_sum]
-                average = np.mean(temp)
-                structure_factor[pair][i] += average
+    @staticmethod
+    @njit(parallel=True, nogil=True)
+    def _calculate_neutron_structure_factor_recurrence(q_indices, columns, dq, positions, powers):
+        r"""
+        Calculate the sums of cos(q.r) and sin(q.r) over the atoms for each q vector q = (dqx nx, dqy ny, dqz nz).
 
-        self.q = structure_factor["q"]
-        self.nsf = structure_factor
+        exp(i q.r) = exp(i dqx x)^nx * exp(i dqy y)^ny * exp(i dqz z)^nz, the powers of each atom are built by
+        recurrence (complex multiplications instead of one sin and cos per atom and q vector). The atoms are
+        processed by blocks of the size of the 'powers' buffer, shape (3, block size, 2 * nmax + 1), whose dtype
+        (complex64 or complex128) sets the precision of the powers and of the sums over a block. The sums over
+        the blocks are accumulated in complex128.
+        The columns of q vectors with the same (nx, ny) are distributed over the threads.
+
+        Returns:
+        --------
+            - qcos (np.ndarray) : Sum of cos(q.r) for each q vector.
+            - qsin (np.ndarray) : Sum of sin(q.r) for each q vector.
+        """
+        number_of_q = len(q_indices)
+        block_size = powers.shape[1]
+        nmax = (powers.shape[2] - 1) // 2
+        rho = np.zeros(number_of_q, dtype=np.complex128)
+        rho_block = np.zeros(number_of_q, dtype=powers.dtype)
+        for start in range(0, len(positions), block_size):
+            stop = min(start + block_size, len(positions))
+
+            # powers[axis, atom, n + nmax] = exp(i dq r_axis)^n
+            for i in prange(stop - start):
+                for axis in range(3):
+                    powers[axis, i, nmax] = 1.0
+                    if nmax == 0:
+                        continue
+                    powers[axis, i, nmax + 1] = np.exp(1j * dq[axis] * np.float64(positions[start + i, axis]))
+                    powers[axis, i, nmax - 1] = np.conj(powers[axis, i, nmax + 1])
+                    for n in range(2, nmax + 1):
+                        powers[axis, i, nmax + n] = powers[axis, i, nmax + n - 1] * powers[axis, i, nmax + 1]
+                        powers[axis, i, nmax - n] = np.conj(powers[axis, i, nmax + n])
+
+            for c in prange(len(columns) - 1):
+                # the nz of a column are consecutive
+                first, length = columns[c], columns[c + 1] - columns[c]
+                nx = q_indices[first, 0] + nmax
+                ny = q_indices[first, 1] + nmax
+                nz = q_indices[first, 2] + nmax
+                for k in range(first, first + length):
+                    rho_block[k] = 0.0
+                for i in range(stop - start):
+                    exy = powers[0, i, nx] * powers[1, i, ny]
+                    for j in range(length):
+                        rho_block[first + j] += exy * powers[2, i, nz + j]
+                for k in range(first, first + length):
+                    rho[k] += rho_block[k]
+
+        return rho.real.copy(), rho.imag.copy()
 
     @staticmethod
     @njit(parallel=True, nogil=True)
-    def _calculate_neutron_structure_factor(qx, qy, qz, positions, progress_proxy):
+    def _calculate_neutron_structure_factor(q_vectors, positions, chunk_size=64):
         r"""
-        Calculate the neutron structure factor of the atom.
+        Calculate the sums of cos(q.r) and sin(q.r) over the atoms for each q vector.
+
+        The q vectors are split in chunks distributed over the threads, each q vector is accumulated in a
+        scalar by a single thread (no shared reduction, no temporary array).
 
         Returns:
         --------
-            - nsf (float) : The neutron structure factor of the atom.
+            - qcos (np.ndarray) : Sum of cos(q.r) for each q vector.
+            - qsin (np.ndarray) : Sum of sin(q.r) for each q vector.
         """
-        qcos, qsin = np.zeros_like(qx), np.zeros_like(qx)
-        for i in prange(len(positions)):
-            position = positions[i]
-            dot = qx * position[0] + qy * position[1] + qz * position[2]
-            sind = np.sin(dot)
-            cosd = np.cos(dot)
-            qcos += cosd
-            qsin += sind
-            if progress_proxy is not None:
-                progress_proxy.update(1)
+        number_of_q = len(q_vectors)
+        number_of_chunks = (number_of_q + chunk_size - 1) // chunk_size
+        # NOTE: float32 inputs give float32 trigonometry, the sums stay in float64
+        qcos, qsin = np.zeros(number_of_q), np.zeros(number_of_q)
+        for c in prange(number_of_chunks):
+            stop = min((c + 1) * chunk_size, number_of_q)
+            for k in range(c * chunk_size, stop):
+                qx, qy, qz = q_vectors[k, 0], q_vectors[k, 1], q_vectors[k, 2]
+                sum_cos = 0.0
+                sum_sin = 0.0
+                for i in range(len(positions)):
+                    dot = qx * positions[i, 0] + qy * positions[i, 1] + qz * positions[i, 2]
+                    sum_cos += np.cos(dot)
+                    sum_sin += np.sin(dot)
+                qcos[k] = sum_cos
+                qsin[k] = sum_sin
 
         return qcos, qsin
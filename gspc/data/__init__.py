@@ -6,6 +6,7 @@ __all__ = [
     "atomic_numbers",
     "atomic_names",
     "chemical_symbols",
+    "species_registry",
 ]
 
 correlation_lengths = np.array(
@@ -379,3 +380,10 @@ atomic_masses = np.array( #iupac2016
         294.214,  # 294Og
     ]
 )
+
+# Registry of the species, element -> (code, atomic mass, coherent scattering length)
+# The code is the index of the element in the arrays above.
+species_registry = {
+    str(symbol): (code, float(atomic_masses[code]), float(correlation_lengths[code]))
+    for code, symbol in enumerate(chemical_symbols)
+}
@@ -4,7 +4,6 @@
 
 # external imports
 import numpy as np
-from tqdm import tqdm
 from numba import njit
 
 from gspc.extensions.SiO2 import LIST_OF_SUPPORTED_ELEMENTS
@@ -14,13 +13,37 @@ from ..core.atom import Atom
 from ..core.box import Box
 from ..utils.generate_color_gradient import generate_color_gradient
 
+# The silicate network of NSx is analysed as in SiO2 (the sodiums are only counted in NaOz)
+from .SiO2 import (
+    calculate_qi_species,
+    calculate_connectivity,
+    get_vertices,
+    calculate_distances_between_vertices,
+    calculate_polyhedricity,
+    calculate_tetrahedricity,
+    calculate_pentahedricity,
+    calculate_octahedricity,
+    calculate_histogram,
+)
+
+# The forms of the SiOz polyhedra are tracked along the trajectory as in SiO2
+from .SiO2 import append_forms, calculate_lifetime, calculate_transition_matrix
+
 # List of supported elements for the extension NSx
 LIST_OF_SUPPORTED_ELEMENTS = ["Si", "O", "Na"]
 
+# Forms of the SiOz polyhedra, the code of a form is its index in the list (0: no form)
+FORMS = ["", "tetrahedron", "square base pyramid", "triangular bipyramid", "octahedron"]
+# Short names of the forms used in the output files
+FORM_LABELS = ["other", "4", "5p", "5bp", "6"]
+
 
 class Silicon(Atom):
-    def __init__(self, element, id, position, frame, cutoffs, extension) -> None:
-        super().__init__(element, id, position, frame, cutoffs, extension)
+    __slots__ = ("number_of_corners", "number_of_edges", "number_of_faces", "qi_species", "form")
+    coordinating_element = "O"
+
+    def __init__(self, element, id, position, system=None, cutoffs=None, extension=None, frame=None) -> None:
+        super().__init__(element, id, position, system, cutoffs, extension, frame)
         self.number_of_corners: int = 0
         self.number_of_edges: int = 0
         self.number_of_faces: int = 0
@@ -57,18 +80,6 @@ class Silicon(Atom):
         """
         return self.form
 
-    def calculate_coordination(self) -> None:
-        """
-        Calculate the coordination number of the atom (ie the number of first neighbours) for the extension SiO2
-        """
-        self.coordination = len(
-            [
-                neighbour
-                for neighbour in self.neighbours
-                if neighbour.get_element() == "O"
-            ]
-        )
-
     def calculate_angles_with_neighbours(self, box: Box) -> dict:
         r"""
         Calculate and sort the angles between the atom and its neighbours.
@@ -138,20 +149,11 @@ class Silicon(Atom):
 
 
 class Oxygen(Atom):
-    def __init__(self, element, id, position, frame, cutoffs, extension) -> None:
-        super().__init__(element, id, position, frame, cutoffs, extension)
+    __slots__ = ()
+    coordinating_element = "Si"
 
-    def calculate_coordination(self) -> None:
-        """
-        Calculate the coordination number of the atom (ie the number of first neighbours) for the extension SiO2
-        """
-        self.coordination = len(
-            [
-                neighbour
-                for neighbour in self.neighbours
-                if neighbour.get_element() == "Si"
-            ]
-        )
+    def __init__(self, element, id, position, system=None, cutoffs=None, extension=None, frame=None) -> None:
+        super().__init__(element, id, position, system, cutoffs, extension, frame)
 
     def calculate_angles_with_neighbours(self, box: Box) -> dict:
         r"""
@@ -228,20 +230,11 @@ class Oxygen(Atom):
         return distances
 
 class Sodium(Atom):
-    def __init__(self, element, id, position, frame, cutoffs, extension) -> None:
-        super().__init__(element, id, position, frame, cutoffs, extension)
+    __slots__ = ()
+    coordinating_element = "O"
 
-    def calculate_coordination(self) -> None:
-        """
-        Calculate the coordination number of the atom (ie the number of first neighbour)
-        """
-        self.coordination = len(
-            [
-                neighbour
-                for neighbour in self.neighbours
-                if neighbour.get_element() == "O"
-            ]
-        )
+    def __init__(self, element, id, position, system=None, cutoffs=None, extension=None, frame=None) -> None:
+        super().__init__(element, id, position, system, cutoffs, extension, frame)
 
     def calculate_angles_with_neighbours(self, box: Box) -> dict:
         r"""
@@ -302,6 +295,10 @@ class Sodium(Atom):
 
         return distances
 
+# Subclass of Atom of each supported element (see System.from_arrays)
+ATOM_SUBCLASSES = {"Si": Silicon, "O": Oxygen, "Na": Sodium}
+
+
 def transform_into_subclass(atom: Atom) -> object:
     """
     Return a Silicon object or Oxygen object from the subclass Silicon or Oxygen whether the atom.element is 'Si' or 'O'.
@@ -311,27 +308,21 @@ def transform_into_subclass(atom: Atom) -> object:
             atom.element,
             atom.id,
             atom.position,
-            atom.frame,
-            atom.cutoffs,
-            atom.extension,
+            atom.system,
         )
     elif atom.get_element() == "Si":
         return Silicon(
             atom.element,
             atom.id,
             atom.position,
-            atom.frame,
-            atom.cutoffs,
-            atom.extension,
+            atom.system,
         )
     elif atom.get_element() == "Na":
         return Sodium(
             atom.element,
             atom.id,
             atom.position,
-            atom.frame,
-            atom.cutoffs,
-            atom.extension,
+            atom.system,
         )
     else:
         raise ValueError(
@@ -419,6 +410,9 @@ def return_keys(property: str) -> list:
                     "hist_SiO6"
                 ]
             },
+            {"transition_matrix": FORM_LABELS},
+            {"rate_matrix": FORM_LABELS},
+            {"residence_time": [f"tau_{label}" for label in FORM_LABELS]},
             {
                 "lifetime": [
                     "time",
@@ -445,309 +439,105 @@ def return_keys(property: str) -> list:
         return []
 
 
-def calculate_structural_units(atoms, box) -> dict:
+def calculate_structural_units(atoms, box, neighbour_list) -> dict:
     """
     Calculate the number of SiO_z and OSi_k units for each atom in the system.
+    The coordination numbers are counted on the neighbour list (NeighbourList object) of the system.
     """
 
-    # Initialize the lists
-    SiO4 = []
-    SiO5 = []
-    SiO6 = []
-    SiO7 = []
-    OSi1 = []
-    OSi2 = []
-    OSi3 = []
-    OSi4 = []
-    NaO4 = []
-    NaO5 = []
-    NaO6 = []
-    NaO7 = []
-    CS_SiO4, ES_SiO4, FS_SiO4 = [], [], []
-    CS_SiO5, ES_SiO5, FS_SiO5 = [], [], []
-    CS_SiO6, ES_SiO6, FS_SiO6 = [], [], []
-    proportion_corners, proportion_edges, proportion_faces = [], [], []
-    q0, q1, q2, q3, q4 = [], [], [], [], []
-    tetrahedricity = []
-    pentahedricity = []
-    octahedricity = []
-
-    SQP_pentahedricity = []  # all SiO5 are considered as square base pyramid
-    TBP_pentahedricity = []  # all SiO5 are considered as triangular bipyramid
-    sqp_pentahedricity = []  # only SiO5 that are square base pyramid
-    tbp_pentahedricity = []  # only SiO5 that are triangular bipyramid
-
     silicons = [atom for atom in atoms if atom.get_element() == "Si"]
     oxygens = [atom for atom in atoms if atom.get_element() == "O"]
     sodiums = [atom for atom in atoms if atom.get_element() == "Na"]
 
+    # Coordination numbers of all the atoms
+    elements = neighbour_list.elements
+    number_of_oxygens = neighbour_list.count_neighbours("O")
+    number_of_silicons = neighbour_list.count_neighbours("Si")
+    is_silicon = elements == "Si"
+
     # Calculate the proportion of each SiOz units
-    coordination_SiOz = []
-    for atom in silicons:
-        counter = len(
-            [
-                neighbour
-                for neighbour in atom.get_neighbours()
-                if neighbour.get_element() == "O"
-            ]
-        )
-        coordination_SiOz.append(counter)
-        if counter == 4:
-            SiO4.append(atom)
-        if counter == 5:
-            SiO5.append(atom)
-        if counter == 6:
-            SiO6.append(atom)
-        if counter == 7:
-            SiO7.append(atom)
-
-    _debug_histogram_proportion_SiOz = np.histogram(
-        coordination_SiOz, bins=[4, 5, 6, 7, 8], density=True
-    )
+    coordination_SiOz = number_of_oxygens[is_silicon]
+    count_SiOz = np.bincount(coordination_SiOz, minlength=8)
 
     # Calculate the proportion of each OSiz units
-    coordination_OSiz = []
-    for atom in oxygens:
-        counter = len(
-            [
-                neighbour
-                for neighbour in atom.get_neighbours()
-                if neighbour.get_element() == "Si"
-            ]
-        )
-        coordination_OSiz.append(counter)
-        if counter == 1:
-            OSi1.append(atom)
-        if counter == 2:
-            OSi2.append(atom)
-        if counter == 3:
-            OSi3.append(atom)
-        if counter == 4:
-            OSi4.append(atom)
-
-    _debug_histogram_proportion_OSik = np.histogram(
-        coordination_OSiz, bins=[1, 2, 3, 4, 5], density=True
-    )
+    coordination_OSiz = number_of_silicons[elements == "O"]
+    count_OSiz = np.bincount(coordination_OSiz, minlength=5)
 
     # Calculate the proportion of each NaOz units
-    coordination_NaOz = []
-    for atom in sodiums:
-        counter = len(
-            [
-                neighbour
-                for neighbour in atom.get_neighbours()
-                if neighbour.get_element() == "O"
-            ]
-        )
-        coordination_NaOz.append(counter)
-        if counter == 4:
-            NaO4.append(atom)
-        if counter == 5:
-            NaO5.append(atom)
-        if counter == 6:
-            NaO6.append(atom)
-        if counter == 7:
-            NaO7.append(atom)
-
-    _debug_histogram_proportion_NaOk = np.histogram(
-        coordination_NaOz, bins=[4, 5, 6, 7, 8], density=True
-    )
+    coordination_NaOz = number_of_oxygens[elements == "Na"]
+    count_NaOz = np.bincount(coordination_NaOz, minlength=8)
+
     # Calculate the Qi species (ie number of bridging oxygens for SiO4 units)
-    # NOTE : verify this method
-    for silicon in SiO4:
-        bridging_oxygens = [
-            neighbour
-            for neighbour in silicon.get_neighbours()
-            if neighbour.get_element() == "O"
-        ]
-        counter = 0
-        for oxygen in bridging_oxygens:
-            if oxygen in OSi2 or oxygen in OSi3 or oxygen in OSi4:
-                counter += 1
-        silicon.qi_species = counter
-        if counter == 0:
-            q0.append(silicon)
-        elif counter == 1:
-            q1.append(silicon)
-        elif counter == 2:
-            q2.append(silicon)
-        elif counter == 3:
-            q3.append(silicon)
-        elif counter == 4:
-            q4.append(silicon)
-    q0 = np.array(q0)
-    q1 = np.array(q1)
-    q2 = np.array(q2)
-    q3 = np.array(q3)
-    q4 = np.array(q4)
-
-    # Calculate the number of edge-sharing (2 oxygens shared by 2 silicons)
-    for silicon in silicons:
-        unique_bond = []
-        for oxygen in [
-            atom for atom in silicon.get_neighbours() if atom.get_element() == "O"
-        ]:
-            for second_silicon in [
-                atom for atom in oxygen.get_neighbours() if atom.get_element() == "Si"
-            ]:
-                if second_silicon.id != silicon.id:
-                    unique_bond.append(second_silicon.id)
-        unique_bond = np.array(unique_bond)
-
-        uniques, counts = np.unique(unique_bond, return_counts=True)
-
-        for connectivity in counts:
-            if (
-                connectivity == 1
-            ):  # 1 oxygen is shared by 'silicon' and 'second_silicon'
-                silicon.number_of_corners += 1
-            if (
-                connectivity == 2
-            ):  # 2 oxygens are shared by 'silicon' and 'second_silicon'
-                silicon.number_of_edges += 1
-            if (
-                connectivity == 3
-            ):  # 3 oxygens are shared by 'silicon' and 'second_silicon'
-                silicon.number_of_faces += 1
-
-        distances = calculate_distances_between_vertices(silicon, box)
-
-        if silicon.coordination == 4:
-            CS_SiO4.append(silicon.number_of_corners)
-            ES_SiO4.append(silicon.number_of_edges)
-            FS_SiO4.append(silicon.number_of_faces)
-
-            tetrahedricity.append(calculate_tetrahedricity(distances))
-
-            silicon.form = "tetrahedron"
-
-        if silicon.coordination == 5:
-            CS_SiO5.append(silicon.number_of_corners)
-            ES_SiO5.append(silicon.number_of_edges)
-            FS_SiO5.append(silicon.number_of_faces)
-
-            this_sbp_pentahedricity, this_tbp_pentahedricity = calculate_pentahedricity(
-                distances
-            )
-            SQP_pentahedricity.append(this_sbp_pentahedricity)
-            TBP_pentahedricity.append(this_tbp_pentahedricity)
-            if this_sbp_pentahedricity < this_tbp_pentahedricity:
-                pentahedricity.append(this_sbp_pentahedricity)
-                sqp_pentahedricity.append(this_sbp_pentahedricity)
-                silicon.form = "square base pyramid"
-            else:
-                pentahedricity.append(this_tbp_pentahedricity)
-                tbp_pentahedricity.append(this_tbp_pentahedricity)
-                silicon.form = "triangular bipyramid"
-
-        if silicon.coordination == 6:
-            CS_SiO6.append(silicon.number_of_corners)
-            ES_SiO6.append(silicon.number_of_edges)
-            FS_SiO6.append(silicon.number_of_faces)
-
-            octahedricity.append(calculate_octahedricity(distances))
-            
-            silicon.form = "octahedron"
-
-        proportion_corners.append(silicon.number_of_corners)
-        proportion_edges.append(silicon.number_of_edges)
-        proportion_faces.append(silicon.number_of_faces)
+    qi_species = calculate_qi_species(neighbour_list, number_of_oxygens, number_of_silicons)
+    is_SiO4 = is_silicon & (number_of_oxygens == 4)
+    for i in np.flatnonzero(is_SiO4):
+        atoms[i].qi_species = qi_species[i]
+    count_qi_species = np.bincount(qi_species[is_SiO4], minlength=5)
+
+    # Calculate the number of corner, edge and face-sharing (1, 2 or 3 oxygens shared by 2 silicons)
+    corners, edges, faces = calculate_connectivity(neighbour_list)
+
+    # Calculate the polyhedricity of the SiO4, SiO5 and SiO6 units
+    positions = np.array([atom.position for atom in atoms])
+
+    index_SiO4, vertices = get_vertices(neighbour_list, positions, box, 4)
+    tetrahedricity = calculate_tetrahedricity(calculate_distances_between_vertices(vertices))
+
+    index_SiO5, vertices = get_vertices(neighbour_list, positions, box, 5)
+    SQP_pentahedricity, TBP_pentahedricity = calculate_pentahedricity(
+        calculate_distances_between_vertices(vertices)
+    )  # all SiO5 are considered as square base pyramid / triangular bipyramid
+    is_sqp = SQP_pentahedricity < TBP_pentahedricity
+    pentahedricity = np.where(is_sqp, SQP_pentahedricity, TBP_pentahedricity)
+    sqp_pentahedricity = SQP_pentahedricity[is_sqp]  # only SiO5 that are square base pyramid
+    tbp_pentahedricity = TBP_pentahedricity[~is_sqp]  # only SiO5 that are triangular bipyramid
+
+    index_SiO6, vertices = get_vertices(neighbour_list, positions, box, 6)
+    octahedricity = calculate_octahedricity(calculate_distances_between_vertices(vertices))
+
+    # Set the form of the polyhedra (see FORMS)
+    forms = np.zeros(len(atoms), dtype=np.uint8)
+    forms[index_SiO4] = 1
+    forms[index_SiO5] = np.where(is_sqp, 2, 3)
+    forms[index_SiO6] = 4
+
+    for index, silicon in zip(np.flatnonzero(is_silicon), silicons):
+        silicon.number_of_corners = corners[index]
+        silicon.number_of_edges = edges[index]
+        silicon.number_of_faces = faces[index]
+        silicon.form = FORMS[forms[index]]
 
     # Perform the average
-    proportion_corners = np.sum(proportion_corners) / len(silicons)
-    proportion_edges = np.sum(proportion_edges) / len(silicons)
-    proportion_faces = np.sum(proportion_faces) / len(silicons)
-    nSiO4 = len(SiO4)
-    nSiO5 = len(SiO5)
-    nSiO6 = len(SiO6)
-    nSiO7 = len(SiO7)
-    if nSiO4 == 0:
-        nSiO4 = 1
-    if nSiO5 == 0:
-        nSiO5 = 1
-    if nSiO6 == 0:
-        nSiO6 = 1
-    if nSiO7 == 0:
-        nSiO7 = 1
-    SiO4 = len(SiO4) / len(silicons)
-    SiO5 = len(SiO5) / len(silicons)
-    SiO6 = len(SiO6) / len(silicons)
-    SiO7 = len(SiO7) / len(silicons)
-    OSi1 = len(OSi1) / len(oxygens)
-    OSi2 = len(OSi2) / len(oxygens)
-    OSi3 = len(OSi3) / len(oxygens)
-    OSi4 = len(OSi4) / len(oxygens)
-    NaO4 = len(NaO4) / len(sodiums)
-    NaO5 = len(NaO5) / len(sodiums)
-    NaO6 = len(NaO6) / len(sodiums)
-    NaO7 = len(NaO7) / len(sodiums)
-    if len(q0) != 0:
-        q0 = len(q0) / nSiO4
-    else:
-        q0 = 0.0
-    if len(q1) != 0:
-        q1 = len(q1) / nSiO4
-    else:
-        q1 = 0.0
-    if len(q2) != 0:
-        q2 = len(q2) / nSiO4
-    else:
-        q2 = 0.0
-    if len(q3) != 0:
-        q3 = len(q3) / nSiO4
-    else:
-        q3 = 0.0
-    if len(q4) != 0:
-        q4 = len(q4) / nSiO4
-    else:
-        q4 = 0.0
-    CS_SiO4 = np.sum(CS_SiO4) / nSiO4
-    ES_SiO4 = np.sum(ES_SiO4) / nSiO4
-    FS_SiO4 = np.sum(FS_SiO4) / nSiO4
-    CS_SiO5 = np.sum(CS_SiO5) / nSiO5
-    ES_SiO5 = np.sum(ES_SiO5) / nSiO5
-    FS_SiO5 = np.sum(FS_SiO5) / nSiO5
-    CS_SiO6 = np.sum(CS_SiO6) / nSiO6
-    ES_SiO6 = np.sum(ES_SiO6) / nSiO6
-    FS_SiO6 = np.sum(FS_SiO6) / nSiO6
+    proportion_corners = np.sum(corners[is_silicon]) / len(silicons)
+    proportion_edges = np.sum(edges[is_silicon]) / len(silicons)
+    proportion_faces = np.sum(faces[is_silicon]) / len(silicons)
+    nSiO4, nSiO5, nSiO6, nSiO7 = np.maximum(count_SiOz[4:8], 1)
+    SiO4, SiO5, SiO6, SiO7 = count_SiOz[4:8] / len(silicons)
+    OSi1, OSi2, OSi3, OSi4 = count_OSiz[1:5] / len(oxygens)
+    NaO4, NaO5, NaO6, NaO7 = count_NaOz[4:8] / len(sodiums)
+    q0, q1, q2, q3, q4 = count_qi_species[0:5] / nSiO4
+    CS_SiO4 = np.sum(corners[is_SiO4]) / nSiO4
+    ES_SiO4 = np.sum(edges[is_SiO4]) / nSiO4
+    FS_SiO4 = np.sum(faces[is_SiO4]) / nSiO4
+    is_SiO5 = is_silicon & (number_of_oxygens == 5)
+    CS_SiO5 = np.sum(corners[is_SiO5]) / nSiO5
+    ES_SiO5 = np.sum(edges[is_SiO5]) / nSiO5
+    FS_SiO5 = np.sum(faces[is_SiO5]) / nSiO5
+    is_SiO6 = is_silicon & (number_of_oxygens == 6)
+    CS_SiO6 = np.sum(corners[is_SiO6]) / nSiO6
+    ES_SiO6 = np.sum(edges[is_SiO6]) / nSiO6
+    FS_SiO6 = np.sum(faces[is_SiO6]) / nSiO6
 
     # Build the histogram for the polyhedricity
     bins = np.linspace(0, 0.5, 1000)
     dbin = 0.0005
-    hist_tetrahedricity = np.zeros(len(bins))
-    hist_pentahedricity = np.zeros(len(bins))
-    hist_SBP_pentahedricity = np.zeros(len(bins))
-    hist_sbp_pentahedricity = np.zeros(len(bins))
-    hist_TBP_pentahedricity = np.zeros(len(bins))
-    hist_tbp_pentahedricity = np.zeros(len(bins))
-    hist_octahedricity = np.zeros(len(bins))
-
-    for i in range(len(tetrahedricity)):
-        hist_tetrahedricity[int(tetrahedricity[i] / dbin) + 1] += 1 / len(
-            tetrahedricity
-        )
-    for i in range(len(pentahedricity)):
-        hist_pentahedricity[int(pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(SQP_pentahedricity)):
-        hist_SBP_pentahedricity[int(SQP_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(sqp_pentahedricity)):
-        hist_sbp_pentahedricity[int(sqp_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(TBP_pentahedricity)):
-        hist_TBP_pentahedricity[int(TBP_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(tbp_pentahedricity)):
-        hist_tbp_pentahedricity[int(tbp_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(octahedricity)):
-        hist_octahedricity[int(octahedricity[i] / dbin) + 1] += 1 / len(octahedricity)
+    hist_tetrahedricity = calculate_histogram(tetrahedricity, bins, dbin, len(tetrahedricity))
+    hist_pentahedricity = calculate_histogram(pentahedricity, bins, dbin, len(pentahedricity))
+    hist_SBP_pentahedricity = calculate_histogram(SQP_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_sbp_pentahedricity = calculate_histogram(sqp_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_TBP_pentahedricity = calculate_histogram(TBP_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_tbp_pentahedricity = calculate_histogram(tbp_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_octahedricity = calculate_histogram(octahedricity, bins, dbin, len(octahedricity))
 
     tetrahedra = len(tetrahedricity) / len(silicons)
     pentahedra = len(pentahedricity) / len(silicons)
@@ -783,6 +573,7 @@ def calculate_structural_units(atoms, box) -> dict:
                 hist_octahedricity,
             ]
         ),
+        "forms": forms[is_silicon],
     }
 
     _debug_check_SiOz = np.sum(results["SiOz"])
@@ -790,213 +581,3 @@ def calculate_structural_units(atoms, box) -> dict:
     _debug_check_OSiz = np.sum(results["NaOz"])
 
     return results
-
-def calculate_distances_between_vertices(atom, box):  # -> np.array
-    """
-    Calculate the distances between the vertices of the polyhedron.
-    """
-    distances = []
-    neighbours = [
-        neighbour for neighbour in atom.neighbours if neighbour.get_element() == "O"
-    ]
-    for i in range(len(neighbours)):
-        neighbour_1 = neighbours[i]
-        for j in range(i + 1, len(neighbours)):
-            neighbour_2 = neighbours[j]
-            distance = neighbour_1.position - neighbour_2.position
-            distance = distance - np.round(distance / box) * box
-            distances.append(np.linalg.norm(distance))
-
-    distances.sort()
-
-    if atom.coordination == 4 and len(distances) != 6:
-        print("ERROR: SiO4 unit should have 6 distances")
-    if atom.coordination == 5 and len(distances) != 10:
-        print("ERROR: SiO5 unit should have 10 distances")
-    if atom.coordination == 6 and len(distances) != 15:
-        print("ERROR: SiO6 unit should have 15 distances")
-
-    return np.array(distances)
-
-
-def calculate_tetrahedricity(distances) -> float:
-    mean_distance = np.mean(distances**2)
-
-    tetrahedricity = 0
-
-    for i in range(len(distances)):
-        for j in range(i + 1, len(distances)):
-            tetrahedricity += (distances[i] - distances[j]) ** 2
-
-    tetrahedricity /= 15 * mean_distance
-
-    return tetrahedricity
-
-
-def calculate_pentahedricity(distances) -> tuple:
-    # case 1 : square base pyramid
-    # copy distances to avoid modifying the original array
-    sbp_distances = np.copy(distances)
-    sbp_distances[-2] /= np.sqrt(2)
-    sbp_distances[-1] /= np.sqrt(2)
-
-    sbp_pentahedricity = 0
-
-    sbp_mean_distances = np.mean(sbp_distances**2)
-
-    for i in range(len(sbp_distances)):
-        for j in range(i + 1, len(sbp_distances)):
-            sbp_pentahedricity += (sbp_distances[i] - sbp_distances[j]) ** 2
-    sbp_pentahedricity /= 45 * sbp_mean_distances
-
-    # case 2 : triangular bipyramid
-    tbp_distances = np.copy(distances)
-    tbp_distances[-1] /= np.sqrt(8 / 3)
-
-    tbp_pentahedricity = 0
-
-    tbp_mean_distances = np.mean(tbp_distances**2)
-
-    for i in range(len(tbp_distances)):
-        for j in range(i + 1, len(tbp_distances)):
-            tbp_pentahedricity += (tbp_distances[i] - tbp_distances[j]) ** 2
-    tbp_pentahedricity /= 45 * tbp_mean_distances
-
-    return sbp_pentahedricity, tbp_pentahedricity
-
-
-def calculate_octahedricity(distances) -> float:
-    distances[-3] /= np.sqrt(2)
-    distances[-2] /= np.sqrt(2)
-    distances[-1] /= np.sqrt(2)
-
-    octahedricity = 0
-
-    mean_distance = np.mean(distances**2)
-
-    for i in range(len(distances)):
-        for j in range(i + 1, len(distances)):
-            octahedricity += (distances[i] - distances[j]) ** 2
-    octahedricity /= 105 * mean_distance
-
-    return octahedricity
-
-
-def append_forms(number_of_frames, atoms, forms):  # -> np.array
-    """
-    Calculate the lifetime of each SiOz units inside the whole trajectory.
-    """
-
-    # Initialize the lists or read storage
-    silicons = [atom for atom in atoms if atom.get_element() == "Si"]
-
-    if forms is None:
-        # if frame 0 is being analyzed, create variable
-        forms = {}
-
-    # Calculate the lifetime of each SiOz units
-    for i, silicon in enumerate(silicons):
-        if silicon.frame not in forms:
-            forms[silicon.frame] = []
-        forms[silicon.frame].append(silicon.get_form())
-
-    return forms
-
-
-def calculate_lifetime(settings, forms):
-    """
-    Calculate the lifetime of each SiOz units inside the whole trajectory.
-    """
-
-    number_of_frames = len(forms)
-    number_of_atoms = len(forms[0])
-
-    types = ["tetrahedron", "square base pyramid", "triangular bipyramid", "octahedron"]
-
-    dt = settings.msd_settings.get_dt()
-    printlevel = settings.msd_settings.get_printlevel()
-
-    # create the histograms
-    bins = np.arange(1, number_of_frames + 1, 1) * dt * printlevel  # time in ps
-    hist_4_to_5p = np.zeros(number_of_frames)
-    hist_4_to_5bp = np.zeros(number_of_frames)
-    hist_4_to_6 = np.zeros(number_of_frames)
-    hist_5p_to_4 = np.zeros(number_of_frames)
-    hist_5p_to_6 = np.zeros(number_of_frames)
-    hist_5p_to_5bp = np.zeros(number_of_frames)
-    hist_5bp_to_5p = np.zeros(number_of_frames)
-    hist_5bp_to_4 = np.zeros(number_of_frames)
-    hist_5bp_to_6 = np.zeros(number_of_frames)
-    hist_6_to_4 = np.zeros(number_of_frames)
-    hist_6_to_5p = np.zeros(number_of_frames)
-    hist_6_to_5bp = np.zeros(number_of_frames)
-
-    counter = np.zeros(len(forms[0]), dtype=np.int32)  # counter for each atom
-
-    if not settings.quiet.get_value():
-        # create progress bar
-        pbar = tqdm(range(1, len(forms)), desc="Calculating SiOz lifetime")
-    else:
-        pbar = range(1, len(forms))
-
-    for f in pbar:
-        # loop over frames
-        previous_f = forms[f - 1]
-        this_f = forms[f]
-        for a in range(len(this_f)):
-            # loop over atoms
-            if previous_f[a] == this_f[a]:
-                # if the form is the same as the previous frame, increment the counter
-                counter[a] += 1
-            else:
-                # if the form is different, check the previous form
-                # atom a has changed form
-                # count the number of frames the atom has been in the previous form before changing
-                # then reset the counter
-                if previous_f[a] == "tetrahedron":
-                    if this_f[a] == "square base pyramid":
-                        hist_4_to_5p[counter[a]] += 1
-                    elif this_f[a] == "triangular bipyramid":
-                        hist_4_to_5bp[counter[a]] += 1
-                    elif this_f[a] == "octahedron":
-                        hist_4_to_6[counter[a]] += 1
-                elif previous_f[a] == "square base pyramid":
-                    if this_f[a] == "tetrahedron":
-                        hist_5p_to_4[counter[a]] += 1
-                    elif this_f[a] == "triangular bipyramid":
-                        hist_5p_to_5bp[counter[a]] += 1
-                    elif this_f[a] == "octahedron":
-                        hist_5p_to_6[counter[a]] += 1
-                elif previous_f[a] == "triangular bipyramid":
-                    if this_f[a] == "tetrahedron":
-                        hist_5bp_to_4[counter[a]] += 1
-                    elif this_f[a] == "square base pyramid":
-                        hist_5bp_to_5p[counter[a]] += 1
-                    elif this_f[a] == "octahedron":
-                        hist_5bp_to_6[counter[a]] += 1
-                elif previous_f[a] == "octahedron":
-                    if this_f[a] == "tetrahedron":
-                        hist_6_to_4[counter[a]] += 1
-                    elif this_f[a] == "square base pyramid":
-                        hist_6_to_5p[counter[a]] += 1
-                    elif this_f[a] == "triangular bipyramid":
-                        hist_6_to_5bp[counter[a]] += 1
-                counter[a] = 0
-
-    results = {
-        "time": bins,
-        "4_to_5p": hist_4_to_5p,
-        "4_to_5bp": hist_4_to_5bp,
-        "4_to_6": hist_4_to_6,
-        "5p_to_4": hist_5p_to_4,
-        "5p_to_6": hist_5p_to_6,
-        "5p_to_5bp": hist_5p_to_5bp,
-        "5bp_to_5p": hist_5bp_to_5p,
-        "5bp_to_4": hist_5bp_to_4,
-        "5bp_to_6": hist_5bp_to_6,
-        "6_to_4": hist_6_to_4,
-        "6_to_5p": hist_6_to_5p,
-        "6_to_5bp": hist_6_to_5bp,
-    }
-
-    return results
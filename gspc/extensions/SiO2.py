@@ -4,22 +4,31 @@ This file contains all the methods / functions that are specific to SiO2 oxide.
 
 # external imports
 import numpy as np
-from tqdm import tqdm
 from numba import njit
+from scipy import sparse
 
 # internal imports
 from ..core.atom import Atom
 from ..core.box import Box
+from ..io.result import LifetimeAccumulator
 from ..utils.generate_color_gradient import generate_color_gradient
 
 
 # List of supported elements for the extension SiO2
 LIST_OF_SUPPORTED_ELEMENTS = ["Si", "O"]
 
+# Forms of the SiOz polyhedra, the code of a form is its index in the list (0: no form)
+FORMS = ["", "tetrahedron", "square base pyramid", "triangular bipyramid", "octahedron"]
+# Short names of the forms used in the output files
+FORM_LABELS = ["other", "4", "5p", "5bp", "6"]
+
 
 class Silicon(Atom):
-    def __init__(self, element, id, position, frame, cutoffs, extension) -> None:
-        super().__init__(element, id, position, frame, cutoffs, extension)
+    __slots__ = ("number_of_corners", "number_of_edges", "number_of_faces", "qi_species", "form")
+    coordinating_element = "O"
+
+    def __init__(self, element, id, position, system=None, cutoffs=None, extension=None, frame=None) -> None:
+        super().__init__(element, id, position, system, cutoffs, extension, frame)
         self.number_of_corners: int = 0
         self.number_of_edges: int = 0
         self.number_of_faces: int = 0
@@ -56,18 +65,6 @@ class Silicon(Atom):
         """
         return self.form
 
-    def calculate_coordination(self) -> None:
-        """
-        Calculate the coordination number of the atom (ie the number of first neighbours) for the extension SiO2
-        """
-        self.coordination = len(
-            [
-                neighbour
-                for neighbour in self.neighbours
-                if neighbour.get_element() == "O"
-            ]
-        )
-
     def calculate_angles_with_neighbours(self, box: Box) -> dict:
         r"""
         Calculate and sort the angles between the atom and its neighbours.
@@ -132,20 +129,11 @@ class Silicon(Atom):
 
 
 class Oxygen(Atom):
-    def __init__(self, element, id, position, frame, cutoffs, extension) -> None:
-        super().__init__(element, id, position, frame, cutoffs, extension)
+    __slots__ = ()
+    coordinating_element = "Si"
 
-    def calculate_coordination(self) -> None:
-        """
-        Calculate the coordination number of the atom (ie the number of first neighbours) for the extension SiO2
-        """
-        self.coordination = len(
-            [
-                neighbour
-                for neighbour in self.neighbours
-                if neighbour.get_element() == "Si"
-            ]
-        )
+    def __init__(self, element, id, position, system=None, cutoffs=None, extension=None, frame=None) -> None:
+        super().__init__(element, id, position, system, cutoffs, extension, frame)
 
     def calculate_angles_with_neighbours(self, box: Box) -> dict:
         r"""
@@ -208,6 +196,10 @@ class Oxygen(Atom):
         return distances
 
 
+# Subclass of Atom of each supported element (see System.from_arrays)
+ATOM_SUBCLASSES = {"Si": Silicon, "O": Oxygen}
+
+
 def transform_into_subclass(atom: Atom) -> object:
     """
     Return a Silicon object or Oxygen object from the subclass Silicon or Oxygen whether the atom.element is 'Si' or 'O'.
@@ -217,18 +209,14 @@ def transform_into_subclass(atom: Atom) -> object:
             atom.element,
             atom.id,
             atom.position,
-            atom.frame,
-            atom.cutoffs,
-            atom.extension,
+            atom.system,
         )
     elif atom.get_element() == "Si":
         return Silicon(
             atom.element,
             atom.id,
             atom.position,
-            atom.frame,
-            atom.cutoffs,
-            atom.extension,
+            atom.system,
         )
     else:
         raise ValueError(
@@ -308,6 +296,9 @@ def return_keys(property: str) -> list:
                     "hist_SiO6"
                 ]
             },
+            {"transition_matrix": FORM_LABELS},
+            {"rate_matrix": FORM_LABELS},
+            {"residence_time": [f"tau_{label}" for label in FORM_LABELS]},
             # {
             #     "lifetime": [
             #         "time",
@@ -363,241 +354,97 @@ def return_keys(property: str) -> list:
         return []
 
 
-def calculate_structural_units(atoms, box) -> dict:
+def calculate_structural_units(atoms, box, neighbour_list) -> dict:
     """
     Calculate the number of SiO_z and OSi_k units for each atom in the system.
+    The coordination numbers are counted on the neighbour list (NeighbourList object) of the system.
     """
 
-    # Initialize the lists
-    SiO4 = []
-    SiO5 = []
-    SiO6 = []
-    SiO7 = []
-    OSi1 = []
-    OSi2 = []
-    OSi3 = []
-    OSi4 = []
-    CS_SiO4, ES_SiO4, FS_SiO4 = [], [], []
-    CS_SiO5, ES_SiO5, FS_SiO5 = [], [], []
-    CS_SiO6, ES_SiO6, FS_SiO6 = [], [], []
-    proportion_corners, proportion_edges, proportion_faces = [], [], []
-
-    tetrahedricity = []
-    pentahedricity = []
-    octahedricity = []
-
-    SQP_pentahedricity = []  # all SiO5 are considered as square base pyramid
-    TBP_pentahedricity = []  # all SiO5 are considered as triangular bipyramid
-    sqp_pentahedricity = []  # only SiO5 that are square base pyramid
-    tbp_pentahedricity = []  # only SiO5 that are triangular bipyramid
-
     silicons = [atom for atom in atoms if atom.get_element() == "Si"]
     oxygens = [atom for atom in atoms if atom.get_element() == "O"]
 
+    # Coordination numbers of all the atoms
+    elements = neighbour_list.elements
+    number_of_oxygens = neighbour_list.count_neighbours("O")
+    number_of_silicons = neighbour_list.count_neighbours("Si")
+    is_silicon = elements == "Si"
+
     # Calculate the proportion of each SiOz units
-    coordination_SiOz = []
-    for atom in silicons:
-        counter = len(
-            [
-                neighbour
-                for neighbour in atom.get_neighbours()
-                if neighbour.get_element() == "O"
-            ]
-        )
-        coordination_SiOz.append(counter)
-        if counter == 4:
-            SiO4.append(atom)
-        if counter == 5:
-            SiO5.append(atom)
-        if counter == 6:
-            SiO6.append(atom)
-        if counter == 7:
-            SiO7.append(atom)
-
-    _debug_histogram_proportion_SiOz = np.histogram(
-        coordination_SiOz, bins=[4, 5, 6, 7, 8], density=True
-    )
+    coordination_SiOz = number_of_oxygens[is_silicon]
+    count_SiOz = np.bincount(coordination_SiOz, minlength=8)
 
     # Calculate the proportion of each OSiz units
-    coordination_OSiz = []
-    for atom in oxygens:
-        counter = len(
-            [
-                neighbour
-                for neighbour in atom.get_neighbours()
-                if neighbour.get_element() == "Si"
-            ]
-        )
-        coordination_OSiz.append(counter)
-        if counter == 1:
-            OSi1.append(atom)
-        if counter == 2:
-            OSi2.append(atom)
-        if counter == 3:
-            OSi3.append(atom)
-        if counter == 4:
-            OSi4.append(atom)
-
-    _debug_histogram_proportion_OSik = np.histogram(
-        coordination_OSiz, bins=[1, 2, 3, 4, 5], density=True
-    )
+    coordination_OSiz = number_of_silicons[elements == "O"]
+    count_OSiz = np.bincount(coordination_OSiz, minlength=5)
 
     # Calculate the Qi species (ie number of bridging oxygens for SiO4 units)
-    for silicon in SiO4:
-        bridging_oxygens = [
-            neighbour
-            for neighbour in silicon.get_neighbours()
-            if neighbour.get_element() == "O"
-        ]
-        counter = 0
-        for oxygen in bridging_oxygens:
-            if oxygen in OSi2 or oxygen in OSi3 or oxygen in OSi4:
-                counter += 1
-        silicon.qi_species = counter
-
-    # Calculate the number of edge-sharing (2 oxygens shared by 2 silicons)
-    for silicon in silicons:
-        unique_bond = []
-        for oxygen in [
-            atom for atom in silicon.get_neighbours() if atom.get_element() == "O"
-        ]:
-            for second_silicon in [
-                atom for atom in oxygen.get_neighbours() if atom.get_element() == "Si"
-            ]:
-                if second_silicon.id != silicon.id:
-                    unique_bond.append(second_silicon.id)
-        unique_bond = np.array(unique_bond)
-
-        uniques, counts = np.unique(unique_bond, return_counts=True)
-
-        for connectivity in counts:
-            if (
-                connectivity == 1
-            ):  # 1 oxygen is shared by 'silicon' and 'second_silicon'
-                silicon.number_of_corners += 1
-            if (
-                connectivity == 2
-            ):  # 2 oxygens are shared by 'silicon' and 'second_silicon'
-                silicon.number_of_edges += 1
-            if (
-                connectivity == 3
-            ):  # 3 oxygens are shared by 'silicon' and 'second_silicon'
-                silicon.number_of_faces += 1
-
-        distances = calculate_distances_between_vertices(silicon, box)
-
-        if silicon.coordination == 4:
-            CS_SiO4.append(silicon.number_of_corners)
-            ES_SiO4.append(silicon.number_of_edges)
-            FS_SiO4.append(silicon.number_of_faces)
-
-            tetrahedricity.append(calculate_tetrahedricity(distances))
-
-            silicon.form = "tetrahedron"
-
-        if silicon.coordination == 5:
-            CS_SiO5.append(silicon.number_of_corners)
-            ES_SiO5.append(silicon.number_of_edges)
-            FS_SiO5.append(silicon.number_of_faces)
-
-            this_sbp_pentahedricity, this_tbp_pentahedricity = calculate_pentahedricity(
-                distances
-            )
-            SQP_pentahedricity.append(this_sbp_pentahedricity)
-            TBP_pentahedricity.append(this_tbp_pentahedricity)
-            if this_sbp_pentahedricity < this_tbp_pentahedricity:
-                pentahedricity.append(this_sbp_pentahedricity)
-                sqp_pentahedricity.append(this_sbp_pentahedricity)
-                silicon.form = "square base pyramid"
-            else:
-                pentahedricity.append(this_tbp_pentahedricity)
-                tbp_pentahedricity.append(this_tbp_pentahedricity)
-                silicon.form = "triangular bipyramid"
-
-        if silicon.coordination == 6:
-            CS_SiO6.append(silicon.number_of_corners)
-            ES_SiO6.append(silicon.number_of_edges)
-            FS_SiO6.append(silicon.number_of_faces)
-
-            octahedricity.append(calculate_octahedricity(distances))
-
-            silicon.form = "octahedron"
-
-        proportion_corners.append(silicon.number_of_corners)
-        proportion_edges.append(silicon.number_of_edges)
-        proportion_faces.append(silicon.number_of_faces)
+    qi_species = calculate_qi_species(neighbour_list, number_of_oxygens, number_of_silicons)
+    is_SiO4 = is_silicon & (number_of_oxygens == 4)
+    for i in np.flatnonzero(is_SiO4):
+        atoms[i].qi_species = qi_species[i]
+
+    # Calculate the number of corner, edge and face-sharing (1, 2 or 3 oxygens shared by 2 silicons)
+    corners, edges, faces = calculate_connectivity(neighbour_list)
+
+    # Calculate the polyhedricity of the SiO4, SiO5 and SiO6 units
+    positions = np.array([atom.position for atom in atoms])
+
+    index_SiO4, vertices = get_vertices(neighbour_list, positions, box, 4)
+    tetrahedricity = calculate_tetrahedricity(calculate_distances_between_vertices(vertices))
+
+    index_SiO5, vertices = get_vertices(neighbour_list, positions, box, 5)
+    SQP_pentahedricity, TBP_pentahedricity = calculate_pentahedricity(
+        calculate_distances_between_vertices(vertices)
+    )  # all SiO5 are considered as square base pyramid / triangular bipyramid
+    is_sqp = SQP_pentahedricity < TBP_pentahedricity
+    pentahedricity = np.where(is_sqp, SQP_pentahedricity, TBP_pentahedricity)
+    sqp_pentahedricity = SQP_pentahedricity[is_sqp]  # only SiO5 that are square base pyramid
+    tbp_pentahedricity = TBP_pentahedricity[~is_sqp]  # only SiO5 that are triangular bipyramid
+
+    index_SiO6, vertices = get_vertices(neighbour_list, positions, box, 6)
+    octahedricity = calculate_octahedricity(calculate_distances_between_vertices(vertices))
+
+    # Set the form of the polyhedra (see FORMS)
+    forms = np.zeros(len(atoms), dtype=np.uint8)
+    forms[index_SiO4] = 1
+    forms[index_SiO5] = np.where(is_sqp, 2, 3)
+    forms[index_SiO6] = 4
+
+    for index, silicon in zip(np.flatnonzero(is_silicon), silicons):
+        silicon.number_of_corners = corners[index]
+        silicon.number_of_edges = edges[index]
+        silicon.number_of_faces = faces[index]
+        silicon.form = FORMS[forms[index]]
 
     # Perform the average
-    proportion_corners = np.sum(proportion_corners) / len(silicons)
-    proportion_edges = np.sum(proportion_edges) / len(silicons)
-    proportion_faces = np.sum(proportion_faces) / len(silicons)
-    nSiO4 = len(SiO4)
-    nSiO5 = len(SiO5)
-    nSiO6 = len(SiO6)
-    nSiO7 = len(SiO7)
-    if nSiO4 == 0:
-        nSiO4 = 1
-    if nSiO5 == 0:
-        nSiO5 = 1
-    if nSiO6 == 0:
-        nSiO6 = 1
-    if nSiO7 == 0:
-        nSiO7 = 1
-    SiO4 = len(SiO4) / len(silicons)
-    SiO5 = len(SiO5) / len(silicons)
-    SiO6 = len(SiO6) / len(silicons)
-    SiO7 = len(SiO7) / len(silicons)
-    OSi1 = len(OSi1) / len(oxygens)
-    OSi2 = len(OSi2) / len(oxygens)
-    OSi3 = len(OSi3) / len(oxygens)
-    OSi4 = len(OSi4) / len(oxygens)
-    CS_SiO4 = np.sum(CS_SiO4) / nSiO4
-    ES_SiO4 = np.sum(ES_SiO4) / nSiO4
-    FS_SiO4 = np.sum(FS_SiO4) / nSiO4
-    CS_SiO5 = np.sum(CS_SiO5) / nSiO5
-    ES_SiO5 = np.sum(ES_SiO5) / nSiO5
-    FS_SiO5 = np.sum(FS_SiO5) / nSiO5
-    CS_SiO6 = np.sum(CS_SiO6) / nSiO6
-    ES_SiO6 = np.sum(ES_SiO6) / nSiO6
-    FS_SiO6 = np.sum(FS_SiO6) / nSiO6
+    proportion_corners = np.sum(corners[is_silicon]) / len(silicons)
+    proportion_edges = np.sum(edges[is_silicon]) / len(silicons)
+    proportion_faces = np.sum(faces[is_silicon]) / len(silicons)
+    nSiO4, nSiO5, nSiO6, nSiO7 = np.maximum(count_SiOz[4:8], 1)
+    SiO4, SiO5, SiO6, SiO7 = count_SiOz[4:8] / len(silicons)
+    OSi1, OSi2, OSi3, OSi4 = count_OSiz[1:5] / len(oxygens)
+    CS_SiO4 = np.sum(corners[is_SiO4]) / nSiO4
+    ES_SiO4 = np.sum(edges[is_SiO4]) / nSiO4
+    FS_SiO4 = np.sum(faces[is_SiO4]) / nSiO4
+    is_SiO5 = is_silicon & (number_of_oxygens == 5)
+    CS_SiO5 = np.sum(corners[is_SiO5]) / nSiO5
+    ES_SiO5 = np.sum(edges[is_SiO5]) / nSiO5
+    FS_SiO5 = np.sum(faces[is_SiO5]) / nSiO5
+    is_SiO6 = is_silicon & (number_of_oxygens == 6)
+    CS_SiO6 = np.sum(corners[is_SiO6]) / nSiO6
+    ES_SiO6 = np.sum(edges[is_SiO6]) / nSiO6
+    FS_SiO6 = np.sum(faces[is_SiO6]) / nSiO6
 
     # Build the histogram for the polyhedricity
     bins = np.linspace(0, 0.5, 1000)
     dbin = 0.0005
-    hist_tetrahedricity = np.zeros(len(bins))
-    hist_pentahedricity = np.zeros(len(bins))
-    hist_SBP_pentahedricity = np.zeros(len(bins))
-    hist_sbp_pentahedricity = np.zeros(len(bins))
-    hist_TBP_pentahedricity = np.zeros(len(bins))
-    hist_tbp_pentahedricity = np.zeros(len(bins))
-    hist_octahedricity = np.zeros(len(bins))
-
-    for i in range(len(tetrahedricity)):
-        hist_tetrahedricity[int(tetrahedricity[i] / dbin) + 1] += 1 / len(
-            tetrahedricity
-        )
-    for i in range(len(pentahedricity)):
-        hist_pentahedricity[int(pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(SQP_pentahedricity)):
-        hist_SBP_pentahedricity[int(SQP_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(sqp_pentahedricity)):
-        hist_sbp_pentahedricity[int(sqp_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(TBP_pentahedricity)):
-        hist_TBP_pentahedricity[int(TBP_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(tbp_pentahedricity)):
-        hist_tbp_pentahedricity[int(tbp_pentahedricity[i] / dbin) + 1] += 1 / len(
-            pentahedricity
-        )
-    for i in range(len(octahedricity)):
-        hist_octahedricity[int(octahedricity[i] / dbin) + 1] += 1 / len(octahedricity)
+    hist_tetrahedricity = calculate_histogram(tetrahedricity, bins, dbin, len(tetrahedricity))
+    hist_pentahedricity = calculate_histogram(pentahedricity, bins, dbin, len(pentahedricity))
+    hist_SBP_pentahedricity = calculate_histogram(SQP_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_sbp_pentahedricity = calculate_histogram(sqp_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_TBP_pentahedricity = calculate_histogram(TBP_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_tbp_pentahedricity = calculate_histogram(tbp_pentahedricity, bins, dbin, len(pentahedricity))
+    hist_octahedricity = calculate_histogram(octahedricity, bins, dbin, len(octahedricity))
 
     tetrahedra = len(tetrahedricity) / len(silicons)
     pentahedra = len(pentahedricity) / len(silicons)
@@ -631,6 +478,7 @@ def calculate_structural_units(atoms, box) -> dict:
                 hist_octahedricity,
             ]
         ),
+        "forms": forms[is_silicon],
     }
 
     _debug_check_SiOz = np.sum(results["SiOz"])
@@ -639,114 +487,154 @@ def calculate_structural_units(atoms, box) -> dict:
     return results
 
 
-def calculate_distances_between_vertices(atom, box):  # -> np.array
+def calculate_qi_species(neighbour_list, number_of_oxygens, number_of_silicons) -> np.ndarray:
     """
-    Calculate the distances between the vertices of the polyhedron.
+    Return the Qi species of each atom (ie number of bridging oxygens of the SiO4 units, 0 for the other atoms).
+    An oxygen is bridging if it is bonded to at least 2 silicons.
     """
-    distances = []
-    neighbours = [
-        neighbour for neighbour in atom.neighbours if neighbour.get_element() == "O"
-    ]
-    for i in range(len(neighbours)):
-        neighbour_1 = neighbours[i]
-        for j in range(i + 1, len(neighbours)):
-            neighbour_2 = neighbours[j]
-            distance = neighbour_1.position - neighbour_2.position
-            distance = distance - np.round(distance / box) * box
-            distances.append(np.linalg.norm(distance))
+    elements = neighbour_list.elements
 
-    distances.sort()
+    # Bridging oxygens of the system
+    bridging = (elements == "O") & (number_of_silicons >= 2)
 
-    if atom.coordination == 4 and len(distances) != 6:
-        print("ERROR: SiO4 unit should have 6 distances")
-    if atom.coordination == 5 and len(distances) != 10:
-        print("ERROR: SiO5 unit should have 10 distances")
-    if atom.coordination == 6 and len(distances) != 15:
-        print("ERROR: SiO6 unit should have 15 distances")
+    # Number of bridging oxygens around each atom (sum over the segment of each atom in the neighbour list)
+    qi_species = np.bincount(
+        neighbour_list.rows,
+        weights=bridging[neighbour_list.indices],
+        minlength=neighbour_list.get_number_of_atoms(),
+    ).astype(np.int64)
 
-    return np.array(distances)
+    # Only the SiO4 units have a Qi species
+    qi_species[(elements != "Si") | (number_of_oxygens != 4)] = 0
 
+    return qi_species
 
-def calculate_tetrahedricity(distances) -> float:
-    mean_distance = np.mean(distances**2)
 
-    tetrahedricity = 0
+def calculate_connectivity(neighbour_list) -> tuple:
+    """
+    Return the number of corner, edge and face-sharings of each silicon (0 for the other atoms).
+    The number of oxygens shared by each pair of silicons is given by A.A^T, where A is the Si-O incidence matrix.
+    """
+    elements = neighbour_list.elements
+    rows = neighbour_list.rows
+    indices = neighbour_list.indices
+    number_of_atoms = neighbour_list.get_number_of_atoms()
+
+    # Si-O incidence matrix
+    bonds = (elements[rows] == "Si") & (elements[indices] == "O")
+    incidence = sparse.csr_matrix(
+        (np.ones(np.count_nonzero(bonds)), (rows[bonds], indices[bonds])),
+        shape=(number_of_atoms, number_of_atoms),
+    )
 
-    for i in range(len(distances)):
-        for j in range(i + 1, len(distances)):
-            tetrahedricity += (distances[i] - distances[j]) ** 2
+    # Number of oxygens shared by each pair of silicons
+    shared = (incidence @ incidence.T).tocoo()
+    pairs = shared.row != shared.col
+    silicons, shared_oxygens = shared.row[pairs], shared.data[pairs]
 
-    tetrahedricity /= 15 * mean_distance
+    corners = np.bincount(silicons[shared_oxygens == 1], minlength=number_of_atoms)
+    edges = np.bincount(silicons[shared_oxygens == 2], minlength=number_of_atoms)
+    faces = np.bincount(silicons[shared_oxygens == 3], minlength=number_of_atoms)
 
-    return tetrahedricity
+    return corners, edges, faces
 
 
-def calculate_pentahedricity(distances) -> tuple:
-    # case 1 : square base pyramid
-    # copy distances to avoid modifying the original array
-    sbp_distances = np.copy(distances)
-    sbp_distances[-2] /= np.sqrt(2)
-    sbp_distances[-1] /= np.sqrt(2)
+def get_vertices(neighbour_list, positions, box, coordination) -> tuple:
+    """
+    Return the silicons with 'coordination' oxygens and the vectors from each of them to its oxygens.
 
-    sbp_pentahedricity = 0
+    Returns:
+    --------
+        - np.ndarray : Indices of the silicons, shape (n_poly,).
+        - np.ndarray : Vectors to the vertices of the polyhedra (PBC applied), shape (n_poly, coordination, 3).
+    """
+    elements = neighbour_list.elements
+    rows = neighbour_list.rows
+    indices = neighbour_list.indices
+
+    # Si-O bonds of the silicons with the right coordination (grouped by silicon in the neighbour list)
+    number_of_oxygens = neighbour_list.count_neighbours("O")
+    bonds = (
+        (elements[rows] == "Si")
+        & (elements[indices] == "O")
+        & (number_of_oxygens[rows] == coordination)
+    )
+    centers = rows[bonds].reshape(-1, coordination)[:, 0]
+    vertices = indices[bonds].reshape(-1, coordination)
 
-    sbp_mean_distances = np.mean(sbp_distances**2)
+    vectors = positions[vertices] - positions[centers][:, np.newaxis, :]
+    vectors -= np.round(vectors / box) * box
 
-    for i in range(len(sbp_distances)):
-        for j in range(i + 1, len(sbp_distances)):
-            sbp_pentahedricity += (sbp_distances[i] - sbp_distances[j]) ** 2
-    sbp_pentahedricity /= 45 * sbp_mean_distances
+    return centers, vectors
 
-    # case 2 : triangular bipyramid
-    tbp_distances = np.copy(distances)
-    tbp_distances[-1] /= np.sqrt(8 / 3)
 
-    tbp_pentahedricity = 0
+def calculate_distances_between_vertices(vertices) -> np.ndarray:
+    """
+    Calculate the sorted distances between the vertices of the polyhedra, shape (n_poly, z * (z - 1) / 2).
+    """
+    i, j = np.triu_indices(vertices.shape[1], k=1)
+    distances = np.linalg.norm(vertices[:, i] - vertices[:, j], axis=-1)
+    distances.sort(axis=-1)
 
-    tbp_mean_distances = np.mean(tbp_distances**2)
+    return distances
 
-    for i in range(len(tbp_distances)):
-        for j in range(i + 1, len(tbp_distances)):
-            tbp_pentahedricity += (tbp_distances[i] - tbp_distances[j]) ** 2
-    tbp_pentahedricity /= 45 * tbp_mean_distances
 
-    return sbp_pentahedricity, tbp_pentahedricity
+def calculate_polyhedricity(distances, normalization) -> np.ndarray:
+    """
+    Calculate sum_{i<j} (d_i - d_j)^2 / (normalization * <d^2>) for each row of sorted distances.
+    """
+    # sum_{i<j} (d_i - d_j)^2 = m * sum_i (d_i - <d>)^2
+    m = distances.shape[-1]
+    deviations = distances - np.mean(distances, axis=-1, keepdims=True)
+
+    return m * np.sum(deviations**2, axis=-1) / (normalization * np.mean(distances**2, axis=-1))
+
+
+def calculate_tetrahedricity(distances) -> np.ndarray:
+    return calculate_polyhedricity(distances, 15)
+
 
+def calculate_pentahedricity(distances) -> tuple:
+    # case 1 : square base pyramid
+    # copy distances to avoid modifying the original array
+    sbp_distances = np.copy(distances)
+    sbp_distances[..., -2:] /= np.sqrt(2)
+    sbp_pentahedricity = calculate_polyhedricity(sbp_distances, 45)
 
-def calculate_octahedricity(distances) -> float:
-    distances[-3] /= np.sqrt(2)
-    distances[-2] /= np.sqrt(2)
-    distances[-1] /= np.sqrt(2)
+    # case 2 : triangular bipyramid
+    tbp_distances = np.copy(distances)
+    tbp_distances[..., -1] /= np.sqrt(8 / 3)
+    tbp_pentahedricity = calculate_polyhedricity(tbp_distances, 45)
 
-    octahedricity = 0
+    return sbp_pentahedricity, tbp_pentahedricity
 
-    mean_distance = np.mean(distances**2)
 
-    for i in range(len(distances)):
-        for j in range(i + 1, len(distances)):
-            octahedricity += (distances[i] - distances[j]) ** 2
-    octahedricity /= 105 * mean_distance
+def calculate_octahedricity(distances) -> np.ndarray:
+    octahedral_distances = np.copy(distances)
+    octahedral_distances[..., -3:] /= np.sqrt(2)
 
-    return octahedricity
+    return calculate_polyhedricity(octahedral_distances, 105)
 
 
-def append_forms(number_of_frames, atoms, forms):  # -> np.array
+def calculate_histogram(values, bins, dbin, normalization) -> np.ndarray:
     """
-    Calculate the lifetime of each SiOz units inside the whole trajectory.
+    Histogram of the values on 'bins' (value v is counted in the bin int(v / dbin) + 1) divided by 'normalization'.
     """
+    index = (np.asarray(values) / dbin).astype(np.int64) + 1
+    index = index[index < len(bins)]
 
-    # Initialize the lists or read storage
-    silicons = [atom for atom in atoms if atom.get_element() == "Si"]
+    return np.bincount(index, minlength=len(bins)) / max(normalization, 1)
 
+
+def append_forms(number_of_frames, structural_units, forms) -> LifetimeAccumulator:
+    """
+    Add the form codes of the silicons (see FORMS) at the next frame to the lifetime accumulator 'forms'.
+    """
     if forms is None:
-        # if frame 0 is being analyzed, create variable
-        forms = {}
+        # if the first frame is being analyzed, create the accumulator
+        forms = LifetimeAccumulator(len(FORMS), number_of_frames)
 
-    # Calculate the lifetime of each SiOz units
-    for i, silicon in enumerate(silicons):
-        if silicon.frame not in forms:
-            forms[silicon.frame] = []
-        forms[silicon.frame].append(silicon.get_form())
+    forms.update(structural_units["forms"])
 
     return forms
 
@@ -754,151 +642,55 @@ def append_forms(number_of_frames, atoms, forms):  # -> np.array
 def calculate_lifetime(settings, forms):
     """
     Calculate the lifetime of each SiOz units inside the whole trajectory.
+    'forms' is the LifetimeAccumulator of the form codes of the silicons (see append_forms).
     """
 
-    number_of_frames = len(forms)
-    # first key of forms
-    first_key = list(forms.keys())[0]
-    number_of_atoms = len(forms[first_key])
-
-    types = ["tetrahedron", "square base pyramid", "triangular bipyramid", "octahedron"]
+    number_of_frames = forms.count
+    number_of_atoms = len(forms.current_form)
 
     dt = settings.msd_settings.get_dt()
     printlevel = settings.msd_settings.get_printlevel()
 
     # create the histograms
     bins = np.arange(1, number_of_frames + 1, 1) * dt * printlevel  # time in ps
-    hist_4_to_5p = np.zeros(number_of_frames)
-    hist_4_to_5bp = np.zeros(number_of_frames)
-    hist_4_to_6 = np.zeros(number_of_frames)
-    hist_5p_to_4 = np.zeros(number_of_frames)
-    hist_5p_to_6 = np.zeros(number_of_frames)
-    hist_5p_to_5bp = np.zeros(number_of_frames)
-    hist_5bp_to_5p = np.zeros(number_of_frames)
-    hist_5bp_to_4 = np.zeros(number_of_frames)
-    hist_5bp_to_6 = np.zeros(number_of_frames)
-    hist_6_to_4 = np.zeros(number_of_frames)
-    hist_6_to_5p = np.zeros(number_of_frames)
-    hist_6_to_5bp = np.zeros(number_of_frames)
-    hist_4_to_4 = 0
-    hist_5bp_to_5bp = 0
-    hist_5p_to_5p = 0
-    hist_6_to_6 = 0
-
-    counter = np.zeros(len(forms[first_key]), dtype=np.int32)  # counter for each atom
-
-    if not settings.quiet.get_value():
-        # create progress bar
-        # pbar = tqdm(range(1, len(forms)), desc="Calculating SiOz lifetime")
-        # loop over forms between starting from the second element of the list
-        pbar = tqdm(list(forms.keys())[1:])
-    else:
-        # pbar = range(1, len(forms))
-        pbar = list(forms.keys())[1:]
-
-    for f in pbar:
-        # loop over frames
-        previous_f = forms[f - 1]
-        this_f = forms[f]
-        for a in range(len(this_f)):
-            # loop over atoms
-            if previous_f[a] == this_f[a]:
-                # if the form is the same as the previous frame, increment the counter
-                counter[a] += 1
-            else:
-                # if the form is different, check the previous form
-                # atom a has changed form
-                # count the number of frames the atom has been in the previous form before changing
-                # then reset the counter
-                if previous_f[a] == "tetrahedron":
-                    if this_f[a] == "square base pyramid":
-                        hist_4_to_5p[counter[a]] += 1
-                    elif this_f[a] == "triangular bipyramid":
-                        hist_4_to_5bp[counter[a]] += 1
-                    elif this_f[a] == "octahedron":
-                        hist_4_to_6[counter[a]] += 1
-                elif previous_f[a] == "square base pyramid":
-                    if this_f[a] == "tetrahedron":
-                        hist_5p_to_4[counter[a]] += 1
-                    elif this_f[a] == "triangular bipyramid":
-                        hist_5p_to_5bp[counter[a]] += 1
-                    elif this_f[a] == "octahedron":
-                        hist_5p_to_6[counter[a]] += 1
-                elif previous_f[a] == "triangular bipyramid":
-                    if this_f[a] == "tetrahedron":
-                        hist_5bp_to_4[counter[a]] += 1
-                    elif this_f[a] == "square base pyramid":
-                        hist_5bp_to_5p[counter[a]] += 1
-                    elif this_f[a] == "octahedron":
-                        hist_5bp_to_6[counter[a]] += 1
-                elif previous_f[a] == "octahedron":
-                    if this_f[a] == "tetrahedron":
-                        hist_6_to_4[counter[a]] += 1
-                    elif this_f[a] == "square base pyramid":
-                        hist_6_to_5p[counter[a]] += 1
-                    elif this_f[a] == "triangular bipyramid":
-                        hist_6_to_5bp[counter[a]] += 1
-                counter[a] = 0
-
-    no_changes = np.where(counter==len(forms)-1)[0]
-    forms = np.array(forms[first_key])
-    unchanged_forms = forms[no_changes]
-
-    unchanged_forms = np.unique(unchanged_forms, return_counts=True)
-    # print(unchanged_forms)
-    for i in range(len(unchanged_forms[0])):
-        if unchanged_forms[0][i] == 'tetrahedron':
-            hist_4_to_4 = unchanged_forms[1][i]
-        if unchanged_forms[0][i] == 'square base pyramid':
-            hist_5p_to_5p = unchanged_forms[1][i]
-        if unchanged_forms[0][i] == 'triangular bipyramid':
-            hist_5bp_to_5bp = unchanged_forms[1][i]
-        if unchanged_forms[0][i] == 'octahedron':
-            hist_6_to_6 = unchanged_forms[1][i]
+    transitions = forms.get_transitions()[:, :, :number_of_frames].astype(np.float64)
+
+    # forms that did not change along the trajectory
+    unchanged_forms = forms.get_unchanged_forms()
+
+    names = {i: FORM_LABELS[i] for i in range(1, len(FORMS))}
+    results = {"time": bins}
+    counts = {}
+    for i, name_i in names.items():
+        counts[f"{name_i}_to_{name_i}"] = unchanged_forms[i] / number_of_atoms
+        for j, name_j in names.items():
+            if i != j:
+                results[f"{name_i}_to_{name_j}"] = transitions[i, j]
+                counts[f"{name_i}_to_{name_j}"] = np.sum(transitions[i, j], dtype=np.int32) / number_of_atoms
+
+    # SiO5 units without distinction between square base pyramid and triangular bipyramid
+    results["4_to_5"] = transitions[1, 2] + transitions[1, 3]
+    results["5_to_4"] = transitions[2, 1] + transitions[3, 1]
+    results["5_to_6"] = transitions[2, 4] + transitions[3, 4]
+    results["6_to_5"] = transitions[4, 2] + transitions[4, 3]
+    counts["4_to_5"] = np.sum(results["4_to_5"], dtype=np.int32) / number_of_atoms
+    counts["5_to_5"] = (unchanged_forms[2] + unchanged_forms[3]) / number_of_atoms
+    counts["5_to_4"] = np.sum(results["5_to_4"], dtype=np.int32) / number_of_atoms
+    counts["5_to_6"] = np.sum(results["5_to_6"], dtype=np.int32) / number_of_atoms
+    counts["6_to_5"] = np.sum(results["6_to_5"], dtype=np.int32) / number_of_atoms
 
-    results = {
-        "time": bins,
-        "4_to_5p": hist_4_to_5p,
-        "4_to_5bp": hist_4_to_5bp,
-        "4_to_6": hist_4_to_6,
-        "5p_to_4": hist_5p_to_4,
-        "5p_to_6": hist_5p_to_6,
-        "5p_to_5bp": hist_5p_to_5bp,
-        "5bp_to_5p": hist_5bp_to_5p,
-        "5bp_to_4": hist_5bp_to_4,
-        "5bp_to_6": hist_5bp_to_6,
-        "6_to_4": hist_6_to_4,
-        "6_to_5p": hist_6_to_5p,
-        "6_to_5bp": hist_6_to_5bp,
-        "4_to_5" : hist_4_to_5p + hist_4_to_5bp,
-        "5_to_4" : hist_5p_to_4 + hist_5bp_to_4,
-        "5_to_6" : hist_5p_to_6 + hist_5bp_to_6,
-        "6_to_5" : hist_6_to_5p + hist_6_to_5bp,
-    }
+    return results, counts
 
-    counts = {
-        # TODO : find a normalization factor and apply it to the following results
-        "4_to_4": hist_4_to_4/number_of_atoms,
-        "4_to_5p": np.sum(hist_4_to_5p, dtype=np.int32)/number_of_atoms,
-        "4_to_5bp": np.sum(hist_4_to_5bp, dtype=np.int32)/number_of_atoms,
-        "4_to_6": np.sum(hist_4_to_6, dtype=np.int32)/number_of_atoms,
-        "4_to_5" : np.sum(hist_4_to_5p + hist_4_to_5bp, dtype=np.int32)/number_of_atoms,
-        "5p_to_4": np.sum(hist_5p_to_4, dtype=np.int32)/number_of_atoms,
-        "5p_to_6": np.sum(hist_5p_to_6, dtype=np.int32)/number_of_atoms,
-        "5p_to_5bp": np.sum(hist_5p_to_5bp, dtype=np.int32)/number_of_atoms,
-        "5bp_to_5p": np.sum(hist_5bp_to_5p, dtype=np.int32)/number_of_atoms,
-        "5bp_to_4": np.sum(hist_5bp_to_4, dtype=np.int32)/number_of_atoms,
-        "5bp_to_6": np.sum(hist_5bp_to_6, dtype=np.int32)/number_of_atoms,
-        "5bp_to_5bp": hist_5bp_to_5bp/number_of_atoms,
-        "5p_to_5p": hist_5p_to_5p/number_of_atoms,
-        "5_to_5": (hist_5p_to_5p + hist_5bp_to_5bp)/number_of_atoms,
-        "5_to_4" : np.sum(hist_5p_to_4 + hist_5bp_to_4, dtype=np.int32)/number_of_atoms,
-        "5_to_6" : np.sum(hist_5p_to_6 + hist_5bp_to_6, dtype=np.int32)/number_of_atoms,
-        "6_to_5" : np.sum(hist_6_to_5p + hist_6_to_5bp, dtype=np.int32)/number_of_atoms,
-        "6_to_4": np.sum(hist_6_to_4, dtype=np.int32)/number_of_atoms,
-        "6_to_5p": np.sum(hist_6_to_5p, dtype=np.int32)/number_of_atoms,
-        "6_to_5bp": np.sum(hist_6_to_5bp, dtype=np.int32)/number_of_atoms,
-        "6_to_6": hist_6_to_6/number_of_atoms,
-    }
 
-    return results, counts
+def calculate_transition_matrix(settings, forms) -> dict:
+    """
+    Calculate the transition count and rate matrices between the forms (see FORM_LABELS) and the mean residence
+    time in each form, from the LifetimeAccumulator of the form codes of the silicons (see append_forms).
+    """
+    time_step = settings.msd_settings.get_dt() * settings.msd_settings.get_printlevel()  # time in ps
+
+    return {
+        "transition_matrix": forms.get_transition_counts(),
+        "rate_matrix": forms.get_rate_matrix(time_step),
+        "residence_time": forms.get_residence_times(time_step),
+    }
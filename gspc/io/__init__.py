@@ -1,8 +1,16 @@
 from .read_lattice_properties      import read_lattice_properties
 from .read_number_of_configurations import count_configurations
 from .read_and_create_system        import read_and_create_system
+from .read_and_create_system        import create_system
+from .index_frames                  import index_frames
+from .read_frame                    import read_frame
+from .frame_prefetcher              import FramePrefetcher
 from .write_list_of_files           import write_list_of_files
 from .result import Result
 from .result import DistResult
 from .result import PropResult
 from .result import MSDResult
+from .result import MatrixResult
+from .result import WelfordAccumulator
+from .result import BlockingAccumulator
+from .result import LifetimeAccumulator
@@ -0,0 +1,133 @@
+# external imports
+import numpy as np
+import queue
+import threading
+
+# internal imports
+from .read_frame import read_frame
+
+
+class FramePrefetcher:
+    r"""
+    Reads and parses the next frames of the trajectory in a background thread while the current frame is analysed.
+
+    The frames are parsed into a ring of preallocated buffers. At most 'depth' frames are read ahead, the buffer
+    of a frame is recycled when the next frame is requested.
+
+    Attributes:
+    -----------
+        - file_path (str) : Path to the xyz file.
+        - offsets (np.ndarray) : Byte offset of each frame in the file (see io.index_frames).
+        - number_of_atoms (int) : Number of atoms in a frame.
+        - frames (range) : Frames to read.
+        - depth (int) : Maximum number of frames read ahead.
+
+    Methods:
+    --------
+        - __iter__ : Yields (frame, elements, positions) for each frame, in order.
+        - close : Stops the reading thread.
+    """
+
+    def __init__(self, file_path, offsets, number_of_atoms, frames, depth=2) -> None:
+        r"""
+        Initializes a FramePrefetcher object.
+
+        Parameters:
+        -----------
+            - file_path (str) : Path to the xyz file.
+            - offsets (np.ndarray) : Byte offset of each frame in the file (see io.index_frames).
+            - number_of_atoms (int) : Number of atoms in a frame.
+            - frames (range) : Frames to read.
+            - depth (int) : Maximum number of frames read ahead.
+        """
+        if depth < 1:
+            raise ValueError(f"Invalid value for 'depth': {depth}")
+        self.file_path: str = file_path
+        self.offsets: np.ndarray = offsets
+        self.number_of_atoms: int = number_of_atoms
+        self.frames: range = frames
+        self.depth: int = depth
+
+        # One more buffer than the depth: the frame being analysed holds one.
+        self._free = queue.Queue()
+        for _ in range(depth + 1):
+            self._free.put(
+                (
+                    np.empty(number_of_atoms, dtype="U3"),
+                    np.empty((number_of_atoms, 3), dtype=np.float64),
+                )
+            )
+        self._ready = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read, daemon=True)
+
+    def _read(self) -> None:
+        r"""
+        Fill the free buffers with the next frames (runs in the background thread).
+        """
+        try:
+            for frame in self.frames:
+                buffers = self._free.get()
+                if self._stop.is_set():
+                    return
+                elements, positions = read_frame(
+                    self.file_path, self.offsets[frame], self.number_of_atoms, *buffers
+                )
+                if not self._put((frame, elements, positions, None)):
+                    return
+        except Exception as error:
+            self._put((None, None, None, error))
+
+    def _put(self, item, timeout=0.1) -> bool:
+        r"""
+        Put a frame in the ready queue, waiting for a free slot until the prefetcher is closed.
+
+        Returns:
+        --------
+            - bool : False if the prefetcher was closed before the frame could be put.
+        """
+        while not self._stop.is_set():
+            try:
+                self._ready.put(item, timeout=timeout)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        r"""
+        Yield the frames in order.
+
+        Yields:
+        -------
+            - int : Frame number.
+            - np.ndarray : Elements of the atoms (valid until the next frame is requested).
+            - np.ndarray : Positions of the atoms (valid until the next frame is requested).
+        """
+        self._thread.start()
+        try:
+            for _ in self.frames:
+                frame, elements, positions, error = self._ready.get()
+                if error is not None:
+                    raise error
+                yield frame, elements, positions
+                # The frame has been analysed, the buffers can be reused.
+                self._free.put((elements, positions))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        r"""
+        Stop the reading thread and wait for it to finish.
+        """
+        self._stop.set()
+        # Unblock the thread if it waits for a free buffer
+        self._free.put((None, None))
+        # Drop the frames read ahead, the thread may be waiting for a slot in the ready queue
+        while True:
+            try:
+                self._ready.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread.ident is not None and self._thread is not threading.current_thread():
+            self._thread.join()
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def index_frames(file_path, frame_size, chunk_size=2**26) -> np.ndarray:
+    r"""
+    Build the index of the byte offsets of the frames in the trajectory file.
+
+    Parameters
+    ----------
+        - file_path (str) : Path to the trajectory file.
+        - frame_size (int) : Number of lines of a frame (ie number of atoms + number of header lines).
+        - chunk_size (int) : Number of bytes read at once. Default is 64 Mb.
+
+    Returns:
+    --------
+        - np.ndarray : Byte offset of the first line of each frame.
+    """
+    offsets = [0]
+    number_of_lines = 0  # number of lines read so far
+    position = 0  # number of bytes read so far
+
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+
+            # Position of the line breaks in the chunk
+            newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+
+            # Index of the lines starting right after these line breaks
+            next_lines = number_of_lines + 1 + np.arange(len(newlines))
+            starts = newlines[next_lines % frame_size == 0] + position + 1
+            offsets.extend(starts.tolist())
+
+            number_of_lines += len(newlines)
+            position += len(chunk)
+
+    offsets = np.array(offsets, dtype=np.int64)
+
+    # Remove the offset pointing at the end of the file, if any
+    return offsets[offsets < position]
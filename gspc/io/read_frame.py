@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def read_frame(file_path, offset, number_of_atoms, elements=None, positions=None) -> tuple:
+    r"""
+    Read the raw content of a frame of the xyz file, without creating any Atom object.
+
+    The elements and the positions are written in place in the buffers if given (eg the buffers reused by
+    io.FramePrefetcher), no other array of the size of the frame is created.
+
+    Parameters
+    ----------
+        - file_path (str) : Path to the xyz file.
+        - offset (int) : Byte offset of the frame in the file (see io.index_frames).
+        - number_of_atoms (int) : Number of atoms in the frame.
+        - elements (np.ndarray) : Preallocated buffer for the elements (optional).
+        - positions (np.ndarray) : Preallocated buffer for the positions, shape (number_of_atoms, 3) (optional).
+
+    Returns:
+    --------
+        - np.ndarray : Elements of the atoms.
+        - np.ndarray : Positions of the atoms, shape (number_of_atoms, 3).
+    """
+    if elements is None:
+        elements = np.empty(number_of_atoms, dtype="U3")
+    if positions is None:
+        positions = np.empty((number_of_atoms, 3), dtype=np.float64)
+
+    with open(file_path, "r") as f:
+        f.seek(offset)
+        f.readline()  # Skip the first line
+        f.readline()  # Skip the comment line
+        lines = [f.readline() for _ in range(number_of_atoms)]
+
+    # Fill the columns of the buffers in place, numpy converts the strings to floats
+    words = "".join(lines).split()
+    number_of_columns = len(lines[0].split()) if number_of_atoms > 0 else 4
+    if len(words) == number_of_atoms * number_of_columns:
+        elements[:] = words[0::number_of_columns]
+        for k in range(3):
+            positions[:, k] = words[k + 1 :: number_of_columns]
+    else:
+        # lines with different numbers of columns
+        rows = [line.split() for line in lines]
+        elements[:] = [row[0] for row in rows]
+        for k in range(3):
+            positions[:, k] = [row[k + 1] for row in rows]
+
+    return elements, positions
@@ -1,6 +1,7 @@
 # external imports
 import numpy as np
 import os
+from numba import njit
 
 # internal imports
 from .make_lines_unique import make_lines_unique
@@ -20,7 +21,7 @@ class Result:
         - error (float) : The error of the final result.
     """
 
-    def __init__(self, property: str, info: str, init_frame: int) -> None:
+    def __init__(self, property: str, info: str, init_frame: int, error_estimation: str = "standard") -> None:
         """
         Initialize the Result object.
 
@@ -29,14 +30,531 @@ class Result:
             - property (str) : The structural property name.
             - info (str) : Additional informations about the property.
             - init_frame (int) : The initial frame number.
+            - error_estimation (str) : Method used to estimate the errors ('standard' or 'blocking').
         """
+        if error_estimation not in ERROR_ESTIMATIONS:
+            raise ValueError(
+                f"\tERROR: Unsupported error estimation '{error_estimation}'. Please choose one of the following: {list(ERROR_ESTIMATIONS.keys())}."
+            )
         self.property: str = property
         self.info: str = info
         self.init_frame: int = init_frame
+        self.error_estimation: str = error_estimation
         self.timeline: dict = {}  # keys are the frame number and values are the property value
         self.result: float = 0.0
         self.error: float = 0.0
 
+    def new_accumulator(self):
+        """
+        Return an empty accumulator matching the error estimation method.
+        """
+        return ERROR_ESTIMATIONS[self.error_estimation]()
+
+
+class WelfordAccumulator:
+    r"""
+    Streaming mean and variance accumulator (Welford's online algorithm).
+
+    Only the running mean and the sum of squared deviations are stored, so the memory
+    footprint does not depend on the number of frames. Two accumulators can be merged
+    (Chan et al. pairwise formula), which allows partial results computed on separate
+    chunks of the trajectory to be combined.
+
+    Attributes
+    ----------
+        - count (int) : Number of values accumulated.
+        - mean (np.ndarray) : Running mean of the values.
+        - m2 (np.ndarray) : Running sum of the squared deviations from the mean.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty WelfordAccumulator object.
+        """
+        self.count: int = 0
+        self.mean: np.ndarray = None
+        self.m2: np.ndarray = None
+
+    def update(self, value) -> None:
+        """
+        Add a value (scalar or array) to the accumulator.
+
+        Parameters
+        ----------
+            - value (float or np.ndarray) : The value to accumulate.
+        """
+        value = np.array(value, dtype=np.float64)
+        self.count += 1
+        if self.mean is None:
+            self.mean = value
+            self.m2 = np.zeros_like(value)
+        else:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+
+    def merge(self, other) -> None:
+        """
+        Merge another WelfordAccumulator into this one.
+
+        Parameters
+        ----------
+            - other (WelfordAccumulator) : The accumulator to merge.
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = np.copy(other.mean)
+            self.m2 = np.copy(other.m2)
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+
+    def get_mean(self) -> np.ndarray:
+        """
+        Return the mean of the accumulated values.
+        """
+        return self.mean
+
+    def get_std(self) -> np.ndarray:
+        """
+        Return the (population) standard deviation of the accumulated values.
+        """
+        return np.sqrt(self.m2 / self.count)
+
+    def get_error(self) -> np.ndarray:
+        """
+        Return the standard error of the mean, ie std / sqrt(count).
+        """
+        if self.count > 1:
+            return self.get_std() / np.sqrt(self.count)
+        return np.zeros_like(self.mean)
+
+
+class BlockingAccumulator(WelfordAccumulator):
+    r"""
+    Streaming block averaging accumulator (Flyvbjerg & Petersen, J. Chem. Phys. 91, 461 (1989)).
+
+    Consecutive frames of a MD trajectory are correlated, so std / sqrt(count) underestimates
+    the error of the mean. The values are averaged pairwise into blocks of 2, 4, 8, ... frames
+    on the fly, and the variance of the block means is accumulated at each blocking level.
+    Only one pending value and one WelfordAccumulator are kept per level, ie O(log(count)) memory.
+
+    Attributes
+    ----------
+        - count (int) : Number of values accumulated.
+        - mean (np.ndarray) : Running mean of the values.
+        - m2 (np.ndarray) : Running sum of the squared deviations from the mean.
+        - levels (list) : WelfordAccumulator of the block means at each blocking level.
+        - pending (list) : Value waiting for its partner at each blocking level (None if empty).
+        - min_blocks (int) : Minimum number of blocks for a blocking level to be considered.
+    """
+
+    def __init__(self, min_blocks: int = 4) -> None:
+        """
+        Initialize an empty BlockingAccumulator object.
+
+        Parameters
+        ----------
+            - min_blocks (int) : Minimum number of blocks for a blocking level to be considered.
+        """
+        super().__init__()
+        self.levels: list = []
+        self.pending: list = []
+        self.min_blocks: int = min_blocks
+
+    def update(self, value) -> None:
+        """
+        Add a value (scalar or array) to the accumulator and propagate the completed blocks.
+
+        Parameters
+        ----------
+            - value (float or np.ndarray) : The value to accumulate.
+        """
+        value = np.array(value, dtype=np.float64)
+        super().update(value)
+
+        level = 0
+        while True:
+            if level == len(self.levels):
+                self.levels.append(WelfordAccumulator())
+                self.pending.append(None)
+            self.levels[level].update(value)
+            if self.pending[level] is None:
+                self.pending[level] = value
+                break
+            # The block is complete: its mean goes one level up.
+            value = 0.5 * (self.pending[level] + value)
+            self.pending[level] = None
+            level += 1
+
+    def merge(self, other) -> None:
+        """
+        Merge another BlockingAccumulator (ie the following chunk of the trajectory) into this one.
+        - NOTE: blocks straddling the boundary between the two chunks are discarded.
+
+        Parameters
+        ----------
+            - other (BlockingAccumulator) : The accumulator to merge.
+        """
+        super().merge(other)
+        for level in range(len(other.levels)):
+            if level == len(self.levels):
+                self.levels.append(WelfordAccumulator())
+                self.pending.append(None)
+            self.levels[level].merge(other.levels[level])
+            self.pending[level] = other.pending[level]
+        # The values pending above the levels of 'other' would be paired with values after the boundary
+        for level in range(len(other.levels), len(self.levels)):
+            self.pending[level] = None
+
+    def get_blocking_errors(self) -> tuple:
+        """
+        Return the estimates of the error of the mean at each blocking level.
+
+        Returns
+        -------
+            - np.ndarray : Error estimates, one row per blocking level with at least 'min_blocks' blocks.
+            - np.ndarray : Uncertainty of these error estimates.
+        """
+        errors, uncertainties = [], []
+        for level in self.levels:
+            n = level.count
+            if n < max(self.min_blocks, 2):
+                break
+            error = np.sqrt(level.m2 / n / (n - 1))
+            errors.append(error)
+            uncertainties.append(error / np.sqrt(2 * (n - 1)))
+        return np.array(errors), np.array(uncertainties)
+
+    def get_error(self) -> np.ndarray:
+        """
+        Return the error of the mean at the plateau of the blocking curve.
+
+        The first blocking level whose error estimate is compatible (within its uncertainty) with the
+        estimate of the next level is selected; if no plateau is reached, the last reliable level is used.
+        """
+        errors, uncertainties = self.get_blocking_errors()
+        if len(errors) == 0:
+            return super().get_error()
+
+        error = np.array(errors[-1])
+        found = np.zeros_like(error, dtype=bool)
+        for k in range(len(errors) - 1):
+            plateau = ~found & (errors[k + 1] - errors[k] <= uncertainties[k])
+            error = np.where(plateau, errors[k], error)
+            found |= plateau
+        return error
+
+    def get_statistical_inefficiency(self) -> np.ndarray:
+        """
+        Return the statistical inefficiency s = (blocking error / naive error)^2, ie roughly 2 * tau + 1
+        with tau the correlation time in frames.
+        """
+        naive = super().get_error()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inefficiency = np.where(naive > 0, (self.get_error() / naive) ** 2, 1.0)
+        return inefficiency
+
+    def get_required_count(self, target_error) -> np.ndarray:
+        """
+        Return the number of frames needed to reach a target error of the mean.
+
+        Parameters
+        ----------
+            - target_error (float) : The target error of the mean.
+
+        Returns
+        -------
+            - np.ndarray : Number of frames needed (with the current statistical inefficiency).
+        """
+        variance = self.m2 / self.count
+        return np.ceil(self.get_statistical_inefficiency() * variance / target_error**2)
+
+
+# Error estimation methods available for the results.
+ERROR_ESTIMATIONS = {
+    "standard": WelfordAccumulator,
+    "blocking": BlockingAccumulator,
+}
+
+
+class LifetimeAccumulator:
+    r"""
+    Streaming histogram of the lifetimes of the forms of a set of atoms (eg the SiOz polyhedra) along a trajectory.
+
+    Only the current form and the length of its current run are stored for each atom, so the memory
+    footprint is O(number of atoms) and does not depend on the number of frames. The first transition of
+    each atom is kept apart (its run may have started in a previous chunk of the trajectory), which allows
+    the accumulators of consecutive chunks to be merged through their boundary states.
+
+    The duration of a run is the number of consecutive pairs of frames in which the form did not change.
+
+    Attributes
+    ----------
+        - number_of_forms (int) : Number of form codes (the forms are coded from 0 to number_of_forms - 1).
+        - number_of_frames (int) : Maximum number of frames of the trajectory (length of the histograms).
+        - count (int) : Number of frames accumulated.
+        - transitions (np.ndarray) : Histogram of the transitions (from form, to form, duration).
+        - head_form (np.ndarray) : Form of each atom at the first frame.
+        - head_next (np.ndarray) : Form of each atom after its first change.
+        - head_run (np.ndarray) : Duration of the first run of each atom.
+        - has_changed (np.ndarray) : Whether each atom has changed form.
+        - current_form (np.ndarray) : Form of each atom at the last frame.
+        - counter (np.ndarray) : Duration of the current run of each atom.
+        - occupancy (np.ndarray) : Number of (atom, frame) in each form.
+    """
+
+    def __init__(self, number_of_forms, number_of_frames) -> None:
+        """
+        Initialize an empty LifetimeAccumulator object.
+
+        Parameters
+        ----------
+            - number_of_forms (int) : Number of form codes.
+            - number_of_frames (int) : Maximum number of frames of the trajectory.
+        """
+        self.number_of_forms: int = number_of_forms
+        self.number_of_frames: int = number_of_frames
+        self.count: int = 0
+        self.transitions: np.ndarray = np.zeros(
+            (number_of_forms, number_of_forms, number_of_frames), dtype=np.int64
+        )
+        self.head_form: np.ndarray = None
+        self.head_next: np.ndarray = None
+        self.head_run: np.ndarray = None
+        self.has_changed: np.ndarray = None
+        self.current_form: np.ndarray = None
+        self.counter: np.ndarray = None
+        self.occupancy: np.ndarray = np.zeros(number_of_forms, dtype=np.int64)
+
+    def update(self, forms) -> None:
+        """
+        Add the forms of the atoms at the next frame.
+
+        Parameters
+        ----------
+            - forms (np.ndarray) : Form code of each atom.
+        """
+        forms = np.asarray(forms, dtype=np.uint8)
+        if self.count == 0:
+            self.head_form = np.copy(forms)
+            self.head_next = np.zeros_like(forms)
+            self.head_run = np.zeros(len(forms), dtype=np.int64)
+            self.has_changed = np.zeros(len(forms), dtype=np.bool_)
+            self.current_form = np.copy(forms)
+            self.counter = np.zeros(len(forms), dtype=np.int64)
+        else:
+            _update_lifetimes(
+                forms,
+                self.current_form,
+                self.counter,
+                self.has_changed,
+                self.head_next,
+                self.head_run,
+                self.transitions,
+            )
+        self.occupancy += np.bincount(forms, minlength=self.number_of_forms)
+        self.count += 1
+
+    def merge(self, other) -> None:
+        """
+        Merge the accumulator of the next chunk of the trajectory into this one.
+
+        Parameters
+        ----------
+            - other (LifetimeAccumulator) : The accumulator of the frames following the frames of this one.
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.transitions = np.copy(other.transitions)
+            self.head_form = np.copy(other.head_form)
+            self.head_next = np.copy(other.head_next)
+            self.head_run = np.copy(other.head_run)
+            self.has_changed = np.copy(other.has_changed)
+            self.current_form = np.copy(other.current_form)
+            self.counter = np.copy(other.counter)
+            self.occupancy = np.copy(other.occupancy)
+            return
+        self.transitions += other.transitions
+        self.occupancy += other.occupancy
+        _merge_lifetimes(
+            self.current_form,
+            self.counter,
+            self.has_changed,
+            self.head_next,
+            self.head_run,
+            other.head_form,
+            other.head_next,
+            other.head_run,
+            other.has_changed,
+            other.current_form,
+            other.counter,
+            self.transitions,
+        )
+        self.count += other.count
+
+    def get_transitions(self) -> np.ndarray:
+        """
+        Return the histogram of the transitions (from form, to form, duration), first transitions included.
+        """
+        transitions = np.copy(self.transitions)
+        if self.count > 0:
+            changed = self.has_changed
+            np.add.at(
+                transitions,
+                (self.head_form[changed], self.head_next[changed], self.head_run[changed]),
+                1,
+            )
+        return transitions
+
+    def get_unchanged_forms(self) -> np.ndarray:
+        """
+        Return the number of atoms that kept the same form along the whole trajectory, for each form.
+        """
+        if self.count == 0:
+            return np.zeros(self.number_of_forms, dtype=np.int64)
+        return np.bincount(
+            self.head_form[~self.has_changed], minlength=self.number_of_forms
+        )
+
+    def get_time_at_risk(self) -> np.ndarray:
+        """
+        Return the number of pairs of consecutive frames starting in each form (ie the time during which a
+        transition out of the form could have been observed, in frames).
+        """
+        if self.count == 0:
+            return np.zeros(self.number_of_forms, dtype=np.int64)
+        return self.occupancy - np.bincount(self.current_form, minlength=self.number_of_forms)
+
+    def get_transition_counts(self) -> np.ndarray:
+        """
+        Return the matrix of the number of transitions between two consecutive frames (from form, to form).
+        The diagonal is the number of pairs of consecutive frames without change.
+        """
+        counts = np.sum(self.get_transitions(), axis=2)
+        counts[np.diag_indices(self.number_of_forms)] = self.get_time_at_risk() - np.sum(counts, axis=1)
+        return counts
+
+    def get_rate_matrix(self, time_step) -> np.ndarray:
+        """
+        Return the transition rate matrix (from form, to form), ie the number of transitions divided by the time
+        spent in the initial form. The diagonal is minus the escape rate of each form (rows sum to zero).
+
+        Parameters
+        ----------
+            - time_step (float) : Time between two consecutive frames.
+        """
+        counts = self.get_transition_counts().astype(np.float64)
+        np.fill_diagonal(counts, 0.0)
+        time_at_risk = self.get_time_at_risk() * time_step
+        rates = np.divide(
+            counts,
+            time_at_risk[:, np.newaxis],
+            out=np.zeros_like(counts),
+            where=time_at_risk[:, np.newaxis] > 0,
+        )
+        rates[np.diag_indices(self.number_of_forms)] = -np.sum(rates, axis=1)
+        return rates
+
+    def get_residence_times(self, time_step) -> np.ndarray:
+        """
+        Return the mean residence time in each form, ie the time spent in the form divided by the number of
+        transitions out of it (nan if the form was never left).
+
+        Parameters
+        ----------
+            - time_step (float) : Time between two consecutive frames.
+        """
+        counts = self.get_transition_counts()
+        exits = np.sum(counts, axis=1) - np.diag(counts)
+        time_at_risk = self.get_time_at_risk() * time_step
+        return np.divide(
+            time_at_risk,
+            exits,
+            out=np.full(self.number_of_forms, np.nan),
+            where=exits > 0,
+        )
+
+
+@njit
+def _update_lifetimes(forms, current_form, counter, has_changed, head_next, head_run, transitions) -> None:
+    """
+    Update the runs of the atoms with their forms at the next frame (see LifetimeAccumulator.update).
+    """
+    for a in range(len(forms)):
+        if forms[a] == current_form[a]:
+            # the form is the same as the previous frame, increment the counter
+            counter[a] += 1
+        else:
+            if has_changed[a]:
+                transitions[current_form[a], forms[a], counter[a]] += 1
+            else:
+                # first change, the run may have started in a previous chunk
+                has_changed[a] = True
+                head_next[a] = forms[a]
+                head_run[a] = counter[a]
+            counter[a] = 0
+            current_form[a] = forms[a]
+
+
+@njit
+def _merge_lifetimes(
+    current_form,
+    counter,
+    has_changed,
+    head_next,
+    head_run,
+    other_head_form,
+    other_head_next,
+    other_head_run,
+    other_has_changed,
+    other_current_form,
+    other_counter,
+    transitions,
+) -> None:
+    """
+    Join the runs of the atoms at the boundary between two consecutive chunks (see LifetimeAccumulator.merge).
+    """
+    for a in range(len(current_form)):
+        if other_has_changed[a]:
+            other_run = other_head_run[a]
+        else:
+            other_run = other_counter[a]
+
+        if current_form[a] == other_head_form[a]:
+            # the run continues across the boundary
+            run = counter[a] + 1 + other_run
+            if other_has_changed[a]:
+                if has_changed[a]:
+                    transitions[other_head_form[a], other_head_next[a], run] += 1
+                else:
+                    has_changed[a] = True
+                    head_next[a] = other_head_next[a]
+                    head_run[a] = run
+                counter[a] = other_counter[a]
+                current_form[a] = other_current_form[a]
+            else:
+                counter[a] = run
+        else:
+            # the form changes at the boundary
+            if has_changed[a]:
+                transitions[current_form[a], other_head_form[a], counter[a]] += 1
+            else:
+                has_changed[a] = True
+                head_next[a] = other_head_form[a]
+                head_run[a] = counter[a]
+            if other_has_changed[a]:
+                transitions[other_head_form[a], other_head_next[a], other_run] += 1
+            counter[a] = other_counter[a]
+            current_form[a] = other_current_form[a]
+
 
 class DistResult(Result):
     """
@@ -47,7 +565,7 @@ class DistResult(Result):
         - property (str) : The structural property name.
         - info (str) : Additional informations about the property.
         - init_frame (int) : The initial frame number.
-        - timeline (dict) : The timeline of the property.
+        - accumulator (WelfordAccumulator) : Streaming mean / variance of the histograms (BlockingAccumulator with 'blocking' errors).
         - result (float) : The final result averaged over the number of frames.
         - error (float) : The error of the final result.
         - bins (np.ndarray) : The bins of the histogram.
@@ -55,7 +573,7 @@ class DistResult(Result):
         - filepath (str) : the path to the output file.
     """
 
-    def __init__(self, name: str, info: str, init_frame: int) -> None:
+    def __init__(self, name: str, info: str, init_frame: int, error_estimation: str = "standard") -> None:
         """
         Initialize the DistResult object.
 
@@ -64,45 +582,42 @@ class DistResult(Result):
             - name (str) : The structural property name.
             - info (str) : Additional informations about the property.
             - init_frame (int) : The initial frame number.
+            - error_estimation (str) : Method used to estimate the errors ('standard' or 'blocking').
         """
-        super().__init__(name, info, init_frame)
+        super().__init__(name, info, init_frame, error_estimation)
         self.bins: np.ndarray = np.array([])
         self.histogram: np.ndarray = np.array([])
         self.error: np.ndarray = np.array([])
         self.result: np.ndarray = np.array([])
         self.filepath: str = ""
+        self.accumulator: WelfordAccumulator = self.new_accumulator()
 
     def add_to_timeline(self, frame: int, bins: np.array, hist: np.array) -> None:
         """
-        Appends a data point to the timeline.
+        Accumulates the histogram of a frame.
         """
         self.bins = bins
-        self.timeline[frame] = hist
+        self.accumulator.update(hist)
 
-    def calculate_average_distribution(self) -> None:
-        """
-        Calculates the average distribution based on the timeline data.
+    def merge(self, other) -> None:
         """
-        for frame, array in self.timeline.items():
-            self.error = np.zeros((len(self.timeline), len(array)))
-            break
-
-        for frame, array in self.timeline.items():
-            if len(self.timeline) > 1:
-                i = frame - self.init_frame
-                self.error[i] = array
-            if len(self.histogram) == 0:
-                # Initialize histogram ndarray
-                self.histogram = array
-            else:
-                self.histogram += array
+        Merges the frames accumulated by another DistResult object (ie from another chunk of the trajectory).
 
-        if len(self.timeline) > 1:
-            self.error = np.std(self.error, axis=0) / np.sqrt(len(self.timeline))
-        else:
-            self.error = np.zeros_like(self.histogram)
+        Parameters:
+        -----------
+            - other (DistResult) : The result object to merge.
+        """
+        if len(self.bins) == 0:
+            self.bins = other.bins
+        self.accumulator.merge(other.accumulator)
 
-        self.result = self.histogram / len(self.timeline)
+    def calculate_average_distribution(self) -> None:
+        """
+        Calculates the average distribution based on the accumulated frames.
+        """
+        self.result = self.accumulator.get_mean()
+        self.error = self.accumulator.get_error()
+        self.histogram = self.result * self.accumulator.count
 
     def write_file_header(self, path_to_directory: str, number_of_frames: int) -> None:
         """
@@ -145,38 +660,60 @@ class PropResult(Result):
         - property (str) : The structural property name.
         - info (str) : Additional informations about the property.
         - init_frame (int) : The initial frame number.
-        - timeline (dict) : The timeline of the property.
+        - accumulators (dict) : Streaming mean / variance of each key (WelfordAccumulator or BlockingAccumulator objects).
         - result (float) : The final result averaged over the number of frames.
         - error (float) : The error of the final result.
+        - target_error (float) : Target error of the results, the number of frames needed to reach it is reported with 'blocking' errors.
+        - inefficiency (dict) : Statistical inefficiency of each key ('blocking' errors only).
+        - required_frames (dict) : Number of frames needed to reach the target error for each key ('blocking' errors only).
         - filepath (str) : the path to the output file.
     """
 
-    def __init__(self, property: str, info: str, init_frame: int) -> None:
-        super().__init__(property, info, init_frame)
+    def __init__(
+        self, property: str, info: str, init_frame: int, error_estimation: str = "standard", target_error: float = None
+    ) -> None:
+        super().__init__(property, info, init_frame, error_estimation)
         self.filepath: str = ""
         self.result: dict = {}
         self.error: dict = {}
+        self.target_error: float = target_error
+        self.inefficiency: dict = {}
+        self.required_frames: dict = {}
+        self.accumulators: dict = {}
 
     def add_to_timeline(self, frame: int, keys: list, values: list) -> None:
         """
-        Appends a data point to the timeline.
+        Accumulates the values of a frame.
         """
         for key, val in zip(keys, values):
-            if key not in self.timeline:
-                self.timeline[key] = []
-            self.timeline[key].append(val)
+            if key not in self.accumulators:
+                self.accumulators[key] = self.new_accumulator()
+            self.accumulators[key].update(val)
 
-    def calculate_average_proportion(self) -> None:
+    def merge(self, other) -> None:
         """
-        Calculates the average proportion based on the timeline data.
+        Merges the frames accumulated by another PropResult object (ie from another chunk of the trajectory).
+
+        Parameters:
+        -----------
+            - other (PropResult) : The result object to merge.
         """
-        for key, list_value in self.timeline.items():
-            self.result[key] = sum(list_value)
-            self.error[key] = np.std(list_value)
+        for key, accumulator in other.accumulators.items():
+            if key not in self.accumulators:
+                self.accumulators[key] = self.new_accumulator()
+            self.accumulators[key].merge(accumulator)
 
-        for key in self.result.keys():
-            self.result[key] /= len(self.timeline[key])
-            self.error[key] /= np.sqrt(len(self.timeline[key]))
+    def calculate_average_proportion(self) -> None:
+        """
+        Calculates the average proportion based on the accumulated frames.
+        """
+        for key, accumulator in self.accumulators.items():
+            self.result[key] = float(accumulator.get_mean())
+            self.error[key] = float(accumulator.get_error())
+            if isinstance(accumulator, BlockingAccumulator):
+                self.inefficiency[key] = float(accumulator.get_statistical_inefficiency())
+                if self.target_error is not None:
+                    self.required_frames[key] = int(accumulator.get_required_count(self.target_error))
 
     def write_file_header(self, path_to_directory: str, number_of_frames: int) -> None:
         """
@@ -207,10 +744,91 @@ class PropResult(Result):
         with open(self.filepath, 'a', encoding='utf-8') as output:
             for key in self.result.keys():
                 output.write(f"{self.result[key]:10.6f} +/- {self.error[key]:<10.5f} # {key}\n")
+            # Correlation of the frames (commented out, the recap files only read the results)
+            if len(self.inefficiency) > 0:
+                if self.target_error is not None:
+                    output.write(
+                        f"# statistical inefficiency and frames needed for +/- {self.target_error:g} :\n"
+                    )
+                else:
+                    output.write("# statistical inefficiency :\n")
+                for key, inefficiency in self.inefficiency.items():
+                    line = f"#   {key} : s = {inefficiency:.2f}"
+                    if key in self.required_frames:
+                        line += f" | {self.required_frames[key]} frames"
+                    output.write(line + "\n")
         output.close()
 
         make_lines_unique(self.filepath)
 
+class MatrixResult(Result):
+    """
+    Represents a matrix result between a list of labels (eg the transition matrix between the forms of the polyhedra).
+
+    Attributes
+    ----------
+        - property (str) : The structural property name.
+        - info (list) : Labels of the rows and columns of the matrix.
+        - init_frame (int) : The initial frame number.
+        - result (np.ndarray) : The matrix.
+        - filepath (str) : the path to the output file.
+    """
+
+    def __init__(self, property: str, info: list, init_frame: int, error_estimation: str = "standard") -> None:
+        super().__init__(property, info, init_frame, error_estimation)
+        self.filepath: str = ""
+        self.result: np.ndarray = None
+
+    def set_result(self, matrix) -> None:
+        """
+        Sets the matrix.
+        """
+        self.result = np.array(matrix, dtype=np.float64)
+
+    def merge(self, other) -> None:
+        """
+        Merges another MatrixResult object (the matrix is calculated over the whole trajectory, so it is only
+        taken from the other object if this one has none).
+
+        Parameters:
+        -----------
+            - other (MatrixResult) : The result object to merge.
+        """
+        if self.result is None and other.result is not None:
+            self.result = np.copy(other.result)
+
+    def write_file_header(self, path_to_directory: str, number_of_frames: int) -> None:
+        """
+        Initializes the output file with a header.
+
+        Parameters:
+        -----------
+            - path_to_directory (str) : The path to the output directory.
+            - number_of_frames (int) : The number of frames in the trajectory.
+        """
+        filename = f"{self.property}.dat"
+        if not os.path.exists(path_to_directory):
+            os.makedirs(path_to_directory)
+
+        self.filepath = os.path.join(path_to_directory, filename)
+
+        with open(self.filepath, "w") as output:
+            output.write(
+                f"# {self.property} \u279c {number_of_frames} frames (rows: from, columns: to).\n"
+            )
+            output.write("# " + " " * 8 + "".join(f"{label:>14}" for label in self.info) + "\n")
+        output.close()
+
+    def append_results_to_file(self) -> None:
+        """
+        Appends the results to the output file.
+        """
+        with open(self.filepath, "a", encoding="utf-8") as output:
+            for label, row in zip(self.info, self.result):
+                output.write(f"{label:>10}" + "".join(f"{value:14.6e}" for value in row) + "\n")
+        output.close()
+
+
 class MSDResult(Result):
     r"""
     Represents a MSD Result.
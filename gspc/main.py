@@ -7,7 +7,9 @@ from .utils.generate_color_gradient import generate_color_gradient as gcg
 import numpy as np
 from tqdm import tqdm
 import os
+import copy
 import importlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 import logging
 
@@ -36,6 +38,10 @@ def main(settings):
         if settings.logging.get_value():
             logging.info(f"Created output directory: {settings._output_directory}")
 
+    # Remove the log of the skipped atoms of a previous run
+    if os.path.exists(os.path.join(settings._output_directory, "skipped_atoms.log")):
+        os.remove(os.path.join(settings._output_directory, "skipped_atoms.log"))
+
     input_file = settings.path_to_xyz_file.get_value()
 
     # Count the number of configurations in the trajectory
@@ -61,10 +67,10 @@ def main(settings):
     if settings.logging.get_value():
         logging.info("Lattice properties read")
 
-    # Create the Cutoff object
-    cutoffs = core.Cutoff(settings.cutoffs.get_value())
+    # Index the position of the frames in the trajectory file
+    offsets = io.index_frames(input_file, n_atoms + n_header)
     if settings.logging.get_value():
-        logging.info("Cutoff object created")
+        logging.info("Frames indexed")
 
     # Settings the for loop with user settings
     if settings.range_of_frames.get_value() is not None:
@@ -78,35 +84,73 @@ def main(settings):
         if settings.logging.get_value():
             logging.error("Range of frames selected is invalid")
         raise ValueError(
-            f"\tERROR: Range of frames selected is invalid \u279c {settings.range_of_frames.get_value()}."
+            f"\tERROR: Range of frames selected is invalid ➜ {settings.range_of_frames.get_value()}."
         )
     else:
         settings.frames_to_analyse.set_value(end - start)
         if settings.logging.get_value():
             logging.info(f"Frames to analyse: {end - start}")
 
-    if not settings.quiet.get_value():
-        color_gradient = gcg(end - start)
-        progress_bar = tqdm(
-            range(start, end),
-            desc="Analysing trajectory ... ",
-            unit="frame",
-            leave=False,
-            colour="YELLOW",
+    # Create the results objects and write the headers of the output files
+    results = _create_results(settings, module, start, end, write_headers=True)
+
+    n_workers = min(settings.n_workers.get_value(), end - start)
+
+    if n_workers <= 1:
+        # Analyse the whole trajectory in this process
+        forms, msd, mass = _analyse_frames(
+            settings, box, offsets, start, end, start, results=results
         )
     else:
-        progress_bar = range(start, end)
+        # Analyse contiguous chunks of the trajectory in a pool of processes
+        forms, msd, mass = _analyse_frames_in_parallel(
+            settings, box, offsets, start, end, n_workers, results
+        )
+
+    settings.lbox.set_value(box.get_box_dimensions(end - 1))
+
+    _write_results(settings, module, results, forms, msd, mass, end)
+
+    settings.write_readme_file()
+    if settings.logging.get_value():
+        logging.info("Readme file written")
+        logging.info("Main function completed")
+    # END OF MAIN FUNCTION
+
+
+def _create_results(settings, module, start, end, write_headers=False) -> dict:
+    r"""
+    Create the results objects of the properties to calculate.
 
-    # Create the results objects
+    Parameters:
+    -----------
+        - settings (Settings) : Settings object.
+        - module (module) : Extension module.
+        - start (int) : Id of the first frame analysed.
+        - end (int) : Id of the last frame analysed.
+        - write_headers (bool) : Write the headers of the output files.
+
+    Returns:
+    --------
+        - dict : Results objects, keys are the names of the properties.
+    """
     # TODO complete the list of results objects # PRIO1
+    error_estimation = settings.error_estimation.get_value()
+    target_error = settings.target_error.get_value()
+    results = {}
+
     if "pair_distribution_function" in settings.properties.get_value():
         results_pdf = {}
         keys_pdf = module.return_keys("pair_distribution_function")
         for key in keys_pdf:
-            results_pdf[key] = io.DistResult("pair_distribution_function", key, start)
-            results_pdf[key].write_file_header(settings._output_directory, end - start)
-        results_md = io.PropResult("mean_distances", "mean_distances", start)
-        results_md.write_file_header(settings._output_directory, end - start)
+            results_pdf[key] = io.DistResult("pair_distribution_function", key, start, error_estimation)
+            if write_headers:
+                results_pdf[key].write_file_header(settings._output_directory, end - start)
+        results_md = io.PropResult("mean_distances", "mean_distances", start, error_estimation, target_error)
+        if write_headers:
+            results_md.write_file_header(settings._output_directory, end - start)
+        results["pair_distribution_function"] = results_pdf
+        results["mean_distances"] = results_md
         if settings.logging.get_value():
             logging.info("Pair distribution function results objects created")
 
@@ -114,10 +158,14 @@ def main(settings):
         results_bad = {}
         keys_bad = module.return_keys("bond_angular_distribution")
         for key in keys_bad:
-            results_bad[key] = io.DistResult("bond_angular_distribution", key, start)
-            results_bad[key].write_file_header(settings._output_directory, end - start)
-        results_ma = io.PropResult("mean_angles", "mean_angles", start)
-        results_ma.write_file_header(settings._output_directory, end - start)
+            results_bad[key] = io.DistResult("bond_angular_distribution", key, start, error_estimation)
+            if write_headers:
+                results_bad[key].write_file_header(settings._output_directory, end - start)
+        results_ma = io.PropResult("mean_angles", "mean_angles", start, error_estimation, target_error)
+        if write_headers:
+            results_ma.write_file_header(settings._output_directory, end - start)
+        results["bond_angular_distribution"] = results_bad
+        results["mean_angles"] = results_ma
         if settings.logging.get_value():
             logging.info("Bond angular distribution results objects created")
 
@@ -130,20 +178,29 @@ def main(settings):
                     for sub_key in dict_key[key]:
                         if sub_key == 'bins' or sub_key == 'time':
                             continue
-                        results_sru[sub_key] = io.DistResult(key, sub_key, start)
-                        results_sru[sub_key].write_file_header(settings._output_directory, end-start)
+                        results_sru[sub_key] = io.DistResult(key, sub_key, start, error_estimation)
+                        if write_headers:
+                            results_sru[sub_key].write_file_header(settings._output_directory, end-start)
+                elif key == 'transition_matrix' or key == 'rate_matrix':
+                    results_sru[key] = io.MatrixResult(key, dict_key[key], start, error_estimation)
+                    if write_headers:
+                        results_sru[key].write_file_header(settings._output_directory, end - start)
                 else:
-                    results_sru[key] = io.PropResult(key, dict_key[key], start)
-                    results_sru[key].write_file_header(
-                        settings._output_directory, end - start
-                )
+                    results_sru[key] = io.PropResult(key, dict_key[key], start, error_estimation, target_error)
+                    if write_headers:
+                        results_sru[key].write_file_header(
+                            settings._output_directory, end - start
+                    )
+        results["structural_units"] = results_sru
         if settings.logging.get_value():
             logging.info("Structural units results objects created")
 
     if "mean_square_displacement" in settings.properties.get_value():
         key = module.return_keys('mean_square_displacement')
         results_msd = io.MSDResult("mean_square_displacement", key, start)
-        results_msd.write_file_header(settings._output_directory, end - start)
+        if write_headers:
+            results_msd.write_file_header(settings._output_directory, end - start)
+        results["mean_square_displacement"] = results_msd
         if settings.logging.get_value():
             logging.info("Mean square displacement results object created")
 
@@ -151,168 +208,412 @@ def main(settings):
         results_nsf = {}
         keys_nsf = module.return_keys("neutron_structure_factor")
         for key in keys_nsf:
-            results_nsf[key] = io.DistResult("neutron_structure_factor", key, start)
-            results_nsf[key].write_file_header(settings._output_directory, end - start)
+            results_nsf[key] = io.DistResult("neutron_structure_factor", key, start, error_estimation)
+            if write_headers:
+                results_nsf[key].write_file_header(settings._output_directory, end - start)
+        results["neutron_structure_factor"] = results_nsf
         if settings.logging.get_value():
             logging.info("Neutron structure factor results objects created")
 
-    # Loop over the frames in the trajectory
-    for i in progress_bar:
-        if settings.logging.get_value():
-            logging.info(f"Processing frame {i}")
-        
-        # Update the progress bar
-        if not settings.quiet.get_value():
-            progress_bar.set_description(f"Analysing trajectory n°{i} ... ")
-            progress_bar.colour = "#%02x%02x%02x" % color_gradient[i - start]
-
-        # Create the System object at the current frame
-        if i == start:
-            system, reference_positions = io.read_and_create_system(
-                input_file, i, n_atoms + n_header, settings, cutoffs, start, end
+    return results
+
+
+def _read_reference_positions(settings, module, offsets, start) -> list:
+    r"""
+    Read the positions of the atoms at the first frame analysed (reference of the mean square displacement).
+
+    Returns:
+    --------
+        - list : ReferencePosition objects.
+    """
+    elements, positions = io.read_frame(
+        settings.path_to_xyz_file.get_value(),
+        offsets[start],
+        settings.number_of_atoms.get_value(),
+    )
+    reference_positions = []
+    for i in range(len(elements)):
+        if elements[i] in module.LIST_OF_SUPPORTED_ELEMENTS:
+            reference_positions.append(
+                core.ReferencePosition(positions[i], str(elements[i]), i)
             )
-            for atom in system.atoms:
-                for ref in reference_positions:
-                    if atom.id == ref.id:
-                        atom.set_reference_position(ref)
-                        atom.set_current_position(ref)
-                        # next atom
-                        break
-
-            system.init_mean_square_displacement()
-
-            if "structural_units" in settings.properties.get_value():
-                stored_forms = None
-
-        else:
-            if 'structural_units' in settings.properties.get_value():
-                stored_forms = system.forms
-            if 'mean_square_displacement' in settings.properties.get_value():
-               store_msd = system.msd
-            system, current_positions = io.read_and_create_system(
-                input_file, i, n_atoms + n_header, settings, cutoffs, start, end
+    return reference_positions
+
+
+def _analyse_frames(settings, box, offsets, first, last, start, results=None, reference_positions=None) -> tuple:
+    r"""
+    Analyse the frames [first, last) of the trajectory.
+
+    The properties that are independent from one frame to another (pdf, bad, structural units, nsf) are
+    accumulated in the results objects. The order dependent quantities are returned so that they can be stitched
+    with the other chunks of the trajectory: the mean square displacement per frame, and the lifetimes of the
+    polyhedra as a LifetimeAccumulator (merged through the boundary states of the chunks).
+
+    Parameters:
+    -----------
+        - settings (Settings) : Settings object.
+        - box (Box) : Box object with the lattice of each frame.
+        - offsets (np.ndarray) : Byte offset of each frame in the trajectory file.
+        - first (int) : Id of the first frame of the chunk.
+        - last (int) : Id of the last frame of the chunk (excluded).
+        - start (int) : Id of the first frame of the whole analysis (reference of the mean square displacement).
+        - results (dict) : Results objects to fill. If None, new results objects are created.
+        - reference_positions (list) : ReferencePosition objects, required if first != start.
+
+    Returns:
+    --------
+        - LifetimeAccumulator : Lifetimes of the forms of the polyhedra (None if structural units are not calculated).
+        - dict : Sum of the squared displacements of each species at each frame.
+        - dict : Mass of each species.
+    """
+    module = importlib.import_module(
+        f"gspc.extensions.{settings.extension.get_value()}"
+    )
+    if results is None:
+        results = _create_results(settings, module, start, last)
+
+    input_file = settings.path_to_xyz_file.get_value()
+    n_atoms = settings.number_of_atoms.get_value()
+    n_header = settings.header.get_value()
+    end = start + settings.frames_to_analyse.get_value()
+    properties = settings.properties.get_value()
+
+    # Create the Cutoff object
+    cutoffs = core.Cutoff(settings.cutoffs.get_value())
+
+    if not settings.quiet.get_value():
+        color_gradient = gcg(last - first)
+        progress_bar = tqdm(
+            range(first, last),
+            desc="Analysing trajectory ... ",
+            unit="frame",
+            leave=False,
+            colour="YELLOW",
+        )
+    else:
+        progress_bar = range(first, last)
+
+    # Read and parse the next frames in the background while the current frame is analysed
+    if settings.prefetch_frames.get_value() > 0:
+        prefetcher = iter(
+            io.FramePrefetcher(
+                input_file, offsets, n_atoms, range(first, last), settings.prefetch_frames.get_value()
             )
-            if 'mean_square_displacement' in settings.properties.get_value():
-                system.msd = store_msd
-                for atom in system.atoms:
-                    for cur in current_positions:
-                        if atom.id == cur.id:
-                            atom.set_current_position(cur)
-                            # next atom
-                            break
-                for atom in system.atoms:
-                    for ref in reference_positions:
-                        if atom.id == ref.id:
-                            atom.set_reference_position(ref)
-                            # next atom
-                            break
-        system.frame = i
-
-        # Set the Box object to the System object
-        system.box = box
-        settings.lbox.set_value(system.box.get_box_dimensions(i))
-
-        # Calculate the nearest neighbours of all atoms in the system
-        system.calculate_neighbours()
-        if settings.logging.get_value():
-            logging.info(f"Calculated neighbours for frame {i}")
+        )
+    else:
+        prefetcher = None
 
-        # Calculate the mean square displacement
-        if "mean_square_displacement" in settings.properties.get_value():
-            if i != start:
-                system.calculate_mean_square_displacement()
-                results_msd.add_to_timeline(i, system.msd)
-                if settings.logging.get_value():
-                    logging.info(f"Calculated mean square displacement for frame {i}")
-
-        # Calculate the structural units of the system
-        if "structural_units" in settings.properties.get_value():
-            system.calculate_structural_units(settings.extension.get_value())
-            # Add the results to the timeline
-            for d in keys_sru:
-                key = list(d.keys())[0]
-                sub_keys = d[key]
-                if key == "lifetime" or key == "switch_probability":
-                    continue
-                elif key == 'hist_polyhedricity':
-                    for k, sub_key in enumerate(sub_keys):
-                        if sub_key == 'bins':
-                            continue
-                        results_sru[sub_key].add_to_timeline(
-                            frame=i,
-                            bins=system.structural_units[key][0],
-                            hist=system.structural_units[key][k]
-                        )
-                else:
-                    results_sru[key].add_to_timeline(
-                        i, sub_keys, system.structural_units[key]
-                    )
+    stored_forms = None
+    msd = {}
+    mass = {}
 
-            stored_forms = system.append_forms(stored_forms)
+    # Loop over the frames in the trajectory
+    try:
+        for i in progress_bar:
             if settings.logging.get_value():
-                logging.info(f"Calculated structural units for frame {i}")
-
-        # Calculate the bond angular distribution
-        if "bond_angular_distribution" in settings.properties.get_value():
-            system.calculate_bond_angular_distribution()
-            # Add the results to the timeline
-            for key in keys_bad:
-                results_bad[key].add_to_timeline(
-                    i, system.angles["theta"], system.angles[key]
+                logging.info(f"Processing frame {i}")
+
+            # Update the progress bar
+            if not settings.quiet.get_value():
+                progress_bar.colour = "#%02x%02x%02x" % color_gradient[i - first]
+            _report_progress(settings, progress_bar, i, "reading")
+
+            # Create the System object at the current frame
+            if prefetcher is not None:
+                frame, elements, frame_positions = next(prefetcher)
+                system, positions = io.create_system(
+                    elements, frame_positions, i, settings, cutoffs, start, end
                 )
-            results_ma.add_to_timeline(i, system.mean_angles.keys(), system.mean_angles.values())
-            if settings.logging.get_value():
-                logging.info(f"Calculated bond angular distribution for frame {i}")
-
-        # Calculate the pair distribution function
-        if "pair_distribution_function" in settings.properties.get_value():
-            system.calculate_pair_distribution_function()
-            # Add the results to the timeline
-            for key in keys_pdf:
-                results_pdf[key].add_to_timeline(
-                    i, system.distances["r"], system.distances[key]
+            else:
+                system, positions = io.read_and_create_system(
+                    input_file, i, n_atoms + n_header, settings, cutoffs, start, end, offset=offsets[i]
                 )
-            results_md.add_to_timeline(i, system.mean_distances.keys(), system.mean_distances.values())
+            if i == start:
+                reference_positions = positions
+            if i == first:
+                mass = system.calculate_mass_per_species()
+
+            if 'mean_square_displacement' in properties and i != start:
+                references = {ref.id: ref for ref in reference_positions}
+                currents = {cur.id: cur for cur in positions}
+                for atom in system.atoms:
+                    atom.set_reference_position(references[atom.id])
+                    atom.set_current_position(currents[atom.id])
+            system.frame = i
+
+            # Set the Box object to the System object
+            system.box = box
+            settings.lbox.set_value(system.box.get_box_dimensions(i))
+
+            # Calculate the nearest neighbours of all atoms in the system
+            _report_progress(settings, progress_bar, i, "neighbours")
+            system.calculate_neighbours()
             if settings.logging.get_value():
-                logging.info(f"Calculated pair distribution function for frame {i}")
+                logging.info(f"Calculated neighbours for frame {i}")
+
+            # Calculate the mean square displacement
+            if "mean_square_displacement" in properties:
+                if i != start:
+                    _report_progress(settings, progress_bar, i, "mean_square_displacement")
+                    system.init_mean_square_displacement()
+                    system.calculate_mean_square_displacement()
+                    msd[i] = system.msd
+                    if settings.logging.get_value():
+                        logging.info(f"Calculated mean square displacement for frame {i}")
+
+            # Calculate the structural units of the system
+            if "structural_units" in properties:
+                _report_progress(settings, progress_bar, i, "structural_units")
+                results_sru = results["structural_units"]
+                system.calculate_structural_units(settings.extension.get_value())
+                # Add the results to the timeline
+                for d in module.return_keys("structural_units"):
+                    key = list(d.keys())[0]
+                    sub_keys = d[key]
+                    if key in ["lifetime", "switch_probability", "transition_matrix", "rate_matrix", "residence_time"]:
+                        continue
+                    elif key == 'hist_polyhedricity':
+                        for k, sub_key in enumerate(sub_keys):
+                            if sub_key == 'bins':
+                                continue
+                            results_sru[sub_key].add_to_timeline(
+                                frame=i,
+                                bins=system.structural_units[key][0],
+                                hist=system.structural_units[key][k]
+                            )
+                    else:
+                        results_sru[key].add_to_timeline(
+                            i, sub_keys, system.structural_units[key]
+                        )
+
+                stored_forms = system.append_forms(stored_forms, end - start)
+                if settings.logging.get_value():
+                    logging.info(f"Calculated structural units for frame {i}")
+
+            # Calculate the bond angular distribution
+            if "bond_angular_distribution" in properties:
+                _report_progress(settings, progress_bar, i, "bond_angular_distribution")
+                system.calculate_bond_angular_distribution()
+                # Add the results to the timeline
+                for key, result in results["bond_angular_distribution"].items():
+                    result.add_to_timeline(
+                        i, system.angles["theta"], system.angles[key]
+                    )
+                results["mean_angles"].add_to_timeline(i, system.mean_angles.keys(), system.mean_angles.values())
+                if settings.logging.get_value():
+                    logging.info(f"Calculated bond angular distribution for frame {i}")
+
+            # Calculate the pair distribution function
+            if "pair_distribution_function" in properties:
+                _report_progress(settings, progress_bar, i, "pair_distribution_function")
+                system.calculate_pair_distribution_function()
+                # Add the results to the timeline
+                for key, result in results["pair_distribution_function"].items():
+                    result.add_to_timeline(
+                        i, system.distances["r"], system.distances[key]
+                    )
+                results["mean_distances"].add_to_timeline(i, system.mean_distances.keys(), system.mean_distances.values())
+                if settings.logging.get_value():
+                    logging.info(f"Calculated pair distribution function for frame {i}")
+
+            if "neutron_structure_factor" in properties:
+                _report_progress(settings, progress_bar, i, "neutron_structure_factor")
+                keys_nsf = list(results["neutron_structure_factor"].keys())
+                system.calculate_neutron_structure_factor(keys_nsf)
+                # Add the results to the timeline
+                for key in keys_nsf:
+                    results["neutron_structure_factor"][key].add_to_timeline(i, system.q, system.nsf[key])
+                if settings.logging.get_value():
+                    logging.info(f"Calculated neutron structure factor for frame {i}")
+
+            _report_progress(settings, progress_bar, i, "done")
+    finally:
+        # Stop the reading thread if the analysis stopped before the last frame
+        if prefetcher is not None:
+            prefetcher.close()
+
+    return stored_forms, msd, mass
+
+
+def _report_progress(settings, progress_bar, frame, phase) -> None:
+    r"""
+    Report the phase of the analysis of a frame, once per phase (the per-atom loops do not report anything).
+
+    The phase is shown in the progress bar of the frames if the run is not quiet, and passed to the progress
+    callback of the settings if any, as callback(frame, phase). The phases of a frame are "reading", "neighbours",
+    the name of each property being calculated (eg "pair_distribution_function") and "done".
+
+    Parameters:
+    -----------
+        - settings (Settings) : Settings of the run.
+        - progress_bar (tqdm) : Progress bar of the frames (ignored if the run is quiet).
+        - frame (int) : Index of the frame.
+        - phase (str) : Phase starting for this frame.
+    """
+    if not settings.quiet.get_value():
+        progress_bar.set_description(f"Analysing trajectory n°{frame} : {phase} ... ")
+    callback = settings.progress_callback.get_value()
+    if callback is not None:
+        callback(frame, phase)
+
+
+def _analyse_chunk(settings, box, offsets, first, last, start, reference_positions) -> tuple:
+    r"""
+    Analyse a chunk of the trajectory in a worker process.
+
+    Returns:
+    --------
+        - dict : Results objects of the chunk.
+        - tuple : Forms, squared displacements and masses (see _analyse_frames).
+    """
+    module = importlib.import_module(
+        f"gspc.extensions.{settings.extension.get_value()}"
+    )
+    results = _create_results(settings, module, start, last)
+    output = _analyse_frames(
+        settings, box, offsets, first, last, start, results, reference_positions
+    )
+    return results, output
+
+
+def _init_worker(n_threads) -> None:
+    r"""
+    Limit the number of threads of the numba kernels in a worker process.
+    """
+    import numba
+
+    numba.set_num_threads(n_threads)
+
+
+def _analyse_frames_in_parallel(settings, box, offsets, start, end, n_workers, results) -> tuple:
+    r"""
+    Distribute contiguous chunks of the trajectory over a pool of processes and merge the results of the chunks.
+
+    Returns:
+    --------
+        - tuple : Forms, squared displacements and masses (see _analyse_frames).
+    """
+    import numba
+
+    module = importlib.import_module(
+        f"gspc.extensions.{settings.extension.get_value()}"
+    )
+
+    # The workers do not print anything, the progress is reported here when a chunk is done
+    worker_settings = copy.deepcopy(settings)
+    worker_settings.quiet.set_value(True)
+    worker_settings.progress_callback.set_value(None)
+
+    reference_positions = None
+    if "mean_square_displacement" in settings.properties.get_value():
+        reference_positions = _read_reference_positions(settings, module, offsets, start)
 
-        if "neutron_structure_factor" in settings.properties.get_value():
-            system.calculate_neutron_structure_factor(keys_nsf)
-            # Add the results to the timeline
-            for key in keys_nsf:
-                results_nsf[key].add_to_timeline(i, system.q, system.nsf[key])
+    chunks = np.array_split(np.arange(start, end), n_workers)
+    n_threads = max(1, numba.config.NUMBA_NUM_THREADS // n_workers)
+
+    if not settings.quiet.get_value():
+        progress_bar = tqdm(
+            total=end - start,
+            desc=f"Analysing trajectory ({n_workers} workers) ... ",
+            unit="frame",
+            leave=False,
+            colour="YELLOW",
+        )
+
+    outputs = {}
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(n_threads,)
+    ) as executor:
+        futures = {}
+        for c, chunk in enumerate(chunks):
+            future = executor.submit(
+                _analyse_chunk,
+                worker_settings,
+                box,
+                offsets,
+                int(chunk[0]),
+                int(chunk[-1]) + 1,
+                start,
+                reference_positions,
+            )
+            futures[future] = c
+        for future in as_completed(futures):
+            c = futures[future]
+            outputs[c] = future.result()
+            if not settings.quiet.get_value():
+                progress_bar.update(len(chunks[c]))
+            if settings.progress_callback.get_value() is not None:
+                for frame in chunks[c]:
+                    settings.progress_callback.get_value()(int(frame), "done")
             if settings.logging.get_value():
-                logging.info(f"Calculated neutron structure factor for frame {i}")
+                logging.info(f"Analysed frames {chunks[c][0]} to {chunks[c][-1]}")
+
+    if not settings.quiet.get_value():
+        progress_bar.close()
+
+    # Merge the chunks in the order of the trajectory
+    forms, msd, mass = None, {}, {}
+    for c in range(len(chunks)):
+        chunk_results, (chunk_forms, chunk_msd, chunk_mass) = outputs[c]
+        for name, result in chunk_results.items():
+            if isinstance(result, dict):
+                for key in result:
+                    results[name][key].merge(result[key])
+            elif isinstance(result, io.PropResult) or isinstance(result, io.DistResult):
+                results[name].merge(result)
+        if chunk_forms is not None:
+            if forms is None:
+                forms = chunk_forms
+            else:
+                forms.merge(chunk_forms)
+        msd.update(chunk_msd)
+        mass = chunk_mass
 
+    return forms, msd, mass
+
+
+def _write_results(settings, module, results, forms, msd, mass, end) -> None:
+    r"""
+    Average the results over the frames and write them in the output files.
+    """
     if "pair_distribution_function" in settings.properties.get_value():
-        for key in keys_pdf:
-            results_pdf[key].calculate_average_distribution()
-            results_pdf[key].append_results_to_file()
-        results_md.calculate_average_proportion()
-        results_md.append_results_to_file()
+        for key, result in results["pair_distribution_function"].items():
+            result.calculate_average_distribution()
+            result.append_results_to_file()
+        results["mean_distances"].calculate_average_proportion()
+        results["mean_distances"].append_results_to_file()
         if settings.logging.get_value():
             logging.info("Pair distribution function results appended to file")
 
     if "bond_angular_distribution" in settings.properties.get_value():
-        for key in keys_bad:
-            results_bad[key].calculate_average_distribution()
-            results_bad[key].append_results_to_file()
-        results_ma.calculate_average_proportion()
-        results_ma.append_results_to_file()
+        for key, result in results["bond_angular_distribution"].items():
+            result.calculate_average_distribution()
+            result.append_results_to_file()
+        results["mean_angles"].calculate_average_proportion()
+        results["mean_angles"].append_results_to_file()
         if settings.logging.get_value():
             logging.info("Bond angular distribution results appended to file")
-        
+
     if "mean_square_displacement" in settings.properties.get_value():
-        results_msd.calculate_average_msd(system.calculate_mass_per_species())
+        results_msd = results["mean_square_displacement"]
+        # The squared displacements are accumulated along the trajectory
+        cumulative_msd = {}
+        for i in sorted(msd.keys()):
+            for key, value in msd[i].items():
+                cumulative_msd[key] = cumulative_msd.get(key, 0.0) + value
+            results_msd.add_to_timeline(i, cumulative_msd)
+        results_msd.calculate_average_msd(mass)
         results_msd.append_results_to_file(
             settings.msd_settings.get_dt(), settings.msd_settings.get_printlevel()
         )
         if settings.logging.get_value():
             logging.info("Mean square displacement results appended to file")
-        
+
     if "structural_units" in settings.properties.get_value():
-        lifetime, switch_probability = system.calculate_lifetime()
-        for d in keys_sru:
+        results_sru = results["structural_units"]
+        lifetime, switch_probability = module.calculate_lifetime(settings, forms)
+        transitions = module.calculate_transition_matrix(settings, forms)
+        for d in module.return_keys("structural_units"):
             key = list(d.keys())[0]
             if key == "hist_polyhedricity":
                 sub_keys = d[key]
@@ -321,15 +622,25 @@ def main(settings):
                         continue
                     results_sru[sub_key].calculate_average_distribution()
                     results_sru[sub_key].append_results_to_file()
+            elif key == "transition_matrix" or key == "rate_matrix":
+                results_sru[key].set_result(transitions[key])
+                results_sru[key].append_results_to_file()
+            elif key == "residence_time":
+                results_sru[key].add_to_timeline(
+                    frame=end - 1,
+                    keys=d[key],
+                    values=transitions[key]
+                )
+                results_sru[key].calculate_average_proportion()
+                results_sru[key].append_results_to_file()
             elif key == "switch_probability" or key == "lifetime":
-                lifetime, switch_probability = system.calculate_lifetime()
                 if key == "lifetime":
                     sub_key = d[key]
                     for k, sub_key in enumerate(sub_key):
                         if sub_key == 'time':
                             continue
                         results_sru[sub_key].add_to_timeline(
-                            frame=i,
+                            frame=end - 1,
                             bins=lifetime['time'],
                             hist=lifetime[sub_key]
                         )
@@ -337,7 +648,7 @@ def main(settings):
                         results_sru[sub_key].append_results_to_file()
                 else:
                     results_sru[key].add_to_timeline(
-                        frame=i,
+                        frame=end - 1,
                         keys=switch_probability.keys(),
                         values=switch_probability.values()
                     )
@@ -350,14 +661,8 @@ def main(settings):
             logging.info("Structural units results appended to file")
 
     if "neutron_structure_factor" in settings.properties.get_value():
-        for key in keys_nsf:
-            results_nsf[key].calculate_average_distribution()
-            results_nsf[key].append_results_to_file()
+        for key, result in results["neutron_structure_factor"].items():
+            result.calculate_average_distribution()
+            result.append_results_to_file()
         if settings.logging.get_value():
             logging.info("Neutron structure factor results appended to file")
-
-    settings.write_readme_file()
-    if settings.logging.get_value():
-        logging.info("Readme file written")
-        logging.info("Main function completed")
-    # END OF MAIN FUNCTION
@@ -83,6 +83,45 @@ class Parameter:
         self.value = new_value
 
 
+class ChoiceParameter(Parameter):
+    """
+    The ChoiceParameter class represents a parameter whose value is one of a list of choices.
+
+    Attributes:
+    -----------
+        - name (str) : Name of the parameter.
+        - value () : Value associated with the parameter.
+        - choices (list) : Allowed values of the parameter.
+    """
+
+    def __init__(self, name, value, choices) -> None:
+        """
+        Initializes a ChoiceParameter object with a name, a value and the allowed values.
+
+        Parameters:
+        -----------
+            - name (str) : Name of the parameter.
+            - value () : Value associated with the parameter.
+            - choices (list) : Allowed values of the parameter.
+        """
+        super().__init__(name, value)
+        self.choices: list = choices
+        self.set_value(value)
+
+    def set_value(self, new_value) -> None:
+        """
+        Sets a new value for the parameter, one of the choices.
+
+        Parameters:
+        -----------
+            - new_value () : The new value to be set for the parameter.
+        """
+        if new_value not in self.choices:
+            raise ValueError(f"Invalid value for '{self.name}': {new_value}, choose one of {self.choices}")
+        else:
+            self.value = new_value
+
+
 class PDFParameter:
     r"""
     The PDFParameter class represents the parameters for the Pair Distribution Functions.
@@ -258,3 +297,81 @@ class MSDParameter:
         """
         return number_of_frames * self.dt * self.printlevel
 
+
+
+class NSFParameter:
+    r"""
+    The NSFParameter class represents the parameters for the Neutron Structure Factor.
+
+    Attributes:
+    -----------
+        - qmax (float) : Maximum norm of the q vectors (in inverse angstrom).
+        - engine (str) : Algorithm used for the sums over the atoms, "recurrence" (exp(iq.r) built by
+                         recurrence from exp(2i*pi*x/L)) or "direct" (one sin and cos per atom and q vector).
+        - method (str) : "reciprocal" (sums over the q vectors of the box) or "fourier" (sine transform of the
+                         pair distribution functions, see System.calculate_neutron_structure_factor_from_pdf).
+        - lorch (bool) : Apply a Lorch window to the pair distribution functions in the "fourier" method.
+    """
+
+    def __init__(self, qmax: float, engine: str = "recurrence", method: str = "reciprocal", lorch: bool = False) -> None:
+        self.qmax: float = qmax
+        self.engine: str = engine
+        self.method: str = method
+        self.lorch: bool = lorch
+
+    def get_qmax(self) -> float:
+        """
+        Return the maximum norm of the q vectors.
+        """
+        return self.qmax
+
+    def set_qmax(self, new_qmax: float) -> None:
+        """
+        Set a new value for the maximum norm of the q vectors.
+        """
+        if new_qmax <= 0:
+            raise ValueError(f"Invalid value for 'qmax': {new_qmax}")
+        else:
+            self.qmax = new_qmax
+
+    def get_engine(self) -> str:
+        """
+        Return the algorithm used for the sums over the atoms.
+        """
+        return self.engine
+
+    def set_engine(self, new_engine: str) -> None:
+        """
+        Set a new value for the algorithm used for the sums over the atoms.
+        """
+        if new_engine not in ["recurrence", "direct"]:
+            raise ValueError(f"Invalid value for 'engine': {new_engine}")
+        else:
+            self.engine = new_engine
+
+    def get_method(self) -> str:
+        """
+        Return the method used to calculate the structure factor.
+        """
+        return self.method
+
+    def set_method(self, new_method: str) -> None:
+        """
+        Set a new value for the method used to calculate the structure factor.
+        """
+        if new_method not in ["reciprocal", "fourier"]:
+            raise ValueError(f"Invalid value for 'method': {new_method}")
+        else:
+            self.method = new_method
+
+    def get_lorch(self) -> bool:
+        """
+        Return True if the Lorch window is applied in the "fourier" method.
+        """
+        return self.lorch
+
+    def set_lorch(self, new_lorch: bool) -> None:
+        """
+        Set a new value for the Lorch window of the "fourier" method.
+        """
+        self.lorch = bool(new_lorch)
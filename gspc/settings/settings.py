@@ -1,5 +1,5 @@
 # internal imports
-from .parameter import Parameter, PDFParameter, BADParameter, MSDParameter
+from .parameter import Parameter, ChoiceParameter, PDFParameter, BADParameter, MSDParameter, NSFParameter
 
 # external imports
 import importlib
@@ -55,6 +55,12 @@ class Settings:
         self.quiet: Parameter = Parameter("quiet", False)
         self.overwrite_results: Parameter = Parameter("overwrite_results", False)
         self.logging: Parameter = Parameter("logging", False)
+        self.error_estimation: Parameter = Parameter("error_estimation", "standard")  # 'standard' or 'blocking'
+        self.target_error: Parameter = Parameter("target_error", 0.001)  # target error of the proportions, the frames needed to reach it are reported with 'blocking' errors
+        self.n_workers: Parameter = Parameter("n_workers", 1)  # number of processes analysing the frames
+        self.prefetch_frames: Parameter = Parameter("prefetch_frames", 0)  # number of frames read ahead in the background (0 to disable)
+        self.precision: ChoiceParameter = ChoiceParameter("precision", "float64", ["float64", "float32"])  # precision of the structure factor kernels
+        self.progress_callback: Parameter = Parameter("progress_callback", None)  # callable(frame, phase) called at each phase of each frame
 
         self.supported_extensions: Parameter = Parameter(
             "extensions", ["SiO2", "NSx"]
@@ -84,6 +90,7 @@ class Settings:
         self.pdf_settings: PDFParameter = PDFParameter(nbins=600, rmax=10.0)
         self.bad_settings: BADParameter = BADParameter(nbins=600, theta_max=180.0)
         self.msd_settings: MSDParameter = MSDParameter(dt=0.0016, printlevel=1)
+        self.nsf_settings: NSFParameter = NSFParameter(qmax=10.0)
 
     def print_settings(self) -> None:
         """
@@ -167,6 +174,9 @@ class Settings:
             f.write(f"Pressure (GPa) : {self.pressure.get_value()}\n")
             f.write(f"Temperature (K) : {self.temperature.get_value()}\n")
             f.write(f"Timestep (ps) : {self.timestep.get_value()}\n")
+            f.write(f"Error estimation : {self.error_estimation.get_value()}\n")
+            if self.error_estimation.get_value() == "blocking":
+                f.write(f"Target error : {self.target_error.get_value()}\n")
             f.write(
                 f"Time of simulation (ps) : {self.msd_settings.return_duration(self.number_of_frames.get_value())}\n"
             )
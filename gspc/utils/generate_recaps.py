@@ -8,86 +8,76 @@ def make(export_directory):
     This function is expected to be called in the export directory
     """
 
-    # fetch directories
+    # fetch directories (the README is written at the end of a run, skip the runs still in progress)
     dirs = natsorted(
         [
             d
             for d in os.listdir(export_directory)
             if os.path.isdir(os.path.join(export_directory, d))
+            and os.path.isfile(os.path.join(export_directory, d, "README.md"))
         ]
     )
 
-    # Fetch pression or temperature
-    pressures = []
-    temperatures = []
-
     # List of files that are distributions or histograms
     files_to_avoid = [
         "bond_angular_distribution",
         "pair_distribution_function",
         "neutron_structure_factor",
-        "hist_polyhedricity.dat",
+        "hist_polyhedricity",
+        "mean_square_displacement.dat",
         "README.md",
     ]
 
-    output = {}
-    output["Pressure"] = []
-    output["Temperature"] = []
+    # One row per run, the keys are the columns of the recap file
+    rows = []
+    keys = ["Pressure", "Temperature"]
 
     for dir in dirs:
         if dir == "recap.dat":
             continue
-        files = os.listdir(os.path.join(export_directory, dir))
+        row = {}
+        files = natsorted(os.listdir(os.path.join(export_directory, dir)))
         for file in files:
             # Fetch thermodynamic informations.
             if file == "README.md":
                 with open(os.path.join(export_directory, dir, file), "r") as f:
                     for li, line in enumerate(f):
-                        try:
-                            parts = line.split()
-                            if parts[0] == "Pressure":
-                                output["Pressure"].append(float(parts[-1]))
-                            elif parts[0] == "Temperature":
-                                output["Temperature"].append(float(parts[-1]))
-                        except:
+                        parts = line.split()
+                        if len(parts) == 0:
                             # line is empty, go next
                             continue
+                        if parts[0] in ["Pressure", "Temperature"]:
+                            try:
+                                row[parts[0]] = float(parts[-1])
+                            except ValueError:
+                                continue
 
             # Fetch results but avoid distributions or histograms
-            if file not in files_to_avoid:
-                try:
-                    parts = file.split("-")
-                    if parts[0] not in files_to_avoid:
-                        with open(os.path.join(export_directory, dir, file), "r") as f:
-                            for li, line in enumerate(f):
-                                if li == 0:
-                                    # skip first line
-                                    continue
-                                if li == 1:
-                                    # line 1 shall contains the keys
-                                    keys = line.split()[1:]
-                                    for key in keys:
-                                        if key not in output:
-                                            # create an entry in output the first time
-                                            output[key] = []
-                                if li == 2:
-                                    # line 2 shall contains the results
-                                    results = line.split()
-                                    for i, key in enumerate(keys):
-                                        output[key].append(float(results[i]))
-                except:
+            if file not in files_to_avoid and file.split("-")[0] not in files_to_avoid:
+                if not file.endswith(".dat"):
                     continue
+                with open(os.path.join(export_directory, dir, file), "r") as f:
+                    for line in f:
+                        # results are written as 'value +/- error # key'
+                        parts = line.split()
+                        if len(parts) == 5 and parts[1] == "+/-" and parts[3] == "#":
+                            try:
+                                row[parts[4]] = float(parts[0])
+                            except ValueError:
+                                continue
+                            if parts[4] not in keys:
+                                keys.append(parts[4])
+        rows.append(row)
 
     with open(os.path.join(export_directory, "recap.dat"), "w") as f:
-        nlines = len(output["Pressure"])
         # write header of the recap file
         f.write("# ")
-        for k in output.keys():
+        for k in keys:
             f.write(f"{k}\t")
         f.write("\n")
 
-        # write the results
-        for n in range(nlines):
-            for k in output.keys():
-                f.write(f"{output[k][n]}\t")
+        # write the results, nan if a run does not have this result
+        for row in rows:
+            for k in keys:
+                f.write(f"{row.get(k, np.nan)}\t")
             f.write("\n")
@@ -9,7 +9,6 @@ setup(
         "pandas",
         "matplotlib",
         "numba",
-        "numba-progress",
         "scipy",
     ],
     author="Julien Perradin",
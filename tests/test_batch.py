@@ -0,0 +1,25 @@
+import os
+
+import gspc
+
+SAMPLE = os.path.join(
+    os.path.dirname(__file__), "inputs", "SiO2", "1008", "sio2-1008at-1frame", "pos00.xyz"
+)
+
+
+def test_a_broken_job_does_not_stop_the_others(tmp_path):
+    settings = gspc.settings.Settings(extension="SiO2")
+    settings.export_directory.set_value(str(tmp_path / "export"))
+    settings.header.set_value(2)
+    settings.number_of_atoms.set_value(1008)
+    settings.structure.set_value([{"element": "Si", "number": 336}, {"element": "O", "number": 672}])
+    settings.properties.set_value(["structural_units"])
+    settings.quiet.set_value(True)
+
+    jobs = [(str(tmp_path / "missing.xyz"), {}), (SAMPLE, {})]
+    output_directories, errors = gspc.run_batch(jobs, settings, n_workers=1, recaps=False)
+
+    assert output_directories[0] is None
+    assert isinstance(errors[0], FileNotFoundError)
+    assert list(errors) == [0]
+    assert os.path.isfile(os.path.join(output_directories[1], "SiOz.dat"))
@@ -0,0 +1,27 @@
+import pickle
+
+from gspc import core
+
+
+def test_q_shells_keep_only_the_last_box():
+    box = core.Box()
+    box.add_box(12.0, 12.0, 12.0)
+    box.add_box(12.5, 12.5, 12.5)
+
+    first = box.get_q_shells(0, qmax=4.0)
+    assert box.get_q_shells(0, qmax=4.0) is first
+
+    box.get_q_shells(1, qmax=4.0)
+    assert len(box.q_shells) == 1
+    assert (12.5, 12.5, 12.5, 4.0) in box.q_shells
+
+
+def test_q_shells_are_not_pickled():
+    box = core.Box()
+    box.add_box(12.0, 12.0, 12.0)
+    box.get_q_shells(0, qmax=4.0)
+
+    copy = pickle.loads(pickle.dumps(box))
+    assert copy.q_shells == {}
+    assert copy.get_box_dimensions(0).tolist() == [12.0, 12.0, 12.0]
+    assert len(copy.get_q_shells(0, qmax=4.0)[0]) == len(box.get_q_shells(0, qmax=4.0)[0])
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+
+import gspc
+from gspc import core, io
+
+SAMPLE = os.path.join(
+    os.path.dirname(__file__), "inputs", "SiO2", "1008", "sio2-1008at-1frame", "pos00.xyz"
+)
+
+
+def read_sample():
+    box = core.Box()
+    io.read_lattice_properties(box, SAMPLE)
+    elements, positions = io.read_frame(SAMPLE, io.index_frames(SAMPLE, 1010)[0], 1008)
+    return box, elements, positions
+
+
+def test_neighbours_and_coordination_are_read_from_the_neighbour_list():
+    settings = gspc.settings.Settings(extension="SiO2")
+    box, elements, positions = read_sample()
+    system = core.System.from_arrays(settings, elements, positions)
+    system.box = box
+    system.calculate_neighbours()
+
+    for i, atom in enumerate(system.atoms):
+        assert [neighbour.index for neighbour in atom.neighbours] == list(
+            system.neighbour_list.get_neighbours(i)
+        )
+        coordination = atom.get_coordination()
+        atom.calculate_coordination()
+        assert atom.get_coordination() == coordination
+
+    assert np.mean(system.coordinations[elements == "Si"]) > 3.9
+
+
+def test_atoms_of_the_former_signature_get_the_same_neighbours():
+    settings = gspc.settings.Settings(extension="SiO2")
+    box, elements, positions = read_sample()
+    reference = core.System.from_arrays(settings, elements, positions)
+    reference.box = box
+    reference.calculate_neighbours()
+
+    cutoffs = core.Cutoff(settings.cutoffs.get_value())
+    system = core.System(settings)
+    system.box = box
+    for i, (element, position) in enumerate(zip(elements, positions)):
+        system.add_atom(core.Atom(element, i, position, 0, cutoffs, "SiO2"))
+    system.calculate_neighbours()
+
+    for atom, expected in zip(system.atoms, reference.atoms):
+        assert [n.get_id() for n in atom.get_neighbours()] == [n.get_id() for n in expected.get_neighbours()]
+        assert atom.get_coordination() == expected.get_coordination()
+    np.testing.assert_array_equal(system.get_positions_by_element("O"), reference.get_positions_by_element("O"))
+
+
+def test_former_signature_keeps_its_default_extension():
+    cutoffs = core.Cutoff(gspc.settings.Settings(extension="SiO2").cutoffs.get_value())
+    atom = core.Atom("Si", 0, np.zeros(3), 3, cutoffs)
+
+    assert atom.get_frame() == 3
+    assert atom.cutoffs is cutoffs
+    assert atom.extension == "SiOz"
+    assert atom.get_neighbours() == []
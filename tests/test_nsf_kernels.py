@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import gspc
+from gspc import core
+
+
+def random_system(lengths, number_of_atoms=200, engine="recurrence", seed=0):
+    settings = gspc.settings.Settings(extension="SiO2")
+    settings.nsf_settings.set_engine(engine)
+
+    rng = np.random.default_rng(seed)
+    elements = rng.choice(["Si", "O"], number_of_atoms)
+    positions = rng.random((number_of_atoms, 3)) * np.array(lengths)
+
+    box = core.Box()
+    box.add_box(*lengths)
+    system = core.System.from_arrays(settings, elements, positions)
+    system.box = box
+    return system
+
+
+def reference_sums(q_vectors, positions):
+    dot = q_vectors @ positions.T
+    return np.cos(dot).sum(axis=1), np.sin(dot).sum(axis=1)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+def test_direct_kernel_matches_numpy(chunk_size):
+    system = random_system((12.0, 12.0, 12.0))
+    q_vectors = system.box.get_q_shells(0, qmax=5.0)[0]
+
+    qcos, qsin = core.System._calculate_neutron_structure_factor(q_vectors, system.positions, chunk_size)
+
+    expected_cos, expected_sin = reference_sums(q_vectors, system.positions)
+    np.testing.assert_allclose(qcos, expected_cos, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(qsin, expected_sin, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("engine", ["direct", "recurrence"])
+@pytest.mark.parametrize("lengths", [(12.0, 12.0, 12.0), (12.0, 15.0, 18.0)])
+def test_engines_match_numpy(engine, lengths):
+    system = random_system(lengths, engine=engine)
+    q_vectors, q_indices = system.box.get_q_shells(0, qmax=5.0)[:2]
+
+    qcos, qsin = system._calculate_rho(q_vectors, q_indices, system.positions)
+
+    expected_cos, expected_sin = reference_sums(q_vectors, system.positions)
+    np.testing.assert_allclose(qcos, expected_cos, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(qsin, expected_sin, rtol=0, atol=1e-9)
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+import gspc
+from gspc import core, io
+from gspc.extensions import SiO2
+
+SAMPLE = os.path.join(
+    os.path.dirname(__file__), "inputs", "SiO2", "1008", "sio2-1008at-1frame", "pos00.xyz"
+)
+
+# Largest deviation of S(q) allowed between float32 and float64 (2e-6 to 6e-6 on the sample up to q = 6)
+TOLERANCE = 1e-5
+
+
+def calculate_nsf(engine, precision, qmax=6.0):
+    settings = gspc.settings.Settings(extension="SiO2")
+    settings.nsf_settings.set_qmax(qmax)
+    settings.nsf_settings.set_engine(engine)
+    settings.precision.set_value(precision)
+
+    box = core.Box()
+    io.read_lattice_properties(box, SAMPLE)
+    elements, positions = io.read_frame(SAMPLE, io.index_frames(SAMPLE, 1010)[0], 1008)
+    system = core.System.from_arrays(settings, elements, positions)
+    system.box = box
+
+    keys = SiO2.return_keys("neutron_structure_factor")
+    system.calculate_neutron_structure_factor(keys)
+    return system.q, system.nsf
+
+
+@pytest.mark.parametrize("engine", ["direct", "recurrence"])
+def test_float32_stays_close_to_float64(engine):
+    q_64, nsf_64 = calculate_nsf(engine, "float64")
+    q_32, nsf_32 = calculate_nsf(engine, "float32")
+
+    np.testing.assert_array_equal(q_32, q_64)
+    for key in nsf_64:
+        assert np.max(np.abs(nsf_32[key] - nsf_64[key])) < TOLERANCE, key
+
+
+def test_engines_agree_in_float64():
+    _, nsf_direct = calculate_nsf("direct", "float64")
+    _, nsf_recurrence = calculate_nsf("recurrence", "float64")
+
+    for key in nsf_direct:
+        np.testing.assert_allclose(nsf_recurrence[key], nsf_direct[key], rtol=0, atol=1e-9)
+
+
+def test_invalid_precision_raises():
+    settings = gspc.settings.Settings(extension="SiO2")
+    with pytest.raises(ValueError):
+        settings.precision.set_value("float16")
+    assert settings.precision.get_value() == "float64"
@@ -0,0 +1,31 @@
+import os
+
+import numpy as np
+
+from gspc import io
+
+SAMPLE = os.path.join(
+    os.path.dirname(__file__), "inputs", "SiO2", "1008", "sio2-1008at-1frame", "pos00.xyz"
+)
+
+
+def test_frame_is_parsed_into_the_buffers():
+    elements = np.empty(1008, dtype="U3")
+    positions = np.empty((1008, 3))
+
+    result = io.read_frame(SAMPLE, io.index_frames(SAMPLE, 1010)[0], 1008, elements, positions)
+
+    assert result[0] is elements and result[1] is positions
+    expected = np.loadtxt(SAMPLE, skiprows=2, usecols=(1, 2, 3))
+    np.testing.assert_array_equal(positions, expected)
+    assert set(elements) == {"Si", "O"}
+
+
+def test_lines_with_extra_columns(tmp_path):
+    path = tmp_path / "frame.xyz"
+    path.write_text("3\ncomment\nSi 0.0 1.0 2.0\nO 3.0 4.0 5.0 0.1 0.2\nO 6.0 7.0 8.0\n")
+
+    elements, positions = io.read_frame(str(path), 0, 3)
+
+    assert elements.tolist() == ["Si", "O", "O"]
+    np.testing.assert_array_equal(positions, np.arange(9.0).reshape(3, 3))
@@ -0,0 +1,37 @@
+import numpy as np
+
+from gspc.io import BlockingAccumulator, PropResult
+
+
+def test_blocking_merge_drops_blocks_straddling_the_boundary():
+    first = BlockingAccumulator()
+    for value in range(7):
+        first.update(float(value))
+    # 7 values: one value pending at levels 0, 1 and 2
+    assert all(pending is not None for pending in first.pending)
+
+    second = BlockingAccumulator()
+    second.update(10.0)
+    first.merge(second)
+
+    assert first.pending[0] == 10.0
+    assert first.pending[1] is None and first.pending[2] is None
+    assert first.count == 8
+    np.testing.assert_allclose(first.get_mean(), (sum(range(7)) + 10.0) / 8)
+
+
+def test_blocking_proportions_report_the_required_frames(tmp_path):
+    result = PropResult("SiOz", ["SiO4"], 0, "blocking", target_error=0.01)
+    result.write_file_header(str(tmp_path), 64)
+    rng = np.random.default_rng(0)
+    for frame in range(64):
+        result.add_to_timeline(frame, ["SiO4"], [0.6 + 0.05 * rng.standard_normal()])
+    result.calculate_average_proportion()
+    result.append_results_to_file()
+
+    lines = (tmp_path / "SiOz.dat").read_text(encoding="utf-8").splitlines()
+    assert lines[1].split()[1:] == ["+/-", lines[1].split()[2], "#", "SiO4"]
+    assert lines[2] == "# statistical inefficiency and frames needed for +/- 0.01 :"
+    assert lines[3].startswith("#   SiO4 : s = ")
+    assert lines[3].endswith(f"| {result.required_frames['SiO4']} frames")
+    assert result.required_frames["SiO4"] > 0